@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Measure each stage of importing a synthetic project.
+
+A project JSON of the requested shape is generated and written to a
+temporary file. The benchmark times reading it with json.load, loading it
+with Project.load_json, creating it with build_new, and loading it again
+with load_cards, when every object already exists. The database stages also
+count the round trips made to Postgres. Everything runs in a transaction
+that is rolled back, so the database is left unchanged.
+
+With --backend sqlite the database stages run against an in-memory SQLite
+Planka database instead, so no database server is needed.
+
+Results are printed and, with --output, written as JSON so runs can be
+compared.
+
+Usage:
+    python benchmarks/import_pipeline.py --DB-host 127.0.0.1 --cards 1000 --output run.json
+"""
+
+# Standard Python Libraries
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import tempfile
+import time
+
+# Third-Party Libraries
+import psycopg2
+from psycopg2.extensions import connection as _connection
+from psycopg2.extensions import cursor as _cursor
+
+# Project Libraries
+from models.models import Project
+from tools import statements
+from tools._version import __version__
+from tools.db import Transaction, execute_query, execute_read_query
+from tools.planka_import import build_new, load_cards
+from tools.sqlite import SQLiteBackend
+from workload import add_arguments, from_arguments
+
+
+class CountingCursor(_cursor):
+    """A cursor counting the statements it sends on its connection."""
+
+    def execute(self, query, vars=None):
+        """Execute a query and count the round trip."""
+        self.connection.round_trips += 1
+        return super().execute(query, vars)
+
+    def copy_expert(self, sql, file, size=8192):
+        """Copy rows and count the round trip."""
+        self.connection.round_trips += 1
+        return super().copy_expert(sql, file, size)
+
+
+class CountingConnection(_connection):
+    """A connection whose cursors count round trips to the server."""
+
+    def __init__(self, *args, **kwargs):
+        """Create a new connection counting from zero."""
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = CountingCursor
+        self.round_trips = 0
+
+
+def _stage(function, connection=None):
+    """Run function and return its result and a measurement of it."""
+    before = getattr(connection, "round_trips", None)
+    start = time.perf_counter()
+    result = function()
+    measurement = {"seconds": time.perf_counter() - start}
+    if before is not None:
+        measurement["round_trips"] = connection.round_trips - before
+    return (result, measurement)
+
+
+def main():
+    """Run the benchmark and print the measurement of each stage."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--DB-host", dest="db_host", default="127.0.0.1")
+    parser.add_argument("--DB-pwd", dest="db_pwd", default="postgres")
+    parser.add_argument("--DB-port", dest="db_port", default="5432")
+    parser.add_argument("--DB-name", dest="db_name", default="planka")
+    parser.add_argument("--DB-user", dest="db_user", default="postgres")
+    parser.add_argument("--backend", choices=["postgres", "sqlite"], default="postgres")
+    parser.add_argument("--bulk", action="store_true")
+    parser.add_argument("--stream", choices=["board", "list"], default=None)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    # Warnings about duplicate names would otherwise be timed too.
+    logging.getLogger().setLevel(logging.ERROR)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as fp:
+        json.dump(from_arguments(args), fp)
+    stages = dict()
+    if args.backend == "sqlite":
+        connection = SQLiteBackend()
+        database = f"sqlite {sqlite3.sqlite_version}"
+    else:
+        connection = psycopg2.connect(
+            database=args.db_name,
+            user=args.db_user,
+            password=args.db_pwd,
+            host=args.db_host,
+            port=args.db_port,
+            connection_factory=CountingConnection,
+        )
+        database = f"postgres {connection.server_version}"
+    try:
+        with open(fp.name) as source:
+            (data, stages["json_load"]) = _stage(lambda: json.load(source))
+        (_, stages["load_json"]) = _stage(lambda: Project().load_json(data))
+        data = None
+
+        transaction = Transaction(connection)
+        project = Project(name="benchmark")
+        execute_query(transaction, statements.insert_project(project))
+        project.id = execute_read_query(
+            transaction, statements.select_project_id(project)
+        )[0][0]
+        for name, function in [("build_new", build_new), ("load_cards", load_cards)]:
+            (_, stages[name]) = _stage(
+                lambda: function(transaction, project, fp.name, args.bulk, args.stream),
+                connection,
+            )
+    finally:
+        connection.rollback()
+        connection.close()
+        os.unlink(fp.name)
+
+    results = {
+        "workload": {
+            "boards": args.boards,
+            "lists": args.lists,
+            "cards": args.cards,
+            "tasks": args.tasks,
+            "name_length": args.name_length,
+            "duplicates": args.duplicates,
+            "seed": args.seed,
+            "bulk": args.bulk,
+            "stream": args.stream,
+            "backend": args.backend,
+        },
+        "environment": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "database": database,
+        },
+        "stages": stages,
+    }
+
+    total = args.boards * args.lists * args.cards
+    print(f"{total} cards with {args.tasks} tasks each")
+    print(f"{'stage':<12}{'seconds':>10}{'round trips':>13}")
+    for name, stage in stages.items():
+        print(f"{name:<12}{stage['seconds']:>10.3f}{stage.get('round_trips', ''):>13}")
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(results, out, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Compare the time each installed JSON parser takes to read a large project.
+
+A project JSON of about the requested size is written to a temporary file,
+one board at a time, unless an existing file is given. It is then parsed
+with tools.jsonio.load and each installed parser, and with json.load on a
+text file, the way imports used to read it. Every parse runs in a process
+of its own so its peak memory is measured on its own.
+
+Results are printed and, with --output, written as JSON so runs can be
+compared.
+
+Usage:
+    python benchmarks/json_parsers.py --size-mb 1024 --output parsers.json
+"""
+
+# Standard Python Libraries
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import platform
+import resource
+import tempfile
+import time
+
+# Project Libraries
+from tools._version import __version__
+from tools.jsonio import PARSERS, PREFERENCE, load
+from workload import generate
+
+# Parsed with json.load on a text file rather than tools.jsonio.load.
+TEXT = "json (text)"
+
+
+def write_project(path, size, lists=10, cards=1000, tasks=2):
+    """Write a project of boards of a fixed shape until it holds size bytes."""
+    with open(path, "w") as fp:
+        fp.write('{"boards": [')
+        board = 0
+        while fp.tell() < size:
+            if board:
+                fp.write(", ")
+            content = generate(1, lists, cards, tasks, seed=board)
+            fp.write(json.dumps(content["boards"][0]))
+            board += 1
+        fp.write("]}")
+    return board
+
+
+def _parse(path, parser):
+    """Parse a file with a parser and return the seconds and peak memory."""
+    start = time.perf_counter()
+    if parser == TEXT:
+        with open(path) as fp:
+            data = json.load(fp)
+    else:
+        data = load(path, parser)
+    seconds = time.perf_counter() - start
+    boards = len(data["boards"])
+    return {
+        "seconds": seconds,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "boards": boards,
+    }
+
+
+def main():
+    """Run the benchmark and print the measurement of each parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", help="Parse this project JSON file instead.")
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as fp:
+            path = fp.name
+        boards = write_project(path, args.size_mb * 1024 * 1024)
+        print(f"Wrote {boards} boards to {path}")
+    size = os.path.getsize(path)
+
+    parsers = dict()
+    try:
+        for name in [name for name in PREFERENCE if name in PARSERS] + [TEXT]:
+            runs = []
+            for _ in range(args.repeat):
+                # A new process for every parse, so memory is measured alone.
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    runs.append(executor.submit(_parse, path, name).result())
+            best = min(runs, key=lambda run: run["seconds"])
+            parsers[name] = dict(best, mb_per_second=size / 1048576 / best["seconds"])
+    finally:
+        if args.file is None:
+            os.unlink(path)
+
+    results = {
+        "file": {"bytes": size, "generated": args.file is None},
+        "environment": {
+            "version": __version__,
+            "python": platform.python_version(),
+        },
+        "parsers": parsers,
+    }
+
+    print(f"{size / 1048576:.0f} MB of JSON")
+    print(f"{'parser':<14}{'seconds':>10}{'MB/s':>10}{'max RSS MB':>12}")
+    for name, run in parsers.items():
+        print(
+            f"{name:<14}{run['seconds']:>10.3f}{run['mb_per_second']:>10.1f}"
+            f"{run['max_rss_mb']:>12.0f}"
+        )
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(results, out, indent=2)
+
+
+if __name__ == "__main__":
+    main()
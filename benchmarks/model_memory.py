@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Compare the memory used to hold many cards.
+
+Cards are held as objects with a __dict__ (how the models used to store
+their properties), as the slot-based Card model, and as a columnar
+CardBatch. Memory is measured with tracemalloc.
+
+Usage:
+    python benchmarks/model_memory.py --cards 200000 --tasks 3
+"""
+
+# Standard Python Libraries
+import argparse
+import gc
+import tracemalloc
+
+# Project Libraries
+from models.models import Card, CardBatch
+
+
+class DictCard(object):
+    """A card keeping its properties in a __dict__, like the old models."""
+
+    def __init__(self, **kwargs):
+        """Create a new card instance."""
+        for key, default in Card._valid_properties.items():
+            setattr(self, key, kwargs.get(key, default))
+
+
+def _measure(build):
+    """Return the bytes held by the result of build and the result."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    (current, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current, result)
+
+
+def main():
+    """Run the benchmark and print the memory used by each representation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=200000)
+    parser.add_argument("--tasks", type=int, default=3)
+    args = parser.parse_args()
+
+    # Shared names, like names read from one JSON file, are not counted.
+    names = [f"Card {index}" for index in range(args.cards)]
+    tasks = [f"Task {index}" for index in range(args.tasks)]
+
+    def fields(index):
+        return dict(
+            id=index + 1,
+            name=names[index],
+            position=index * 65535,
+            board_id=1,
+            list_id=index // 200 + 1,
+            tasks=list(tasks),
+        )
+
+    representations = [
+        ("dict objects", lambda: [DictCard(**fields(i)) for i in range(args.cards)]),
+        ("slot objects", lambda: [Card(**fields(i)) for i in range(args.cards)]),
+        (
+            "CardBatch",
+            lambda: CardBatch(Card(**fields(i)) for i in range(args.cards)),
+        ),
+    ]
+
+    print(f"{args.cards} cards with {args.tasks} tasks each")
+    print(f"{'representation':<16}{'MiB':>10}{'bytes/card':>12}")
+    for name, build in representations:
+        (size, result) = _measure(build)
+        print(f"{name:<16}{size / 2 ** 20:>10.1f}{size / args.cards:>12.0f}")
+        del result
+
+
+if __name__ == "__main__":
+    main()
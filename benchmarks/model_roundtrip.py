@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Compare the time to parse and serialize a large project.
+
+A project JSON with many cards is parsed into models and turned back into a
+dict, once with the loop based parse and as_dict the models used to have
+(kept below, they overwrite the lists of their input) and once with the
+compiled methods the models have now.
+
+Usage:
+    python benchmarks/model_roundtrip.py --cards 1000000 --repeat 3
+"""
+
+# Standard Python Libraries
+import argparse
+import copy
+import gc
+import time
+
+# Project Libraries
+from models.models import Board, Card, List, Project
+
+CHILDREN = {"boards": Board, "lists": List, "cards": Card}
+
+
+def _is_builtin(obj):
+    return isinstance(obj, (int, float, str, list, dict, bool))
+
+
+def legacy_parse(cls, json):
+    """Parse JSON into a model the way the models used to, in place."""
+    obj = cls()
+    for key, val in json.items():
+        if key in CHILDREN:
+            for index, item in enumerate(val):
+                val[index] = legacy_parse(CHILDREN[key], item)
+
+        if key in cls._valid_properties:
+            setattr(obj, key, val)
+    return obj
+
+
+def legacy_as_dict(obj):
+    """Return a dict of a model the way the models used to, in place."""
+    result = {}
+    for key in obj._valid_properties:
+        val = getattr(obj, key)
+        if val and not _is_builtin(val):
+            val = legacy_as_dict(val)
+        elif isinstance(val, list):
+            for i in range(len(val)):
+                if _is_builtin(val[i]):
+                    continue
+                val[i] = legacy_as_dict(val[i])
+        elif isinstance(val, bool):
+            result[key] = val
+
+        if val:
+            result[key] = val
+
+    return result
+
+
+def project_json(cards, boards, lists, tasks):
+    """Return a project JSON with cards spread over boards and lists."""
+    per_list = max(cards // (boards * lists), 1)
+    return {
+        "name": "benchmark",
+        "boards": [
+            {
+                "name": f"Board {b}",
+                "position": b * 65535,
+                "lists": [
+                    {
+                        "name": f"List {i}",
+                        "position": i * 65535,
+                        "cards": [
+                            {
+                                "name": f"Card {c}",
+                                "position": c * 65535,
+                                "tasks": [f"Task {t}" for t in range(tasks)],
+                            }
+                            for c in range(per_list)
+                        ],
+                    }
+                    for i in range(lists)
+                ],
+            }
+            for b in range(boards)
+        ],
+    }
+
+
+def _time(round_trip, json, repeat):
+    """Return the best time in seconds of repeat round trips of copies of json."""
+    best = float("inf")
+    for _ in range(repeat):
+        # The legacy methods change their input, so each run gets a copy.
+        data = copy.deepcopy(json)
+        gc.collect()
+        start = time.perf_counter()
+        round_trip(data)
+        best = min(best, time.perf_counter() - start)
+        del data
+    return best
+
+
+def main():
+    """Run the benchmark and print the time of each implementation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1000000)
+    parser.add_argument("--boards", type=int, default=10)
+    parser.add_argument("--lists", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    json = project_json(args.cards, args.boards, args.lists, args.tasks)
+    implementations = [
+        ("legacy", lambda data: legacy_as_dict(legacy_parse(Project, data))),
+        ("compiled", lambda data: Project.parse(data).as_dict()),
+    ]
+
+    print(f"{args.cards} cards with {args.tasks} tasks each, best of {args.repeat}")
+    print(f"{'implementation':<16}{'seconds':>10}{'speedup':>9}")
+    baseline = None
+    for name, round_trip in implementations:
+        seconds = _time(round_trip, json, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:<16}{seconds:>10.2f}{baseline / seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Compare the latency of literal SQL queries and prepared statements.
+
+Each statement the importer runs is run repeatedly, once as a literal SQL
+string with its parameters written into it, which Postgres parses and plans
+on every run, and once as a prepared statement with bound parameters. The
+inserts only add rows on their first run, so they mostly time the check that
+skips the rows already in Planka, as a repeated import does. Everything runs
+in a transaction that is rolled back, so the database is left unchanged.
+
+Usage:
+    python benchmarks/prepared_statements.py --DB-host 127.0.0.1 --repeat 500
+"""
+
+# Standard Python Libraries
+import argparse
+import re
+import statistics
+import time
+
+# Project Libraries
+from models.models import Board, Card, List
+from tools import statements
+from tools.db import create_connection
+
+
+def _literal(cursor, query):
+    """Return the SQL of a bound statement with its parameters as literals."""
+    statement = query.statement
+    sql = re.sub(
+        r"\$(\d+)",
+        lambda match: f"%({match[1]})s::{statement.types[int(match[1]) - 1]}",
+        statement.sql,
+    )
+    params = {str(index): param for index, param in enumerate(query.params, 1)}
+    return cursor.mogrify(sql, params).decode()
+
+
+def _time(cursor, query, repeat):
+    """Return the latency in microseconds of each of repeat runs of a query."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        statements.run(cursor, query)
+        if cursor.description is not None:
+            cursor.fetchall()
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def _fixture(cursor, batch):
+    """Create a project with one board, one list, and batch cards."""
+    cursor.execute("INSERT INTO project (name) VALUES ('benchmark') RETURNING id")
+    project_id = cursor.fetchone()[0]
+    board = Board(project_id=project_id, name="benchmark", position=0)
+    statements.run(cursor, statements.insert_many(Board, [board]))
+    board.id = cursor.fetchone()[0]
+    _list = List(board_id=board.id, name="benchmark", position=0)
+    statements.run(cursor, statements.insert_many(List, [_list]))
+    _list.id = cursor.fetchone()[0]
+    cards = [
+        Card(
+            board_id=board.id,
+            list_id=_list.id,
+            name=f"card {index}",
+            position=index * 65535,
+        )
+        for index in range(batch)
+    ]
+    statements.run(cursor, statements.insert_many(Card, cards))
+    ids = {name: card_id for (card_id, _, _, name) in cursor.fetchall()}
+    for card in cards:
+        card.id = ids[card.name]
+    return cards
+
+
+def main():
+    """Run the benchmark and print a table of latencies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--DB-host", dest="db_host", default="127.0.0.1")
+    parser.add_argument("--DB-pwd", dest="db_pwd", default="postgres")
+    parser.add_argument("--DB-port", dest="db_port", default="5432")
+    parser.add_argument("--DB-name", dest="db_name", default="planka")
+    parser.add_argument("--DB-user", dest="db_user", default="postgres")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    connection = create_connection(
+        args.db_name, args.db_user, args.db_pwd, args.db_host, args.db_port
+    )
+    cursor = connection.cursor()
+    try:
+        cards = _fixture(cursor, args.batch)
+        card = cards[-1]
+        new = [
+            Card(
+                board_id=card.board_id,
+                list_id=card.list_id,
+                name=f"new card {index}",
+                position=(args.batch + index) * 65535,
+            )
+            for index in range(args.batch)
+        ]
+        tasks = [(c.id, f"task {index}") for index, c in enumerate(cards)]
+        shapes = [
+            ("select 1 card", statements.select_many(Card, [card])),
+            (f"select {args.batch} cards", statements.select_many(Card, cards)),
+            ("max card position", statements.max_positions(Card, [card.list_id])),
+            (f"insert {args.batch} cards", statements.insert_many(Card, new)),
+            (f"insert {args.batch} tasks", statements.insert_tasks(tasks)),
+        ]
+
+        print(f"{'query':<28}{'literal us':>12}{'prepared us':>13}{'speedup':>9}")
+        for name, prepared in shapes:
+            literal = _literal(cursor, prepared)
+            before = statistics.median(_time(cursor, literal, args.repeat))
+            after = statistics.median(_time(cursor, prepared, args.repeat))
+            print(f"{name:<28}{before:>12.1f}{after:>13.1f}{before / after:>8.2f}x")
+    finally:
+        connection.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Generate synthetic project JSON for the benchmarks.
+
+The project has boards x lists x cards x tasks. Names are padded with random
+letters to a fixed length, and a share of the cards and tasks in each list
+or card repeat a name used earlier in it, the way a hand written file
+sometimes does.
+
+Usage:
+    python benchmarks/workload.py project.json --boards 10 --lists 10 --cards 100
+"""
+
+# Standard Python Libraries
+import argparse
+import json
+import random
+import string
+
+
+def _name(prefix, index, length, rng):
+    """Return a name for the index-th item padded to length with letters."""
+    name = f"{prefix} {index}"
+    if len(name) < length:
+        name += " " + "".join(
+            rng.choices(string.ascii_letters, k=length - len(name) - 1)
+        )
+    return name
+
+
+def _names(prefix, count, length, duplicates, rng):
+    """Return count names of which about a duplicates share repeat earlier ones."""
+    names = []
+    for index in range(count):
+        if names and rng.random() < duplicates:
+            names.append(rng.choice(names))
+        else:
+            names.append(_name(prefix, index, length, rng))
+    return names
+
+
+def generate(boards, lists, cards, tasks, name_length=16, duplicates=0.0, seed=0):
+    """Return a synthetic project JSON.
+
+    Args:
+        boards (int): The number of boards.
+        lists (int): The number of lists on each board.
+        cards (int): The number of cards in each list.
+        tasks (int): The number of tasks on each card.
+        name_length (int, optional): The length names are padded to. Defaults to 16.
+        duplicates (float, optional): The share of cards and tasks repeating an earlier name. Defaults to 0.0.
+        seed (int, optional): The seed of the random names. Defaults to 0.
+
+    Returns:
+        dict: The project JSON.
+    """
+    rng = random.Random(seed)
+    return {
+        "boards": [
+            {
+                "name": _name("Board", b, name_length, rng),
+                "lists": [
+                    {
+                        "name": _name("List", index, name_length, rng),
+                        "cards": [
+                            {
+                                "name": card,
+                                "tasks": _names(
+                                    "Task", tasks, name_length, duplicates, rng
+                                ),
+                            }
+                            for card in _names(
+                                "Card", cards, name_length, duplicates, rng
+                            )
+                        ],
+                    }
+                    for index in range(lists)
+                ],
+            }
+            for b in range(boards)
+        ],
+    }
+
+
+def add_arguments(parser):
+    """Add the workload shape arguments to an argument parser."""
+    parser.add_argument("--boards", type=int, default=2)
+    parser.add_argument("--lists", type=int, default=5)
+    parser.add_argument("--cards", type=int, default=100, help="Cards per list.")
+    parser.add_argument("--tasks", type=int, default=2, help="Tasks per card.")
+    parser.add_argument("--name-length", type=int, default=16)
+    parser.add_argument(
+        "--duplicates",
+        type=float,
+        default=0.0,
+        help="Share of cards and tasks repeating an earlier name.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def from_arguments(args):
+    """Return the project JSON described by parsed workload arguments."""
+    return generate(
+        args.boards,
+        args.lists,
+        args.cards,
+        args.tasks,
+        args.name_length,
+        args.duplicates,
+        args.seed,
+    )
+
+
+def main():
+    """Write a synthetic project JSON file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("FILE_NAME")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    with open(args.FILE_NAME, "w") as fp:
+        json.dump(from_arguments(args), fp)
+
+
+if __name__ == "__main__":
+    main()
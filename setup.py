@@ -61,10 +61,14 @@ setup(
             "pytest-cov",
             "ipython >= 7.0",
         ],
+        "fast": ["orjson"],
     },
     entry_points={
         "console_scripts": [
             "planka-import = tools.planka_import:main",
+            "planka-import-batch = tools.batch:main",
+            "planka-import-client = tools.client:main",
+            "planka-import-daemon = tools.daemon:main",
         ]
     },
     # scripts=["bin/planka-import"],
@@ -1,4 +1,4 @@
 """The models library."""
-from .models import Board, Card, List, Project
+from .models import Board, Card, CardBatch, List, Project
 
-__all__ = ["Board", "Card", "List", "Project"]
+__all__ = ["Board", "Card", "CardBatch", "List", "Project"]
@@ -1,19 +1,97 @@
 """The models library."""
 
 # Standard Python Libraries
-from typing import Any, Dict
+from array import array
+from copy import copy
+import math
+from typing import Any, Dict, Iterable, Tuple
 
 POSITION_GAP = 65535
 
+# Used by the compiled parse methods to create instances without __init__.
+_new = object.__new__
+
+
+def _compile(cls):
+    """Return parse and as_dict methods generated from a model's properties.
+
+    The methods are compiled once per class so that parsing and serializing
+    many models does not look up each property dynamically. Neither method
+    changes its input: parse copies list properties and parses child models
+    (named in _children) into new lists, and as_dict serializes child models
+    into new lists. Lists of plain values, like a card's tasks, are shared
+    with the dict as_dict returns rather than copied.
+
+    Args:
+        cls (Model): The model class to compile methods for.
+
+    Returns:
+        dict: The parse classmethod and as_dict method by name.
+    """
+    parse = ["def parse(cls, json):", "    obj = _new(cls)", "    get = json.get"]
+    as_dict = ["def as_dict(self):", "    result = {}"]
+    for key, default in cls._valid_properties.items():
+        child = cls._children.get(key)
+        if isinstance(default, list):
+            if child:
+                parse += [
+                    f"    val = get({key!r})",
+                    "    if val is None:",
+                    f"        obj.{key} = []",
+                    "    else:",
+                    f"        parse = {child}.parse",
+                    f"        obj.{key} = [parse(item) for item in val]",
+                ]
+                as_dict += [
+                    f"    val = self.{key}",
+                    "    if val:",
+                    f"        result[{key!r}] = [item.as_dict() for item in val]",
+                ]
+            else:
+                parse += [
+                    f"    val = get({key!r})",
+                    f"    obj.{key} = [] if val is None else list(val)",
+                ]
+                as_dict += [
+                    f"    val = self.{key}",
+                    "    if val:",
+                    f"        result[{key!r}] = val",
+                ]
+        else:
+            parse.append(f"    obj.{key} = get({key!r}, {default!r})")
+            as_dict += [
+                f"    val = self.{key}",
+                "    if val is not None:",
+                f"        result[{key!r}] = val",
+            ]
+    parse.append("    return obj")
+    as_dict.append("    return result")
+
+    namespace: Dict[str, Any] = dict()
+    exec("\n".join(parse + as_dict), globals(), namespace)
+    namespace["parse"].__doc__ = f"Parse {cls.__name__.lower()} json."
+    namespace["as_dict"].__doc__ = "Return a dict representation of the resource."
+    return {"parse": classmethod(namespace["parse"]), "as_dict": namespace["as_dict"]}
+
 
 class Model(object):
-    """The Model class."""
+    """The Model class.
+
+    Models keep their properties in __slots__ named after _valid_properties
+    rather than in a __dict__, so holding many of them costs less memory.
+    """
 
+    __slots__ = ()
     _valid_properties: Dict[str, Any] = dict()
+    _parent_keys: Tuple[str, ...] = tuple()
+    _children: Dict[str, str] = dict()
 
-    @classmethod
-    def _is_builtin(cls, obj):
-        return isinstance(obj, (int, float, str, list, dict, bool))
+    def __init_subclass__(cls, **kwargs):
+        """Compile the parse and as_dict methods of a model class."""
+        super().__init_subclass__(**kwargs)
+        for name, method in _compile(cls).items():
+            if name not in cls.__dict__:
+                setattr(cls, name, method)
 
     def __repr__(self):
         """Return string representation of an object."""
@@ -21,38 +99,16 @@ class Model(object):
 
     def as_dict(self):
         """Return a dict representation of the resource."""
-        result = {}
-        for key in self._valid_properties:
-            val = getattr(self, key)
-            # Parse custom classes
-            if val and not Model._is_builtin(val):
-                val = val.as_dict()
-            # Parse lists of objects
-            elif isinstance(val, list):
-                # Only call as_dict if item isn't built in type.
-                for i in range(len(val)):
-                    if Model._is_builtin(val[i]):
-                        continue
-                    val[i] = val[i].as_dict()
-            # Add boolean values
-            elif isinstance(val, bool):
-                result[key] = val
-
-            # Add item if it's not None
-            if val:
-                result[key] = val
-
-        return result
+        raise NotImplementedError
 
     @classmethod
     def parse(cls, json):
         """Parse a JSON object into a model instance."""
         raise NotImplementedError
 
-    @classmethod
-    def max_position(cls):
-        """Return SQL query to get the highest board postion."""
-        return f"""SELECT MAX(position) FROM {cls.__name__.lower()}"""
+    def key(self):
+        """Return the parent ids and name that identify the object in Planka."""
+        return tuple(getattr(self, attr) for attr in self._parent_keys) + (self.name,)
 
 
 class Project(Model):
@@ -63,28 +119,14 @@ class Project(Model):
         "name": None,
         "boards": list(),
     }
+    _children = {"boards": "Board"}
+
+    __slots__ = tuple(_valid_properties)
 
     def __init__(self, **kwargs):
         """Create a new project instance."""
         for key, default in Project._valid_properties.items():
-            setattr(self, key, kwargs.get(key, default))
-
-    @classmethod
-    def parse(cls, json):
-        """Parse project json."""
-        project = cls()
-        for key, val in json.items():
-            if key == "boards":
-                for index, board in enumerate(val):
-                    val[index] = Board.parse(board)
-
-            if key in cls._valid_properties:
-                setattr(project, key, val)
-        return project
-
-    def insert(self):
-        """Return SQL INSERT query for a Project by name."""
-        return f"""INSERT INTO project (name) VALUES ('{self.name}')"""
+            setattr(self, key, kwargs[key] if key in kwargs else copy(default))
 
     def load_json(self, json, force=False):
         """Load a JSON into a Project Object.
@@ -95,17 +137,11 @@ class Project(Model):
         """
         for key, val in json.items():
             if key == "boards":
-                for index, board in enumerate(val):
-                    # TODO Check if board already exists.
-                    val[index] = Board.parse(board)
-                setattr(self, key, val)
+                # TODO Check if board already exists.
+                self.boards = [Board.parse(board) for board in val]
             elif getattr(self, key) == self._valid_properties[key] or force:
                 setattr(self, key, val)
 
-    def select_id(self):
-        """Return SQL SELECT query for a Project id by the name."""
-        return f"""SELECT id FROM project WHERE name='{self.name}'"""
-
 
 class Board(Model):
     """The Board class."""
@@ -117,42 +153,15 @@ class Board(Model):
         "lists": list(),
         "project_id": 0,
     }
+    _children = {"lists": "List"}
+    _parent_keys = ("project_id",)
+
+    __slots__ = tuple(_valid_properties)
 
     def __init__(self, **kwargs):
         """Create a new board instance."""
         for key, default in Board._valid_properties.items():
-            setattr(self, key, kwargs.get(key, default))
-
-    @classmethod
-    def parse(cls, json):
-        """Parse board json."""
-        board = cls()
-        for key, val in json.items():
-            if key == "lists":
-                for index, _list in enumerate(val):
-                    val[index] = List.parse(_list)
-
-            if key in cls._valid_properties:
-                setattr(board, key, val)
-
-        return board
-
-    def insert(self):
-        """Return SQL INSERT query for a Board requires project id, name, and position."""
-        return f"""
-            INSERT INTO
-                board (project_id, type, name, position)
-            VALUES
-                ({self.project_id}, 'kanban', '{self.name}', {self.position})
-        """
-
-    def select_board(self):
-        """Return SQL SELECT query for a Board by the name."""
-        return f"""SELECT id, position, project_id FROM board WHERE name='{self.name}' AND project_id={self.project_id}"""
-
-    def select_id(self):
-        """Return SQL SELECT query for a Board id by the name."""
-        return f"""SELECT id FROM board WHERE name='{self.name}' AND project_id={self.project_id}"""
+            setattr(self, key, kwargs[key] if key in kwargs else copy(default))
 
 
 class List(Model):
@@ -165,42 +174,15 @@ class List(Model):
         "cards": list(),
         "board_id": 0,
     }
+    _children = {"cards": "Card"}
+    _parent_keys = ("board_id",)
+
+    __slots__ = tuple(_valid_properties)
 
     def __init__(self, **kwargs):
         """Create a new list instance."""
         for key, default in List._valid_properties.items():
-            setattr(self, key, kwargs.get(key, default))
-
-    @classmethod
-    def parse(cls, json):
-        """Parse list json."""
-        _list = cls()
-        for key, val in json.items():
-            if key == "cards":
-                for index, card in enumerate(val):
-                    val[index] = Card.parse(card)
-
-            if key in cls._valid_properties:
-                setattr(_list, key, val)
-
-        return _list
-
-    def insert(self):
-        """Return SQL INSERT query for a List requires board id, name, and position."""
-        return f"""
-            INSERT INTO
-                list (board_id, name, position)
-            VALUES
-                ({self.board_id}, '{self.name}', {self.position})
-        """
-
-    def select_list(self):
-        """Return SQL SELECT query for a List by the name."""
-        return f"""SELECT id, position, board_id FROM list WHERE name='{self.name}' AND board_id={self.board_id}"""
-
-    def select_id(self):
-        """Return SQL SELECT query for a List id by the name."""
-        return f"""SELECT id FROM list WHERE name='{self.name}' AND board_id={self.board_id}"""
+            setattr(self, key, kwargs[key] if key in kwargs else copy(default))
 
 
 class Card(Model):
@@ -214,39 +196,98 @@ class Card(Model):
         "board_id": 0,
         "list_id": 0,
     }
+    _parent_keys = ("board_id", "list_id")
+
+    __slots__ = tuple(_valid_properties)
 
     def __init__(self, **kwargs):
         """Create a new card instance."""
         for key, default in Card._valid_properties.items():
-            setattr(self, key, kwargs.get(key, default))
+            setattr(self, key, kwargs[key] if key in kwargs else copy(default))
+
+
+class CardBatch(object):
+    """Many cards held column by column in parallel arrays.
+
+    Every Card object costs an instance plus its attribute values. A batch
+    keeps the ids, parent ids, and positions of all its cards in typed arrays
+    and their names in a single list, with the tasks of every card in one flat
+    list indexed by offsets. Ids that are not known yet are stored as 0 and
+    missing positions as NaN.
+    """
+
+    __slots__ = (
+        "ids",
+        "board_ids",
+        "list_ids",
+        "positions",
+        "names",
+        "task_offsets",
+        "task_names",
+    )
+
+    def __init__(self, cards: Iterable["Card"] = ()):
+        """Create a new batch holding cards."""
+        self.ids = array("q")
+        self.board_ids = array("q")
+        self.list_ids = array("q")
+        self.positions = array("d")
+        self.names = list()
+        self.task_offsets = array("q", [0])
+        self.task_names = list()
+        self.extend(cards)
 
     @classmethod
-    def parse(cls, json):
-        """Parse card json."""
-        card = cls()
-        for key, val in json.items():
-            if key in cls._valid_properties:
-                setattr(card, key, val)
-
-        return card
-
-    def get_tasks(self):
-        """Return SQL query to get the tasks associated with a card."""
-        return f"""SELECT name FROM task WHERE card_id={self.id}"""
-
-    def insert(self):
-        """Return SQL INSERT query for a Card requires board id, list id, name, and position."""
-        return f"""
-                    INSERT INTO
-                        card (board_id, list_id, name, position)
-                    VALUES
-                        ({self.board_id}, {self.list_id}, '{self.name}', {self.position})
-                """
-
-    def select_card(self):
-        """Return SQL SELECT query for a Card by the name."""
-        return f"""SELECT id, position, board_id, list_id FROM card WHERE name='{self.name}' AND board_id={self.board_id} AND list_id={self.list_id}"""
-
-    def select_id(self):
-        """Return SQL SELECT query for a Card id by the name."""
-        return f"""SELECT id FROM card WHERE name='{self.name}' AND board_id={self.board_id} AND list_id={self.list_id}"""
+    def from_lists(cls, lists: Iterable["List"]):
+        """Return a batch of the cards of lists, taking parent ids from the lists."""
+        batch = cls()
+        for _list in lists:
+            for card in _list.cards:
+                batch.append(card, board_id=_list.board_id, list_id=_list.id)
+        return batch
+
+    def __len__(self):
+        """Return the number of cards in the batch."""
+        return len(self.names)
+
+    def __getitem__(self, index):
+        """Return the card at index as a Card object."""
+        position = self.positions[index]
+        return Card(
+            id=self.ids[index] or None,
+            name=self.names[index],
+            position=None if math.isnan(position) else position,
+            tasks=self.tasks(index),
+            board_id=self.board_ids[index],
+            list_id=self.list_ids[index],
+        )
+
+    def __iter__(self):
+        """Yield every card of the batch as a Card object."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, card: "Card", board_id=None, list_id=None):
+        """Add a card, optionally overriding its parent ids."""
+        self.ids.append(card.id or 0)
+        self.board_ids.append(card.board_id if board_id is None else board_id)
+        self.list_ids.append(card.list_id if list_id is None else list_id)
+        self.positions.append(math.nan if card.position is None else card.position)
+        self.names.append(card.name)
+        self.task_names.extend(card.tasks)
+        self.task_offsets.append(len(self.task_names))
+
+    def extend(self, cards: Iterable["Card"]):
+        """Add many cards."""
+        for card in cards:
+            self.append(card)
+
+    def tasks(self, index):
+        """Return the tasks of the card at index."""
+        start = self.task_offsets[index]
+        end = self.task_offsets[index + 1]
+        return self.task_names[start:end]
+
+    def keys(self):
+        """Yield the (board id, list id, name) key of every card, like Card.key."""
+        return zip(self.board_ids, self.list_ids, self.names)
@@ -0,0 +1,160 @@
+"""Keep many independent read queries in flight with asyncio."""
+
+# Standard Python Libraries
+import asyncio
+import logging
+import time
+
+# Third-Party Libraries
+import psycopg2
+from psycopg2 import OperationalError
+from psycopg2.extensions import POLL_OK, POLL_READ, POLL_WRITE
+
+# Project Libraries
+from . import stats
+from .statements import BoundStatement
+
+
+class AsyncConnection(object):
+    """A psycopg2 connection in asynchronous mode driven by an asyncio loop.
+
+    Asynchronous connections are always in autocommit mode, so they only see
+    rows that have been committed.
+    """
+
+    def __init__(self, **kwargs):
+        """Start connecting to the postgres database with psycopg2.connect arguments."""
+        self.connection = psycopg2.connect(async_=1, **kwargs)
+        self._ready = False
+
+    async def _wait(self):
+        """Wait until the connection has finished its current operation."""
+        loop = asyncio.get_event_loop()
+        fd = self.connection.fileno()
+        while True:
+            state = self.connection.poll()
+            if state == POLL_OK:
+                return
+
+            future = loop.create_future()
+
+            def wake():
+                if not future.done():
+                    future.set_result(None)
+
+            if state == POLL_READ:
+                (watch, unwatch) = (loop.add_reader, loop.remove_reader)
+            elif state == POLL_WRITE:
+                (watch, unwatch) = (loop.add_writer, loop.remove_writer)
+            else:
+                raise OperationalError(f"Unexpected poll state {state}.")
+
+            watch(fd, wake)
+            try:
+                await future
+            finally:
+                unwatch(fd)
+
+    async def execute(self, query):
+        """Execute a query or BoundStatement and return its rows, or None if it returns none."""
+        if not self._ready:
+            await self._wait()
+            self._ready = True
+
+        logging.debug(f"Executing Async Query: {query}")
+        start = time.perf_counter()
+        cursor = self.connection.cursor()
+        if isinstance(query, BoundStatement):
+            # Only one command can be in flight, so preparing is a step of its own.
+            if not query.is_prepared(self.connection):
+                cursor.execute(query.statement.prepare())
+                await self._wait()
+                query.set_prepared(self.connection)
+            cursor.execute(query.statement.execute(), query.params or None)
+        else:
+            cursor.execute(query)
+        await self._wait()
+        if cursor.description is None:
+            stats.record(query, max(cursor.rowcount, 0), time.perf_counter() - start)
+            return None
+        rows = cursor.fetchall()
+        stats.record(query, len(rows), time.perf_counter() - start)
+        return rows
+
+    def close(self):
+        """Close the connection."""
+        self.connection.close()
+
+
+class AsyncExecutor(object):
+    """Run batches of independent read queries over several connections.
+
+    Each connection has one query in flight at a time, so up to size queries
+    wait on the network together instead of one after another.
+
+    Only lookups of committed rows are run here. execute_read_query and
+    execute_query stay synchronous on the import's own connection, as its
+    writes and the reads that must see them belong to one transaction, which
+    an asynchronous connection in autocommit mode cannot hold.
+    """
+
+    def __init__(self, size, db_name, db_user, db_password, db_host, db_port):
+        """Create a new executor with up to size asynchronous connections.
+
+        Args:
+            size (int): The most queries kept in flight at once.
+            db_name (string): Database Name
+            db_user (string): Database Username
+            db_password (string): Database password
+            db_host (string): Database Hostname
+            db_port (string): Database Port Number
+        """
+        self.size = size
+        self.loop = asyncio.new_event_loop()
+        self._kwargs = dict(
+            database=db_name,
+            user=db_user,
+            password=db_password,
+            host=db_host,
+            port=db_port,
+        )
+        self._connections = []
+
+    async def _run(self, queries):
+        """Execute queries concurrently, returning their rows in order."""
+        while len(self._connections) < min(self.size, len(queries)):
+            self._connections.append(AsyncConnection(**self._kwargs))
+
+        idle = asyncio.Queue()
+        for connection in self._connections:
+            idle.put_nowait(connection)
+
+        async def run(query):
+            connection = await idle.get()
+            try:
+                return await connection.execute(query)
+            finally:
+                idle.put_nowait(connection)
+
+        return await asyncio.gather(*(run(query) for query in queries))
+
+    def run(self, queries):
+        """Execute independent read queries and return their rows in order.
+
+        Args:
+            queries (list[string]): The SQL queries to be run.
+
+        Returns:
+            list(list(tuples)): The results of each SQL query.
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        return self.loop.run_until_complete(self._run(queries))
+
+    def close(self):
+        """Close every connection and the event loop."""
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self.loop.close()
@@ -0,0 +1,124 @@
+"""The interface between the importer and the database it imports into."""
+
+# Project Libraries
+from .statements import run
+
+
+class Backend(object):
+    """A database the importer can read from and write to.
+
+    The importer only runs queries through execute_read_query, execute_query,
+    and copy_query, which hand them to a backend. Queries are either SQL
+    strings or prepared statements from the statements module, and each
+    backend runs them in its own dialect.
+
+    Anything with the methods of a Backend can be passed where the importer
+    expects a connection, including a Transaction wrapping a backend. Other
+    connections are treated as psycopg2 connections.
+    """
+
+    def read(self, query):
+        """Run a query and return the rows it selected.
+
+        Args:
+            query (string or BoundStatement): The SQL query or prepared statement to be run.
+
+        Returns:
+            list(tuples): The rows selected by the query.
+        """
+        raise NotImplementedError
+
+    def write(self, query):
+        """Run a query changing the database.
+
+        Args:
+            query (string or BoundStatement): The SQL query or prepared statement to be run.
+
+        Returns:
+            tuple(list(tuples), int): The rows produced by a RETURNING clause,
+                otherwise None, and the number of rows changed.
+        """
+        raise NotImplementedError
+
+    def copy(self, query, stream):
+        """Run a COPY ... FROM STDIN query reading rows from a stream.
+
+        Args:
+            query (string): The SQL COPY query to be run.
+            stream (file-like): An object with a read method returning the rows.
+
+        Returns:
+            int: The number of rows copied.
+        """
+        raise NotImplementedError
+
+    def commit(self):
+        """Commit the current transaction."""
+        raise NotImplementedError
+
+    def rollback(self):
+        """Roll back the current transaction."""
+        raise NotImplementedError
+
+    def close(self):
+        """Close the connection to the database."""
+        raise NotImplementedError
+
+
+class PostgresBackend(Backend):
+    """Run queries on a psycopg2 connection, or anything acting like one."""
+
+    def __init__(self, connection):
+        """Create a new backend on the given connection.
+
+        Args:
+            connection (Psycopg2 Connection): The connection to the postgres database.
+        """
+        self.connection = connection
+
+    def read(self, query):
+        """Run a query and return the rows it selected."""
+        cursor = self.connection.cursor()
+        run(cursor, query)
+        return cursor.fetchall()
+
+    def write(self, query):
+        """Run a query changing the database, returning its rows and row count."""
+        cursor = self.connection.cursor()
+        run(cursor, query)
+        rows = cursor.fetchall() if cursor.description is not None else None
+        return (rows, max(cursor.rowcount, 0))
+
+    def copy(self, query, stream):
+        """Run a COPY ... FROM STDIN query reading rows from a stream."""
+        cursor = self.connection.cursor()
+        cursor.copy_expert(query, stream)
+        return max(cursor.rowcount, 0)
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.connection.commit()
+
+    def rollback(self):
+        """Roll back the current transaction."""
+        self.connection.rollback()
+
+    def close(self):
+        """Close the connection to the database."""
+        self.connection.close()
+
+
+def backend(connection):
+    """Return the backend that runs queries on a connection.
+
+    Args:
+        connection (Backend or Psycopg2 Connection): A backend, or a connection
+            to the postgres database.
+
+    Returns:
+        Backend: The connection itself if it is a backend, otherwise a
+            PostgresBackend on it.
+    """
+    if callable(getattr(connection, "read", None)):
+        return connection
+    return PostgresBackend(connection)
@@ -0,0 +1,454 @@
+"""Import many JSON files into Planka projects in one process."""
+
+# Standard Python Libraries
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from functools import partial
+import gc
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# Third-Party Libraries
+from psycopg2 import OperationalError
+
+# Project Libraries
+from ._version import __version__
+from . import stats
+from .cache import IdCache
+from .db import ERRORS, Transaction, create_pool
+from .hashes import HashStore
+from .planka_import import (
+    build_new,
+    create_project,
+    demo_user_id,
+    find_project,
+    load_cards,
+)
+
+
+def read_manifest(source, extension=".json"):
+    """Return the projects and files to import from a directory or manifest.
+
+    A directory imports each of its files with the extension into a project
+    named after the file. A manifest is a CSV file of project name and file name rows,
+    with file names relative to the manifest. Blank rows and rows starting
+    with # are skipped.
+
+    Args:
+        source (string): The directory or manifest file.
+        extension (string, optional): The extension of the files of a directory. Defaults to ".json".
+
+    Returns:
+        list(tuple(string, string)): The project name and file name pairs.
+    """
+    if os.path.isdir(source):
+        return [
+            (os.path.splitext(name)[0], os.path.join(source, name))
+            for name in sorted(os.listdir(source))
+            if name.endswith(extension)
+        ]
+
+    base = os.path.dirname(source)
+    with open(source, newline="") as fp:
+        return [
+            (row[0].strip(), os.path.join(base, row[1].strip()))
+            for row in csv.reader(fp)
+            if row and not row[0].startswith("#")
+        ]
+
+
+class Result(object):
+    """The outcome of importing one file."""
+
+    def __init__(self, project, file_name):
+        """Create a new result for a file being imported into a project."""
+        self.project = project
+        self.file_name = file_name
+        self.status = "failed"
+        self.seconds = 0.0
+        self.statements = 0
+        self.error = None
+
+    def as_dict(self):
+        """Return a dict representation of the result."""
+        return {
+            "project": self.project,
+            "file": self.file_name,
+            "status": self.status,
+            "seconds": self.seconds,
+            "statements": self.statements,
+            "error": self.error,
+        }
+
+
+class BatchRunner(object):
+    """Import files into projects over connections shared between files.
+
+    The files of each project are imported one after another, in a
+    transaction per file, so no two files ever change the same project at
+    once. Different projects are imported at the same time with jobs above
+    one. A file that fails is rolled back and the batch goes on with the
+    next one.
+
+    With new set, projects are created before their first file and the
+    later files of a project created by the batch are loaded into it.
+    Projects that existed before the batch are not changed.
+
+    Every project shares one IdCache and one HashStore, which its threads
+    take turns to use.
+    """
+
+    def __init__(
+        self,
+        pool,
+        new=False,
+        bulk=False,
+        stream=None,
+        commit_every=0,
+        cache=None,
+        hashes=None,
+        database=None,
+        file_format="json",
+    ):
+        """Create a new runner taking connections from a pool.
+
+        Args:
+            pool (ThreadedConnectionPool): The pool of connections to the postgres database.
+            new (bool, optional): Set to True to create new projects rather than load into existing ones. Defaults to False.
+            bulk (bool, optional): Set to True to load cards and tasks through COPY. Defaults to False.
+            stream (string, optional): "board" or "list" to read and import files one board or list at a time. Defaults to None.
+            commit_every (int, optional): Statements per commit, 0 to commit each file once. Defaults to 0.
+            cache (string, optional): The SQLite file of an IdCache shared by the imports. Defaults to None.
+            hashes (string, optional): The SQLite file of a HashStore shared by the imports. Defaults to None.
+            database (string, optional): Identifies the Planka database in the cache and hash files. Defaults to None.
+            file_format (string, optional): "json", "trello", or "csv", the format of the files. Defaults to "json".
+        """
+        self.pool = pool
+        self.new = new
+        self.bulk = bulk
+        self.stream = stream
+        self.commit_every = commit_every
+        self.cache = cache
+        self.hashes = hashes
+        self.database = database
+        self.file_format = file_format
+        self._user_id = None
+        self._lock = threading.Lock()
+
+    def run(self, entries, jobs=1):
+        """Import every file and return their results in the order given.
+
+        Args:
+            entries (list(tuple(string, string))): The project name and file name pairs.
+            jobs (int, optional): The number of projects imported at the same time. Defaults to 1.
+
+        Returns:
+            list[Result]: The result of each file.
+        """
+        projects = dict()
+        for index, (project, file_name) in enumerate(entries):
+            projects.setdefault(project, []).append((index, project, file_name))
+
+        results = [None] * len(entries)
+        cache = IdCache(self.cache, self.database) if self.cache else None
+        hashes = HashStore(self.hashes, self.database) if self.hashes else None
+        run = partial(self._run_project, cache=cache, hashes=hashes)
+        try:
+            if jobs > 1:
+                with ThreadPoolExecutor(max_workers=jobs) as executor:
+                    for group in executor.map(run, projects.values()):
+                        for index, result in group:
+                            results[index] = result
+            else:
+                for group in map(run, projects.values()):
+                    for index, result in group:
+                        results[index] = result
+        finally:
+            if cache:
+                cache.close()
+            if hashes:
+                hashes.close()
+        return results
+
+    def user_id(self, connection):
+        """Return the id of the demo user, looking it up once per batch."""
+        with self._lock:
+            if self._user_id is None:
+                self._user_id = demo_user_id(connection)
+            return self._user_id
+
+    def _run_project(self, entries, cache, hashes):
+        """Import the files of one project on a connection from the pool."""
+        connection = self.pool.getconn()
+        created = False
+        results = []
+        try:
+            for index, project, file_name in entries:
+                result = self._import(
+                    connection, project, file_name, created, cache, hashes
+                )
+                created = created or (self.new and result.status == "imported")
+                results.append((index, result))
+        finally:
+            self.pool.putconn(connection)
+        return results
+
+    def _import(self, connection, name, file_name, created, cache, hashes):
+        """Import a file into a project and return the result."""
+        result = Result(name, file_name)
+        start = time.perf_counter()
+        try:
+            with Transaction(connection, self.commit_every) as transaction:
+                project = find_project(transaction, name)
+                if self.new and project is None:
+                    project = create_project(
+                        transaction, name, self.user_id(transaction)
+                    )
+                elif self.new and not created:
+                    raise ValueError(f'Project "{name}" exists.')
+                elif project is None:
+                    raise ValueError(f"Project {name} does not exist.")
+
+                function = build_new if self.new and not created else load_cards
+                function(
+                    transaction,
+                    project,
+                    file_name,
+                    bulk=self.bulk,
+                    stream=self.stream,
+                    cache=cache,
+                    hashes=hashes,
+                    file_format=self.file_format,
+                )
+            result.status = "imported"
+            result.statements = transaction.statements
+        except ERRORS + (ValueError, KeyError, OSError) as e:
+            # One bad file must not stop the rest of the batch.
+            logging.error(f"Importing {file_name} failed: {e}")
+            result.error = str(e)
+        result.seconds = time.perf_counter() - start
+        return result
+
+
+def report(results, fp):
+    """Write a table of the results of a batch to a file.
+
+    Args:
+        results (list[Result]): The result of each file.
+        fp (file): The file the table is written to.
+    """
+    fp.write(
+        f"{'project':<24}{'file':<32}{'status':<10}{'seconds':>9}{'statements':>12}\n"
+    )
+    for result in results:
+        fp.write(
+            f"{result.project:<24}{os.path.basename(result.file_name):<32}"
+            f"{result.status:<10}{result.seconds:>9.2f}{result.statements:>12}\n"
+        )
+    imported = sum(result.status == "imported" for result in results)
+    fp.write(f"{imported} of {len(results)} files imported.\n")
+
+
+def main():
+    """Set up logging, connect to Postgres, and import every file."""
+    parser = argparse.ArgumentParser(
+        description="Import many JSON files into Planka in one process.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "SOURCE",
+        action="store",
+        help="A directory of files in --format, each imported into the project named after it, or a CSV manifest of project name and file name rows.",
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "-l",
+        "--load",
+        action="store_true",
+        dest="load",
+        help="Load each file into its existing project.",
+    )
+    group.add_argument(
+        "-n",
+        "--new",
+        action="store_true",
+        dest="new",
+        help="Create each project and build it from its files.",
+    )
+    parser.add_argument(
+        "--DB-host",
+        action="store",
+        dest="db_host",
+        default="127.0.0.1",
+        help="The host IP for the postgres server.",
+    )
+    parser.add_argument(
+        "--DB-pwd",
+        action="store",
+        dest="db_pwd",
+        default="postgres",
+        help="Password for the postgres server.",
+    )
+    parser.add_argument(
+        "--DB-port",
+        action="store",
+        dest="db_port",
+        default="5432",
+        help="Port fo the postgres server.",
+    )
+    parser.add_argument(
+        "--DB-name",
+        action="store",
+        dest="db_name",
+        default="planka",
+        help="Postgres database name.",
+    )
+    parser.add_argument(
+        "--DB-user",
+        action="store",
+        dest="db_user",
+        default="postgres",
+        help="Username for the postgres server.",
+    )
+    parser.add_argument(
+        "--jobs",
+        action="store",
+        dest="jobs",
+        default=1,
+        type=int,
+        help="Import this many projects at the same time, each over its own connection.",
+    )
+    parser.add_argument(
+        "--format",
+        action="store",
+        dest="file_format",
+        default="json",
+        choices=["json", "trello", "csv"],
+        help="The format of the files: the import JSON, Trello board exports, or CSV rows with board, list, card, and task columns.",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        dest="bulk",
+        help="Load cards and tasks through COPY staging tables.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store",
+        dest="stream",
+        choices=["board", "list"],
+        help="Read each JSON file incrementally and import it one board or one list at a time.",
+    )
+    parser.add_argument(
+        "--commit-every",
+        action="store",
+        dest="commit_every",
+        default=0,
+        type=int,
+        help="Commit every N statements. By default each file is committed once and rolled back on failure.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store",
+        dest="cache",
+        help="Keep the ids of each project's boards, lists, and cards in this SQLite file.",
+    )
+    parser.add_argument(
+        "--hashes",
+        action="store",
+        dest="hashes",
+        help="Keep a content hash of each project's boards, lists, and cards in this SQLite file, skipping the ones unchanged since the last import.",
+    )
+    parser.add_argument(
+        "--summary-json",
+        action="store",
+        dest="summary_json",
+        help="Write the result of each file to this JSON file.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        dest="stats",
+        help="Print the count, rows, and latency of the queries run by the whole batch.",
+    )
+    parser.add_argument(
+        "--log-level",
+        action="store",
+        dest="log_level",
+        default="info",
+        help='If specified, then the log level will be set to the specified value.  Valid values are "debug", "info", "warning", "error", and "critical".',
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+
+    args = parser.parse_args()
+
+    # Set up logging
+    log_level = args.log_level
+    try:
+        logging.basicConfig(
+            format="%(levelname)s: %(message)s", level=log_level.upper()
+        )
+    except ValueError:
+        logging.critical(
+            f'"{log_level}" is not a valid logging level. Possible values are debug, info, warning, error, and critical.'
+        )
+        return 1
+
+    extension = ".csv" if args.file_format == "csv" else ".json"
+    entries = read_manifest(args.SOURCE, extension)
+    if not entries:
+        logging.error(f"No files to import in {args.SOURCE}.")
+        return 1
+
+    # Like planka-import, the batch runs without the cyclic garbage collector.
+    gc.disable()
+
+    query_stats = stats.enable() if args.stats else None
+
+    try:
+        pool = create_pool(
+            max(args.jobs, 1),
+            args.db_name,
+            args.db_user,
+            args.db_pwd,
+            args.db_host,
+            args.db_port,
+        )
+    except OperationalError as e:
+        logging.error(f"The connection error '{e}' occurred")
+        return 1
+
+    runner = BatchRunner(
+        pool,
+        args.new,
+        args.bulk,
+        args.stream,
+        args.commit_every,
+        args.cache,
+        args.hashes,
+        f"{args.db_host}:{args.db_port}/{args.db_name}",
+        args.file_format,
+    )
+    try:
+        results = runner.run(entries, args.jobs)
+    finally:
+        pool.closeall()
+
+    report(results, sys.stdout)
+    if query_stats is not None:
+        query_stats.report(sys.stdout)
+    if args.summary_json:
+        with open(args.summary_json, "w") as fp:
+            json.dump([result.as_dict() for result in results], fp, indent=2)
+        logging.info(f"Summary saved to {args.summary_json}")
+
+    return 0 if all(result.status == "imported" for result in results) else 1
+
+
+if __name__ == "__main__":
+    main()
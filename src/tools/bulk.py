@@ -0,0 +1,174 @@
+"""Bulk load cards and tasks through COPY staging tables."""
+
+# Standard Python Libraries
+import logging
+
+# Project Libraries
+from models.models import POSITION_GAP
+
+from .db import copy_query, execute_query
+
+CREATE_STAGES = """
+    DROP TABLE IF EXISTS card_stage, task_stage;
+    CREATE TEMP TABLE card_stage (
+        ord bigint, board_id bigint, list_id bigint, name text
+    );
+    CREATE TEMP TABLE task_stage (
+        ord bigint, list_id bigint, card_name text, name text
+    );
+"""
+
+COPY_CARDS = """COPY card_stage (ord, board_id, list_id, name) FROM STDIN"""
+
+COPY_TASKS = """COPY task_stage (ord, list_id, card_name, name) FROM STDIN"""
+
+# Cards already in a list are skipped, like the lookups of BatchImporter, and
+# new cards are positioned after the last card of their list in the order they
+# were staged.
+MERGE_CARDS = f"""
+    WITH inserted AS (
+        INSERT INTO
+            card (board_id, list_id, name, position)
+        SELECT
+            s.board_id,
+            s.list_id,
+            s.name,
+            COALESCE(p.position + {POSITION_GAP}, 0)
+                + {POSITION_GAP} * (ROW_NUMBER() OVER (PARTITION BY s.list_id ORDER BY s.ord) - 1)
+        FROM (
+            SELECT DISTINCT ON (list_id, name) ord, board_id, list_id, name
+            FROM card_stage
+            ORDER BY list_id, name, ord
+        ) s
+        LEFT JOIN (
+            SELECT list_id, MAX(position) AS position
+            FROM card
+            WHERE list_id IN (SELECT list_id FROM card_stage)
+            GROUP BY list_id
+        ) p ON p.list_id = s.list_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM card c WHERE c.list_id = s.list_id AND c.name = s.name
+        )
+        ORDER BY s.ord
+        RETURNING 1
+    )
+    SELECT COUNT(*) FROM inserted
+"""
+
+# Tasks are matched to the first card with their card name in the list and are
+# skipped when the card already has a task with the same name, like
+# BatchImporter.add_tasks.
+MERGE_TASKS = """
+    WITH inserted AS (
+        INSERT INTO
+            task (card_id, name, is_completed)
+        SELECT c.id, s.name, false
+        FROM (
+            SELECT DISTINCT ON (list_id, card_name, name) ord, list_id, card_name, name
+            FROM task_stage
+            ORDER BY list_id, card_name, name, ord
+        ) s
+        JOIN (
+            SELECT list_id, name, MIN(id) AS id
+            FROM card
+            WHERE list_id IN (SELECT list_id FROM task_stage)
+            GROUP BY list_id, name
+        ) c ON c.list_id = s.list_id AND c.name = s.card_name
+        WHERE NOT EXISTS (
+            SELECT 1 FROM task t WHERE t.card_id = c.id AND t.name = s.name
+        )
+        ORDER BY s.ord
+        RETURNING 1
+    )
+    SELECT COUNT(*) FROM inserted
+"""
+
+DROP_STAGES = """DROP TABLE card_stage, task_stage"""
+
+
+def _copy_value(value):
+    """Return a value escaped for the COPY text format."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class CopyStream(object):
+    """A file-like object producing COPY text rows from an iterable of tuples.
+
+    Rows are only formatted as COPY reads them, so the data being loaded is
+    never held in memory as a whole.
+    """
+
+    def __init__(self, rows):
+        """Create a new stream over the given rows."""
+        self._lines = (
+            "\t".join(_copy_value(value) for value in row) + "\n" for row in rows
+        )
+        self._buffer = ""
+
+    def read(self, size=-1):
+        """Return up to size characters of COPY text."""
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for line in self._lines:
+            chunks.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+
+        data = "".join(chunks)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _card_rows(batch):
+    """Yield the COPY rows of card_stage for a CardBatch."""
+    return zip(range(len(batch)), batch.board_ids, batch.list_ids, batch.names)
+
+
+def _task_rows(batch):
+    """Yield the COPY rows of task_stage for the tasks of a CardBatch."""
+    index = 0
+    for card_index, (list_id, name) in enumerate(zip(batch.list_ids, batch.names)):
+        for task in batch.tasks(card_index):
+            yield (index, list_id, name, task)
+            index += 1
+
+
+def copy_cards(connection, batch):
+    """Load a batch of cards and their tasks through COPY.
+
+    The cards and tasks are streamed into temporary staging tables and merged
+    into the card and task tables with one INSERT ... SELECT each.
+
+    Args:
+        connection (Psycopg2 Connection): The connection to the postgres database.
+        batch (CardBatch): The cards, with their board and list ids populated.
+
+    Returns:
+        tuple(int, int): The number of cards and tasks that were created.
+    """
+    execute_query(connection, CREATE_STAGES)
+
+    copy_query(connection, COPY_CARDS, CopyStream(_card_rows(batch)))
+    copy_query(connection, COPY_TASKS, CopyStream(_task_rows(batch)))
+
+    # A merge that failed outside a Transaction was logged and added nothing.
+    cards = (execute_query(connection, MERGE_CARDS) or [(0,)])[0][0]
+    logging.info(f"Added {cards} Cards.")
+    tasks = (execute_query(connection, MERGE_TASKS) or [(0,)])[0][0]
+    logging.info(f"Added {tasks} Tasks.")
+
+    execute_query(connection, DROP_STAGES)
+
+    return (cards, tasks)
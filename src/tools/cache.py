@@ -0,0 +1,177 @@
+"""Cache the ids of the boards, lists, and cards of a project on disk."""
+
+# Standard Python Libraries
+import logging
+import sqlite3
+import threading
+
+# Project Libraries
+from models.models import Board, Card, List
+
+from . import statements
+from .db import execute_read_query
+
+KINDS = ("board", "list", "card")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS fingerprint (
+        database TEXT, project_id INTEGER, kind TEXT,
+        max_id INTEGER, count INTEGER, updated_at TEXT,
+        PRIMARY KEY (database, project_id, kind)
+    );
+    CREATE TABLE IF NOT EXISTS object (
+        database TEXT, project_id INTEGER, kind TEXT,
+        id INTEGER, parent_id INTEGER, name TEXT, position REAL,
+        PRIMARY KEY (database, project_id, kind, id)
+    );
+"""
+
+
+def _latest(*values):
+    """Return the latest of timestamps in text form, ignoring None."""
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+class IdCache(object):
+    """A SQLite file mapping the name paths of a project to Planka ids.
+
+    The cache holds every board, list, and card of a project. It is checked
+    against the database with one query before it is used and brought up to
+    date by fetching only the rows added since, so an import seeded from it
+    needs no lookups for boards, lists, or cards. A table whose cached rows
+    were removed or updated, such as by a rename in Planka, is read again in
+    full.
+
+    One cache can be shared by threads importing different projects, as
+    only one of them uses the file at a time.
+    """
+
+    def __init__(self, path, database):
+        """Open or create a cache file.
+
+        Args:
+            path (string): The path of the SQLite file.
+            database (string): Identifies the Planka database the ids belong to.
+        """
+        self.database = database
+        self.sqlite = sqlite3.connect(path, check_same_thread=False)
+        self.sqlite.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def refresh(self, connection, project_id):
+        """Bring the cache of a project up to date with the database.
+
+        Args:
+            connection (Psycopg2 Connection): The connection to the postgres database.
+            project_id (int): The id of the project.
+        """
+        with self._lock:
+            cached = {kind: (0, 0, None) for kind in KINDS}
+            for kind, max_id, count, updated_at in self.sqlite.execute(
+                "SELECT kind, max_id, count, updated_at FROM fingerprint WHERE database=? AND project_id=?",
+                (self.database, project_id),
+            ):
+                cached[kind] = (max_id, count, updated_at)
+
+            fingerprint = execute_read_query(
+                connection,
+                statements.CACHE_FINGERPRINT(
+                    project_id, *(cached[kind][0] for kind in KINDS)
+                ),
+            )
+            for kind, max_id, count, updated_at in fingerprint:
+                (cached_id, cached_count, cached_updated) = cached[kind]
+                if count != cached_count or updated_at != cached_updated:
+                    logging.info(f"Reloading the cached {kind}s of the project.")
+                    self.sqlite.execute(
+                        "DELETE FROM object WHERE database=? AND project_id=? AND kind=?",
+                        (self.database, project_id, kind),
+                    )
+                    (cached_id, cached_count, cached_updated) = (0, 0, None)
+                elif (max_id or 0) <= cached_id:
+                    continue
+
+                rows = execute_read_query(
+                    connection,
+                    statements.CACHE_ROWS[kind](project_id, cached_id),
+                )
+                logging.debug(f"Caching {len(rows)} {kind}s.")
+                self.sqlite.executemany(
+                    "INSERT OR REPLACE INTO object VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (self.database, project_id, kind) + tuple(row[:4])
+                        for row in rows
+                    ],
+                )
+                self.sqlite.execute(
+                    "INSERT OR REPLACE INTO fingerprint VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self.database,
+                        project_id,
+                        kind,
+                        max([cached_id] + [row[0] for row in rows]),
+                        cached_count + len(rows),
+                        _latest(cached_updated, *(row[4] for row in rows)),
+                    ),
+                )
+
+            self.sqlite.commit()
+
+    def seed(self, importer, project_id):
+        """Give an importer the ids and positions of every cached object.
+
+        The cache must have been refreshed first. Boards, lists, and cards
+        missing from it do not exist, so the importer does not look them up.
+
+        Args:
+            importer (BatchImporter): The importer to seed.
+            project_id (int): The id of the project being imported into.
+        """
+        with self._lock:
+            rows = {kind: [] for kind in KINDS}
+            for kind, _id, parent_id, name, position in self.sqlite.execute(
+                "SELECT kind, id, parent_id, name, position FROM object WHERE database=? AND project_id=? ORDER BY id",
+                (self.database, project_id),
+            ):
+                rows[kind].append((_id, parent_id, name, position))
+
+            boards = {_id for (_id, _, _, _) in rows["board"]}
+            list_boards = {_id: parent_id for (_id, parent_id, _, _) in rows["list"]}
+            parents = {
+                Board: [project_id],
+                List: boards,
+                Card: list(list_boards),
+            }
+            keys = {
+                Board: lambda parent_id, name: (parent_id, name),
+                List: lambda parent_id, name: (parent_id, name),
+                Card: lambda parent_id, name: (
+                    list_boards.get(parent_id),
+                    parent_id,
+                    name,
+                ),
+            }
+
+            for model, kind in ((Board, "board"), (List, "list"), (Card, "card")):
+                ids = importer.ids.setdefault(model, dict())
+                positions = dict()
+                for _id, parent_id, name, position in rows[kind]:
+                    ids.setdefault(keys[model](parent_id, name), (_id, position))
+                    if position is not None:
+                        positions[parent_id] = max(
+                            position, positions.get(parent_id, position)
+                        )
+
+                importer.positions.set_empty(model, parents[model])
+                importer.positions.update(model, positions)
+                importer.complete.add(model)
+
+            logging.info(
+                f"Seeded {sum(len(kind_rows) for kind_rows in rows.values())} ids from the cache."
+            )
+
+    def close(self):
+        """Close the cache file."""
+        with self._lock:
+            self.sqlite.close()
@@ -0,0 +1,141 @@
+"""Submit imports to a running planka-import-daemon.
+
+The client only uses the standard library so it starts quickly, leaving
+the connection to Planka and the import itself to the daemon.
+"""
+
+# Standard Python Libraries
+import argparse
+import json
+import logging
+import os
+import socket
+import sys
+
+# The Unix socket the daemon listens on by default.
+SOCKET = "/tmp/planka-import.sock"
+
+
+def submit(jobs, path=SOCKET):
+    """Send import jobs to the daemon and return its result for each.
+
+    Args:
+        jobs (list(dict)): The jobs, each with a "project" and either a "file" to read or its "data", and optionally "new", "bulk", "stream", and "format".
+        path (string, optional): The Unix socket of the daemon. Defaults to SOCKET.
+
+    Returns:
+        list(dict): The result of each job.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        with sock.makefile("rw") as stream:
+            results = []
+            for job in jobs:
+                stream.write(json.dumps(job) + "\n")
+                stream.flush()
+                results.append(json.loads(stream.readline()))
+    return results
+
+
+def main():
+    """Submit one import to the daemon and print its result."""
+    parser = argparse.ArgumentParser(
+        description="Submit an import to a running planka-import-daemon.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "PROJECT_NAME",
+        action="store",
+        help="The project name.",
+    )
+    parser.add_argument(
+        "FILE_NAME",
+        action="store",
+        help="The file to load content from, or - to read it from standard input.",
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "-l",
+        "--load",
+        action="store_true",
+        dest="load",
+        help="Load the file into an existing project.",
+    )
+    group.add_argument(
+        "-n",
+        "--new",
+        action="store_true",
+        dest="new",
+        help="Create the project and build it from the file.",
+    )
+    parser.add_argument(
+        "--send",
+        action="store_true",
+        dest="send",
+        help="Send the contents of the file rather than its path, for a daemon that cannot read it.",
+    )
+    parser.add_argument(
+        "--format",
+        action="store",
+        dest="file_format",
+        default="json",
+        choices=["json", "trello", "csv"],
+        help="The format of the file: the import JSON, a Trello board export, or CSV rows with board, list, card, and task columns.",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        dest="bulk",
+        help="Load cards and tasks through COPY staging tables.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store",
+        dest="stream",
+        choices=["board", "list"],
+        help="Import the file one board or one list at a time.",
+    )
+    parser.add_argument(
+        "--socket",
+        action="store",
+        dest="socket",
+        default=SOCKET,
+        help="The Unix socket of the daemon.",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+
+    job = {
+        "project": args.PROJECT_NAME,
+        "new": args.new,
+        "bulk": args.bulk,
+        "stream": args.stream,
+        "format": args.file_format,
+    }
+    if args.FILE_NAME == "-":
+        job["data"] = sys.stdin.read()
+    elif args.send:
+        with open(args.FILE_NAME, "r") as fp:
+            job["data"] = fp.read()
+    else:
+        job["file"] = os.path.abspath(args.FILE_NAME)
+
+    try:
+        (result,) = submit([job], args.socket)
+    except OSError as e:
+        logging.error(f"Could not reach the daemon at {args.socket}: {e}")
+        return 1
+
+    if result["status"] != "imported":
+        logging.error(f"Importing into {result['project']} failed: {result['error']}")
+        return 1
+    print(
+        f"Imported into {result['project']} in {result['seconds'] * 1000:.1f} ms "
+        f"({result['statements']} statements)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    main()
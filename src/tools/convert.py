@@ -0,0 +1,180 @@
+"""Read Trello exports and CSV files as boards, a batch of cards at a time."""
+
+# Standard Python Libraries
+import csv
+
+# Project Libraries
+from models.models import Board, Card, List
+
+from .stream import JSONStream
+
+# Cards read before a batch is handed to the importer.
+BATCH_SIZE = 1000
+
+
+class _Batch(object):
+    """Boards being filled with cards until there are enough to import."""
+
+    def __init__(self):
+        """Create a new empty batch."""
+        self.boards = dict()
+        self.lists = dict()
+        self.cards = dict()
+
+    def list(self, board_name, list_name):
+        """Return the list of a board, adding both to the batch if needed."""
+        key = (board_name, list_name)
+        if key not in self.lists:
+            board = self.boards.get(board_name)
+            if board is None:
+                board = self.boards[board_name] = Board(name=board_name, lists=[])
+            _list = self.lists[key] = List(name=list_name, cards=[])
+            board.lists.append(_list)
+        return self.lists[key]
+
+    def card(self, board_name, list_name, card_name):
+        """Return a card of a list, adding it to the batch if needed."""
+        key = (board_name, list_name, card_name)
+        if key not in self.cards:
+            card = self.cards[key] = Card(name=card_name, tasks=[])
+            self.list(board_name, list_name).cards.append(card)
+        return self.cards[key]
+
+    def __len__(self):
+        """Return the number of cards in the batch."""
+        return len(self.cards)
+
+
+def iter_trello(fp, batch_size=BATCH_SIZE):
+    """Yield the board of a Trello JSON export a batch of cards at a time.
+
+    The file is read twice. The first pass keeps the open lists and the
+    checklist items of every card, which become its tasks, and the second
+    adds the open cards in the order of the export. Actions and every other
+    key are skipped one item at a time. Checklists come apart from their
+    cards in an export, so the names of every checklist item are held until
+    the card they belong to is read, and memory grows with the checklist
+    items of the export, while cards are only held a batch at a time. The
+    first batch holds every open list, so lists are created in their Trello
+    order even when they have no cards.
+
+    Args:
+        fp (file): The open Trello export.
+        batch_size (int, optional): The number of cards in each batch. Defaults to BATCH_SIZE.
+
+    Yields:
+        list[Board]: The board holding the next batch of lists and cards.
+
+    Raises:
+        ValueError: The export has no board name.
+    """
+    name = None
+    lists = []
+    tasks = dict()
+
+    stream = JSONStream(fp)
+    for key in stream.members():
+        if key == "name":
+            name = stream.value()
+        elif key == "lists":
+            for _ in stream.items():
+                _list = stream.value()
+                if not _list.get("closed"):
+                    lists.append(_list)
+        elif key == "checklists":
+            for _ in stream.items():
+                checklist = stream.value()
+                items = sorted(
+                    checklist.get("checkItems", []), key=lambda item: item.get("pos", 0)
+                )
+                tasks.setdefault(checklist["idCard"], []).extend(
+                    item["name"] for item in items
+                )
+        else:
+            stream.skip()
+
+    if not name:
+        raise ValueError("Trello export has no board name.")
+
+    lists.sort(key=lambda _list: _list.get("pos", 0))
+    names = {_list["id"]: _list["name"] for _list in lists}
+
+    batch = _Batch()
+    for _list in lists:
+        batch.list(name, _list["name"])
+
+    fp.seek(0)
+    stream = JSONStream(fp)
+    for key in stream.members():
+        if key != "cards":
+            stream.skip()
+            continue
+
+        for _ in stream.items():
+            card = stream.value()
+            list_name = names.get(card.get("idList"))
+            if card.get("closed") or list_name is None:
+                continue
+            batch.card(name, list_name, card["name"]).tasks.extend(
+                tasks.pop(card["id"], [])
+            )
+            if len(batch) >= batch_size:
+                yield list(batch.boards.values())
+                batch = _Batch()
+
+    if batch.boards:
+        yield list(batch.boards.values())
+
+
+def iter_csv(fp, batch_size=BATCH_SIZE):
+    """Yield the boards of a CSV file a batch of cards at a time.
+
+    The file has a header row naming its board, list, card, and task
+    columns, in any order and case. Every row adds its task to its card,
+    its card to its list, and its list to its board, so a card with many
+    tasks takes a row per task. Rows without a card only add their list,
+    and rows are read one at a time, so only a batch is held in memory.
+
+    Args:
+        fp (file): The open CSV file.
+        batch_size (int, optional): The number of cards in each batch. Defaults to BATCH_SIZE.
+
+    Yields:
+        list[Board]: The boards holding the next batch of lists and cards.
+    """
+    reader = csv.reader(fp)
+    header = [column.strip().lower() for column in next(reader, [])]
+    missing = {"board", "list"}.difference(header)
+    if missing:
+        raise ValueError(f"CSV header has no {', '.join(sorted(missing))} column.")
+    columns = {column: header.index(column) for column in header}
+
+    def cell(row, column):
+        """Return the stripped value of a column, or "" if it is missing."""
+        index = columns.get(column)
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    batch = _Batch()
+    for row in reader:
+        (board, _list, card, task) = (
+            cell(row, column) for column in ("board", "list", "card", "task")
+        )
+        if not board or not _list:
+            continue
+        if not card:
+            batch.list(board, _list)
+            continue
+
+        tasks = batch.card(board, _list, card).tasks
+        if task and task not in tasks:
+            tasks.append(task)
+        if len(batch) >= batch_size:
+            yield list(batch.boards.values())
+            batch = _Batch()
+
+    if batch.boards:
+        yield list(batch.boards.values())
+
+
+# The formats other than the import JSON and the function reading each one.
+CONVERTERS = {"trello": iter_trello, "csv": iter_csv}
@@ -0,0 +1,363 @@
+"""Serve imports over a Unix socket from a process kept running."""
+
+# Standard Python Libraries
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+# Third-Party Libraries
+from psycopg2 import OperationalError
+
+# Project Libraries
+from ._version import __version__
+from .batch import Result
+from .cache import IdCache
+from .client import SOCKET
+from .db import ERRORS, Transaction, create_pool
+from .planka_import import (
+    build_new,
+    create_project,
+    demo_user_id,
+    find_project,
+    load_cards,
+)
+from models.models import Project
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """Run the jobs sent on a connection, a JSON line each, and reply to each."""
+
+    def handle(self):
+        """Answer every job with its result as a JSON line."""
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                result = Result(None, None)
+                result.error = f"Invalid job: {e}"
+            else:
+                result = self.server.run(job)
+            self.wfile.write((json.dumps(result.as_dict()) + "\n").encode())
+
+
+class ImportServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Import into Planka for clients on a Unix socket.
+
+    The server keeps what a new planka-import process would have to set up
+    again: a pool of connections, the id of the demo user, the ids of
+    projects, and an IdCache of every project's boards, lists, and cards.
+    The cache is checked against the database with one query per job, so
+    changes made in Planka between jobs are picked up.
+
+    A job is a JSON object with the "project" name, either the "file" to
+    import or its "data", and optionally "new", "bulk", "stream", and the
+    "format" of the file.
+    Each client is served by a thread of its own. Jobs into different
+    projects run at the same time, up to one per connection of the pool,
+    while the jobs of one project run one after another. Each job runs in
+    its own transaction and a job that fails is rolled back without
+    stopping the server.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, pool, jobs=1, cache=":memory:", commit_every=0):
+        """Create a new server listening on a Unix socket.
+
+        Args:
+            path (string): The path of the Unix socket.
+            pool (ThreadedConnectionPool): The pool of connections to the database.
+            jobs (int, optional): The most jobs run at the same time, at most the size of the pool. Defaults to 1.
+            cache (string, optional): The SQLite file of the IdCache, None for no cache. Defaults to ":memory:".
+            commit_every (int, optional): Statements per commit, 0 to commit each job once. Defaults to 0.
+        """
+        # Create the socket without permissions for other users, rather than
+        # narrowing them after bind while it can already be connected to.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, JobHandler)
+        finally:
+            os.umask(umask)
+        self.pool = pool
+        self.commit_every = commit_every
+        self.projects = dict()
+        self.cache = IdCache(cache, "daemon") if cache else None
+        self._user_id = None
+        self._lock = threading.Lock()
+        self._project_locks = dict()
+        self._slots = threading.BoundedSemaphore(jobs)
+
+    def project(self, connection, name, new):
+        """Return the project a job imports into, creating it for a new one.
+
+        The id of a project is kept between jobs. A new project is always
+        looked up, so one deleted in Planka can be created again.
+        """
+        with self._lock:
+            project_id = self.projects.get(name)
+
+        project = None
+        if project_id is not None and not new:
+            project = Project(id=project_id, name=name)
+        else:
+            project = find_project(connection, name)
+
+        if new:
+            if project is not None:
+                raise ValueError(f'Project "{name}" exists.')
+            project = create_project(connection, name, self.user_id(connection))
+        elif project is None:
+            raise ValueError(f"Project {name} does not exist.")
+
+        with self._lock:
+            self.projects[name] = project.id
+        return project
+
+    def user_id(self, connection):
+        """Return the id of the demo user, looking it up once."""
+        with self._lock:
+            if self._user_id is None:
+                self._user_id = demo_user_id(connection)
+            return self._user_id
+
+    def project_lock(self, name):
+        """Return the lock held by the job importing into a project."""
+        with self._lock:
+            return self._project_locks.setdefault(name, threading.Lock())
+
+    def run(self, job):
+        """Run an import job and return its result.
+
+        Args:
+            job (dict): The job sent by the client.
+
+        Returns:
+            Result: The result of the job.
+        """
+        name = job.get("project")
+        with self.project_lock(name), self._slots:
+            return self._run(name, job)
+
+    def _run(self, name, job):
+        """Run an import job on a connection from the pool."""
+        result = Result(name, job.get("file"))
+        start = time.perf_counter()
+        temp = None
+        connection = self.pool.getconn()
+        try:
+            file_name = job.get("file")
+            if file_name is None:
+                # Imports read their file, so data sent by the client is saved first.
+                with tempfile.NamedTemporaryFile("w", newline="", delete=False) as temp:
+                    temp.write(job["data"])
+                file_name = temp.name
+
+            new = bool(job.get("new"))
+            with self._lock:
+                cached = name in self.projects
+            try:
+                transaction = self._import(connection, name, new, file_name, job)
+            except ERRORS as e:
+                if not cached:
+                    raise
+                # The project may have been deleted and created again in
+                # Planka, so its id is looked up again before a second try.
+                logging.warning(
+                    f"Importing into {name} failed, looking up its id again: {e}"
+                )
+                with self._lock:
+                    self.projects.pop(name, None)
+                transaction = self._import(connection, name, new, file_name, job)
+            result.status = "imported"
+            result.statements = transaction.statements
+        except Exception as e:
+            # A failed job must not take the server down with it.
+            logging.error(f"Importing into {name} failed: {e}")
+            result.error = str(e)
+            with self._lock:
+                self.projects.pop(name, None)
+        finally:
+            if temp is not None:
+                os.unlink(temp.name)
+            # End the transaction opened by reads after the last commit, so
+            # the idle connection holds no locks between jobs, and drop a
+            # connection that was closed so the pool opens a new one.
+            closed = bool(getattr(connection, "closed", 0))
+            if not closed:
+                connection.rollback()
+            self.pool.putconn(connection, close=closed)
+        result.seconds = time.perf_counter() - start
+        logging.info(
+            f"{result.status.capitalize()} {name} in {result.seconds * 1000:.1f} ms."
+        )
+        return result
+
+    def _import(self, connection, name, new, file_name, job):
+        """Import a file into a project in a Transaction and return it."""
+        with Transaction(connection, self.commit_every) as transaction:
+            project = self.project(transaction, name, new)
+            function = build_new if new else load_cards
+            function(
+                transaction,
+                project,
+                file_name,
+                bulk=bool(job.get("bulk")),
+                stream=job.get("stream"),
+                cache=self.cache,
+                file_format=job.get("format", "json"),
+            )
+        return transaction
+
+    def server_close(self):
+        """Stop listening, remove the socket, and close the cache."""
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        if self.cache is not None:
+            self.cache.close()
+
+
+def _in_use(path):
+    """Return True if a server is already listening on a Unix socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def main():
+    """Set up logging and serve imports until stopped."""
+    parser = argparse.ArgumentParser(
+        description="Serve imports into Planka over a Unix socket, keeping connections and caches warm.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--socket",
+        action="store",
+        dest="socket",
+        default=SOCKET,
+        help="The Unix socket to listen on.",
+    )
+    parser.add_argument(
+        "--DB-host",
+        action="store",
+        dest="db_host",
+        default="127.0.0.1",
+        help="The host IP for the postgres server.",
+    )
+    parser.add_argument(
+        "--DB-pwd",
+        action="store",
+        dest="db_pwd",
+        default="postgres",
+        help="Password for the postgres server.",
+    )
+    parser.add_argument(
+        "--DB-port",
+        action="store",
+        dest="db_port",
+        default="5432",
+        help="Port fo the postgres server.",
+    )
+    parser.add_argument(
+        "--DB-name",
+        action="store",
+        dest="db_name",
+        default="planka",
+        help="Postgres database name.",
+    )
+    parser.add_argument(
+        "--DB-user",
+        action="store",
+        dest="db_user",
+        default="postgres",
+        help="Username for the postgres server.",
+    )
+    parser.add_argument(
+        "--jobs",
+        action="store",
+        dest="jobs",
+        default=4,
+        type=int,
+        help="Run this many jobs into different projects at the same time, each over its own connection of the pool.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store",
+        dest="cache",
+        default=":memory:",
+        help="Keep the ids of the projects' boards, lists, and cards in this SQLite file. By default they are kept in memory.",
+    )
+    parser.add_argument(
+        "--commit-every",
+        action="store",
+        dest="commit_every",
+        default=0,
+        type=int,
+        help="Commit every N statements. By default each job is committed once and rolled back on failure.",
+    )
+    parser.add_argument(
+        "--log-level",
+        action="store",
+        dest="log_level",
+        default="info",
+        help='If specified, then the log level will be set to the specified value.  Valid values are "debug", "info", "warning", "error", and "critical".',
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+
+    args = parser.parse_args()
+
+    # Set up logging
+    log_level = args.log_level
+    try:
+        logging.basicConfig(
+            format="%(levelname)s: %(message)s", level=log_level.upper()
+        )
+    except ValueError:
+        logging.critical(
+            f'"{log_level}" is not a valid logging level. Possible values are debug, info, warning, error, and critical.'
+        )
+        return 1
+
+    if os.path.exists(args.socket):
+        if _in_use(args.socket):
+            logging.critical(f"A daemon is already listening on {args.socket}.")
+            return 1
+        os.unlink(args.socket)
+
+    jobs = max(args.jobs, 1)
+    try:
+        pool = create_pool(
+            jobs, args.db_name, args.db_user, args.db_pwd, args.db_host, args.db_port
+        )
+    except OperationalError as e:
+        logging.critical(f"The connection error '{e}' occurred")
+        return 1
+
+    server = ImportServer(args.socket, pool, jobs, args.cache, args.commit_every)
+    # Stop cleanly, removing the socket, when asked to terminate.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logging.info(f"Listening on {args.socket} with {jobs} connections.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.closeall()
+
+
+if __name__ == "__main__":
+    main()
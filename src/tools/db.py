@@ -0,0 +1,265 @@
+"""Database helpers shared by the Planka tools."""
+
+# Standard Python Libraries
+import logging
+import sqlite3
+import time
+
+# Third-Party Libraries
+import psycopg2
+from psycopg2 import OperationalError
+from psycopg2.pool import ThreadedConnectionPool
+
+# Project Libraries
+from . import stats
+from .backend import backend
+
+# The errors that are logged rather than raised, from either kind of backend,
+# unless the query runs in a Transaction, which must see them to roll back.
+ERRORS = (psycopg2.Error, sqlite3.Error)
+
+
+def _failed(connection, error):
+    """Log a failed query, raising the error again inside a Transaction."""
+    logging.error(f"The error '{error}' occurred")
+    if isinstance(connection, Transaction):
+        raise error
+
+
+def create_connection(db_name, db_user, db_password, db_host, db_port):
+    """Create connection to postgres database.
+
+    Args:
+        db_name (string): Database Name
+        db_user (string): Database Username
+        db_password (string): Database password
+        db_host (string): Database Hostname
+        db_port (string): Database Port Number
+
+    Raises:
+        e: Connection errors.
+
+    Returns:
+        Psycopg2 Connection: A connection to the postgres database.
+    """
+    logging.debug("Connecting to postgres")
+    connection = None
+    try:
+        connection = psycopg2.connect(
+            database=db_name,
+            user=db_user,
+            password=db_password,
+            host=db_host,
+            port=db_port,
+        )
+        logging.info("Connection to PostgreSQL DB successful")
+    except OperationalError as e:
+        raise e
+
+    return connection
+
+
+def create_pool(size, db_name, db_user, db_password, db_host, db_port):
+    """Create a pool of connections to the postgres database for threads.
+
+    Args:
+        size (int): The most connections the pool will open.
+        db_name (string): Database Name
+        db_user (string): Database Username
+        db_password (string): Database password
+        db_host (string): Database Hostname
+        db_port (string): Database Port Number
+
+    Returns:
+        ThreadedConnectionPool: A pool of connections to the postgres database.
+    """
+    logging.debug(f"Creating a pool of {size} postgres connections")
+    return ThreadedConnectionPool(
+        1,
+        size,
+        database=db_name,
+        user=db_user,
+        password=db_password,
+        host=db_host,
+        port=db_port,
+    )
+
+
+def execute_read_query(connection, query):
+    """Execute a read query on the database.
+
+    Args:
+        connection (Backend or Psycopg2 Connection): The database, or the connection to the postgres database.
+        query (string or BoundStatement): The SQL query or prepared statement to be run.
+
+    Returns:
+        list(tuples): The results of the SQL query.
+
+    Raises:
+        psycopg2.Error or sqlite3.Error: The query failed in a Transaction, so it can be rolled back.
+    """
+    logging.debug(f"Executing Read Query: {query}")
+    result = None
+    try:
+        start = time.perf_counter()
+        result = backend(connection).read(query)
+        stats.record(query, len(result), time.perf_counter() - start)
+        logging.debug("Query was successful.")
+        return result
+    except ERRORS as e:
+        _failed(connection, e)
+
+
+def execute_read_queries(connection, queries, executor=None):
+    """Execute independent read queries on the postgres database.
+
+    Args:
+        connection (Psycopg2 Connection): The connection to the postgres database.
+        queries (list[string]): The SQL queries to be run.
+        executor (AsyncExecutor, optional): Runs the queries concurrently on connections that only see committed rows. Defaults to None.
+
+    Returns:
+        list(list(tuples)): The results of each SQL query.
+    """
+    if executor is not None:
+        return executor.run(queries)
+    return [execute_read_query(connection, query) for query in queries]
+
+
+def execute_query(connection, query):
+    """Execute a query to change the database.
+
+    Args:
+        connection (Backend or Psycopg2 Connection): The database, or the connection to the postgres database.
+        query (string or BoundStatement): The SQL query or prepared statement to be run.
+
+    Returns:
+        list(tuples): Rows produced by a RETURNING clause, otherwise None.
+
+    Raises:
+        psycopg2.Error or sqlite3.Error: The query failed in a Transaction, so it can be rolled back.
+    """
+    logging.debug(f"Executing Action: {query}")
+    result = None
+    try:
+        start = time.perf_counter()
+        (result, rowcount) = backend(connection).write(query)
+        stats.record(query, rowcount, time.perf_counter() - start)
+        connection.commit()
+        logging.debug("Query executed successfully")
+    except ERRORS as e:
+        _failed(connection, e)
+
+    return result
+
+
+def copy_query(connection, query, stream):
+    """Execute a COPY ... FROM STDIN query reading rows from a stream.
+
+    Args:
+        connection (Backend or Psycopg2 Connection): The database, or the connection to the postgres database.
+        query (string): The SQL COPY query to be run.
+        stream (file-like): An object with a read method returning the rows.
+
+    Raises:
+        psycopg2.Error or sqlite3.Error: The query failed in a Transaction, so it can be rolled back.
+    """
+    logging.debug(f"Executing Copy: {query}")
+    try:
+        start = time.perf_counter()
+        rowcount = backend(connection).copy(query, stream)
+        stats.record(query, rowcount, time.perf_counter() - start)
+        connection.commit()
+        logging.debug(f"Copied {rowcount} rows.")
+    except ERRORS as e:
+        _failed(connection, e)
+
+
+class Transaction(object):
+    """Group the statements run on a connection into larger transactions.
+
+    A Transaction wraps a connection and can be used anywhere a connection is
+    expected. The commit issued by execute_query after every statement is
+    deferred until commit_every statements are pending, or until the
+    transaction ends when commit_every is 0. Leaving the transaction because
+    of an exception rolls back everything that has not been committed, and
+    the query helpers raise the errors of queries run in one rather than
+    logging them, so a failed statement always ends the transaction.
+
+    Callables in on_commit are called after every commit, such as to write
+    the progress an import has committed to a Journal.
+    """
+
+    def __init__(self, connection, commit_every=0):
+        """Create a new transaction on the given connection.
+
+        Args:
+            connection (Backend or Psycopg2 Connection): The database, or the connection to the postgres database.
+            commit_every (int, optional): Statements per commit, 0 to commit once. Defaults to 0.
+        """
+        self.connection = connection
+        self.commit_every = commit_every
+        self.pending = 0
+        self.statements = 0
+        self.commits = 0
+        self.commit_seconds = 0.0
+        self.on_commit = []
+
+    def __getattr__(self, name):
+        """Delegate everything else to the wrapped connection."""
+        return getattr(self.connection, name)
+
+    def __enter__(self):
+        """Start the transaction."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Commit the remaining statements, or roll them back on an error."""
+        if exc_type is None:
+            self.flush()
+            self.report()
+        else:
+            logging.error(
+                f"Rolling back {self.pending} uncommitted statements after '{exc_value}'."
+            )
+            self.rollback()
+        return False
+
+    def commit(self):
+        """Record a finished statement, committing once a batch is complete."""
+        self.pending += 1
+        self.statements += 1
+        if self.commit_every and self.pending >= self.commit_every:
+            self._commit()
+
+    def flush(self):
+        """Commit the pending statements now."""
+        if self.pending:
+            self._commit()
+
+    def rollback(self):
+        """Roll back the statements that have not been committed."""
+        self.connection.rollback()
+        self.pending = 0
+
+    def _commit(self):
+        """Commit the pending statements and time the commit."""
+        start = time.perf_counter()
+        self.connection.commit()
+        seconds = time.perf_counter() - start
+        stats.record("COMMIT", 0, seconds)
+        self.commit_seconds += seconds
+        self.commits += 1
+        self.pending = 0
+        for callback in self.on_commit:
+            callback()
+
+    def report(self):
+        """Log the commits made and the commit latency saved by batching."""
+        average = self.commit_seconds / self.commits if self.commits else 0.0
+        saved = max(self.statements - self.commits, 0)
+        logging.info(
+            f"Committed {self.statements} statements in {self.commits} commits "
+            f"({self.commit_seconds * 1000:.1f} ms). Skipped {saved} commits, "
+            f"saving about {saved * average * 1000:.1f} ms."
+        )
@@ -0,0 +1,298 @@
+"""Level-wise batched import of boards, lists, cards, and tasks."""
+
+# Standard Python Libraries
+import logging
+
+# Project Libraries
+from models.models import Board, Card, CardBatch, List
+
+from . import statements, stats
+from .bulk import copy_cards
+from .db import execute_query, execute_read_queries, execute_read_query
+from .positions import PositionAllocator
+
+# Fewest objects looked up by one query when lookups are run concurrently.
+MIN_CHUNK = 500
+
+
+def _chunks(items, count):
+    """Split items into at most count lists of at least MIN_CHUNK items."""
+    count = max(1, min(count, len(items) // MIN_CHUNK))
+    size = -(-len(items) // count)
+    chunks = []
+    for start in range(0, len(items), size):
+        end = start + size
+        chunks.append(items[start:end])
+    return chunks
+
+
+class BatchImporter(object):
+    """Import a tree of boards one level of the tree at a time.
+
+    Each level of boards, lists, and cards is resolved with a single lookup
+    query and the missing objects are created with a single multi-row INSERT,
+    while tasks are only inserted, so the number of queries grows with the
+    depth of the tree rather than with the number of objects in it. Every
+    INSERT skips the objects already in Planka, so an object added since its
+    lookup is never created twice. With bulk set, cards and tasks are instead
+    streamed through COPY and merged server side.
+
+    An importer can run many times, such as once per streamed board. The ids
+    of boards and lists are kept between runs so a parent that shows up again
+    is not looked up again, while cards are not kept so memory stays bounded.
+
+    Given an AsyncExecutor, lookups are split into chunks that are in flight
+    together on connections of their own. Those connections only see
+    committed rows, so lookups under parents the importer has added to are
+    still run on its own connection.
+
+    Models in complete have every existing object in ids, such as when seeded
+    from an IdCache, so objects missing from ids are created without a lookup.
+
+    Given a Journal, the importer records the ids it resolves and the lists
+    it completes, and skips lists the journal has already completed.
+    """
+
+    def __init__(self, connection, bulk=False, executor=None):
+        """Create a new importer using the given connection."""
+        self.connection = connection
+        self.bulk = bulk
+        self.executor = executor
+        self.positions = PositionAllocator(connection)
+        self.ids = {Board: dict(), List: dict()}
+        self.complete = set()
+        self.journal = None
+        self._changed = set()
+
+    def run(self, project, boards):
+        """Import boards and everything under them into a project.
+
+        Args:
+            project (Project): The project the boards belong to, with its id set.
+            boards (list[Board]): The boards to be imported.
+
+        Returns:
+            list[Board]: The boards with the ids of every object populated.
+        """
+        for board in boards:
+            board.project_id = project.id
+
+        self.add_boards(boards)
+        lists = self.pending(self.add_lists(boards))
+        if self.bulk:
+            with stats.phase("copy"):
+                copy_cards(self.connection, CardBatch.from_lists(lists))
+        else:
+            cards = self.add_cards(lists)
+            self.add_tasks(cards)
+        if self.journal is not None:
+            self.journal.finish(lists)
+
+        return boards
+
+    def fork(self, connection):
+        """Return an importer on another connection sharing ids and positions."""
+        importer = BatchImporter(connection, self.bulk)
+        importer.ids = self.ids
+        importer.complete = self.complete
+        importer.journal = self.journal
+        importer.positions = PositionAllocator(connection, self.positions._positions)
+        return importer
+
+    def pending(self, lists):
+        """Return the lists whose cards and tasks the journal has not completed."""
+        if self.journal is None:
+            return lists
+        pending = [_list for _list in lists if _list.id not in self.journal.done]
+        if len(pending) < len(lists):
+            logging.info(f"Skipping {len(lists) - len(pending)} completed Lists.")
+        return pending
+
+    def add_boards(self, boards):
+        """Resolve or create every board in one lookup and one insert."""
+        logging.info(f"Checking for {len(boards)} Boards.")
+        with stats.phase("boards"):
+            self._set_created(List, self._resolve(Board, boards))
+        return boards
+
+    def add_lists(self, boards):
+        """Resolve or create the lists of every board."""
+        lists = []
+        for board in boards:
+            for _list in board.lists:
+                _list.board_id = board.id
+                lists.append(_list)
+
+        logging.info(f"Checking for {len(lists)} Lists.")
+        with stats.phase("lists"):
+            self._set_created(Card, self._resolve(List, lists))
+        return lists
+
+    def add_cards(self, lists):
+        """Resolve or create the cards of every list."""
+        cards = []
+        for _list in lists:
+            for card in _list.cards:
+                card.board_id = _list.board_id
+                card.list_id = _list.id
+                cards.append(card)
+
+        logging.info(f"Checking for {len(cards)} Cards.")
+        with stats.phase("cards"):
+            self._resolve(Card, cards)
+        return cards
+
+    def add_tasks(self, cards):
+        """Add the tasks of every card that are not already in Planka.
+
+        Every task is sent in one INSERT that skips the tasks already on
+        their card, so no task is read first and a card's checklist costs
+        the same single round trip whatever its length.
+
+        Returns:
+            set: The ids of the tasks that were created.
+        """
+        rows = dict()
+        for card in cards:
+            for task in card.tasks:
+                rows[(card.id, task)] = None
+
+        if not rows:
+            return set()
+
+        logging.info(f"Checking for {len(rows)} Tasks.")
+        with stats.phase("tasks"):
+            created = execute_query(self.connection, statements.insert_tasks(rows))
+        added = {(card_id, task) for (_, card_id, task) in created or []}
+        for card_id, task in rows:
+            if (card_id, task) not in added:
+                logging.warning(f"{task} is already on card.")
+        logging.info(f"Added {len(added)} Tasks.")
+        return {task_id for (task_id, _, _) in created or []}
+
+    def _set_created(self, model, parent_ids):
+        """Record new parents, which have no objects of model yet."""
+        self.positions.set_empty(model, parent_ids)
+        self._set_changed(model.__name__.lower(), parent_ids)
+
+    def _set_changed(self, table, parent_ids):
+        """Record parents whose rows in table the importer has added to."""
+        if self.executor is not None:
+            self._changed.update((table, parent_id) for parent_id in parent_ids)
+
+    def _read(self, table, build, objects, parent_of):
+        """Run a lookup query built for objects and return all of its rows.
+
+        Args:
+            table (str): The table being read.
+            build (callable): Returns the query or statement for a list of objects.
+            objects (list): The objects to look up.
+            parent_of (callable): Returns the parent id of an object.
+
+        Returns:
+            list(tuples): The rows found for every object.
+        """
+        if not objects:
+            return []
+        # A lookup that failed outside a Transaction was logged and finds
+        # nothing, which is safe as the inserts skip the rows that exist.
+        if self.executor is None:
+            return execute_read_query(self.connection, build(objects)) or []
+
+        changed = [obj for obj in objects if (table, parent_of(obj)) in self._changed]
+        committed = [
+            obj for obj in objects if (table, parent_of(obj)) not in self._changed
+        ]
+
+        rows = []
+        if changed:
+            rows.extend(execute_read_query(self.connection, build(changed)) or [])
+        if committed:
+            queries = [build(chunk) for chunk in _chunks(committed, self.executor.size)]
+            for result in execute_read_queries(self.connection, queries, self.executor):
+                rows.extend(result or [])
+
+        return rows
+
+    def _resolve(self, model, objects):
+        """Populate the id and position of objects, creating missing ones.
+
+        Objects sharing the same parent and name are treated as one Planka
+        object, matching what repeated single lookups would return.
+
+        Args:
+            model (type): The Model subclass of the objects.
+            objects (list[Model]): The objects to be resolved.
+
+        Returns:
+            set: The ids of the objects that were created.
+        """
+        unique = dict()
+        for obj in objects:
+            unique.setdefault(obj.key(), obj)
+
+        if not unique:
+            return set()
+
+        # Look up every existing object of the level at once.
+        known = self.ids.get(model, dict())
+        found = {key: known[key] for key in unique if key in known}
+        lookup = [obj for key, obj in unique.items() if key not in found]
+        if model in self.complete:
+            lookup = []
+        parent = model._parent_keys[-1]
+        for row in self._read(
+            model.__name__.lower(),
+            lambda objs: statements.select_many(model, objs),
+            lookup,
+            lambda obj: getattr(obj, parent),
+        ):
+            found.setdefault(tuple(row[2:]), tuple(row[:2]))
+
+        created = set()
+        new = [obj for key, obj in unique.items() if key not in found]
+        if new:
+            logging.info(f"Adding {len(new)} {model.__name__}s.")
+
+            # Place new objects after the last object of their own parent.
+            self.positions.load(model, [getattr(obj, parent) for obj in new])
+            for obj in new:
+                obj.position = self.positions.next(model, getattr(obj, parent))
+
+            # Insert the new objects and collect their ids. Without ids the
+            # objects under them cannot be added, so a failed insert ends
+            # the import even outside a Transaction.
+            inserted = execute_query(
+                self.connection, statements.insert_many(model, new)
+            )
+            if inserted is None:
+                raise ValueError(f"Adding {len(new)} {model.__name__}s failed.")
+            for row in inserted:
+                key = tuple(row[1:])
+                found[key] = (row[0], unique[key].position)
+                created.add(row[0])
+            self._set_changed(
+                model.__name__.lower(), (getattr(obj, parent) for obj in new)
+            )
+
+            # Objects added since they were looked up, or missing from a
+            # stale cache, are skipped by the insert and read back instead.
+            missing = [obj for obj in new if obj.key() not in found]
+            if missing:
+                logging.info(f"Reading {len(missing)} {model.__name__}s added since.")
+                rows = execute_read_query(
+                    self.connection, statements.select_many(model, missing)
+                )
+                for row in rows or []:
+                    found.setdefault(tuple(row[2:]), tuple(row[:2]))
+
+        for obj in objects:
+            (obj.id, obj.position) = found[obj.key()]
+
+        if self.journal is not None:
+            self.journal.record(model, found)
+
+        if model in self.ids:
+            self.ids[model].update(found)
+
+        return created
@@ -0,0 +1,133 @@
+"""Export a project from Planka with a single streamed query."""
+
+# Standard Python Libraries
+from itertools import groupby
+import json
+import logging
+
+# Project Libraries
+from models.models import Board, Card, List
+
+ITERSIZE = 10000
+
+PULL_PROJECT = """
+    SELECT
+        b.id, b.name, b.position,
+        l.id, l.name, l.position,
+        c.id, c.name, c.position,
+        t.name
+    FROM board b
+    LEFT JOIN list l ON l.board_id = b.id
+    LEFT JOIN card c ON c.list_id = l.id
+    LEFT JOIN task t ON t.card_id = c.id
+    WHERE b.project_id = %s
+    ORDER BY b.position, b.id, l.position, l.id, c.position, c.id, t.id
+"""
+
+
+def iter_rows(connection, project_id, itersize=ITERSIZE):
+    """Yield the joined rows of a project from a server side cursor.
+
+    Rows are fetched itersize at a time, so the whole project is read with
+    one query without ever being held in memory.
+
+    Args:
+        connection (Psycopg2 Connection): The connection to the postgres database.
+        project_id (int): The id of the project to export.
+        itersize (int, optional): Rows fetched per round trip. Defaults to ITERSIZE.
+
+    Yields:
+        tuple: One row per task, or per card, list, or board without children.
+    """
+    logging.debug(f"Executing Streamed Query: {PULL_PROJECT} ({project_id})")
+    cursor = connection.cursor(name="planka_pull_project")
+    cursor.itersize = itersize
+    try:
+        # A named cursor cannot run a prepared statement, so the id is bound
+        # by psycopg2 instead.
+        cursor.execute(PULL_PROJECT, (project_id,))
+        yield from cursor
+    finally:
+        cursor.close()
+
+
+def _group(rows, start):
+    """Group consecutive rows by the id, name, and position at start."""
+    end = start + 3
+    return groupby(rows, key=lambda row: row[start:end])
+
+
+def build_boards(rows):
+    """Yield a Board for each board in the joined rows of a project.
+
+    Only one board is built at a time.
+
+    Args:
+        rows (iterable): The rows returned by iter_rows.
+
+    Yields:
+        Board: A fully populated Board object.
+    """
+    for (board_id, board_name, board_position), board_rows in _group(rows, 0):
+        board = Board(id=board_id, name=board_name, position=board_position)
+        board.lists = []
+        for (list_id, list_name, list_position), list_rows in _group(board_rows, 3):
+            if list_id is None:
+                continue
+            _list = List(
+                id=list_id, name=list_name, position=list_position, board_id=board_id
+            )
+            _list.cards = []
+            for (card_id, card_name, card_position), card_rows in _group(list_rows, 6):
+                if card_id is None:
+                    continue
+                _list.cards.append(
+                    Card(
+                        id=card_id,
+                        name=card_name,
+                        position=card_position,
+                        board_id=board_id,
+                        list_id=list_id,
+                        tasks=[row[9] for row in card_rows if row[9] is not None],
+                    )
+                )
+            board.lists.append(_list)
+        yield board
+
+
+def write_project(rows, fp, project):
+    """Write the joined rows of a project as an import JSON file.
+
+    The JSON is written as the rows arrive, so memory use does not depend on
+    the size of the project.
+
+    Args:
+        rows (iterable): The rows returned by iter_rows.
+        fp (file): The open file to write to.
+        project (Project): The project being exported.
+    """
+
+    def node(_id, name, position, children):
+        return (
+            f'{{"id": {json.dumps(_id)}, "name": {json.dumps(name)}, '
+            f'"position": {json.dumps(position)}, "{children}": ['
+        )
+
+    fp.write(f'{{"name": {json.dumps(project.name)}, "boards": [')
+    for board_index, (board, board_rows) in enumerate(_group(rows, 0)):
+        fp.write(("," if board_index else "") + "\n" + node(*board, "lists"))
+        lists = (group for group in _group(board_rows, 3) if group[0][0] is not None)
+        for list_index, (_list, list_rows) in enumerate(lists):
+            fp.write(("," if list_index else "") + node(*_list, "cards"))
+            cards = (group for group in _group(list_rows, 6) if group[0][0] is not None)
+            for card_index, (card, card_rows) in enumerate(cards):
+                fp.write(("," if card_index else "") + node(*card, "tasks"))
+                fp.write(
+                    ", ".join(
+                        json.dumps(row[9]) for row in card_rows if row[9] is not None
+                    )
+                )
+                fp.write("]}")
+            fp.write("]}")
+        fp.write("]}")
+    fp.write("\n]}\n")
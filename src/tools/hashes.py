@@ -0,0 +1,251 @@
+"""Skip the subtrees of an import file that are unchanged since it was imported."""
+
+# Standard Python Libraries
+from collections import Counter
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+
+# Project Libraries
+from . import statements, stats
+from .db import execute_read_query
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS fingerprint (
+        database TEXT, project_id INTEGER, value TEXT,
+        PRIMARY KEY (database, project_id)
+    );
+    CREATE TABLE IF NOT EXISTS subtree (
+        database TEXT, project_id INTEGER, path TEXT, hash TEXT,
+        PRIMARY KEY (database, project_id, path)
+    );
+"""
+
+
+def _digest(text, children=()):
+    """Return the hash of text followed by the hashes of children."""
+    digest = hashlib.blake2b(text.encode(), digest_size=16)
+    for child in children:
+        digest.update(child.encode())
+    return digest.hexdigest()
+
+
+class HashStore(object):
+    """A SQLite file of the content hash of every board, list, and card imported.
+
+    The hash of a card covers its name and tasks, the hash of a list its name
+    and the hashes of its cards, and the hash of a board its name and the
+    hashes of its lists, which is everything an import acts on. A subtree
+    is found again by its path of names, numbered when a name repeats under
+    the same parent.
+
+    Subtrees whose hash matches the last import are removed before the
+    import runs, so unchanged boards, lists, and cards cost no queries. The
+    hashes are only used while a fingerprint of the project's tables is
+    unchanged, so objects removed or renamed in Planka are imported again.
+
+    One store can be shared by threads importing different projects, as
+    only one of them uses the file at a time.
+    """
+
+    def __init__(self, path, database):
+        """Open or create a hash file.
+
+        Args:
+            path (string): The path of the SQLite file.
+            database (string): Identifies the Planka database the hashes belong to.
+        """
+        self.database = database
+        self.sqlite = sqlite3.connect(path, check_same_thread=False)
+        self.sqlite.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def open(self, connection, project_id):
+        """Read the hashes of a project, if the project is unchanged since.
+
+        Args:
+            connection (Transaction or Psycopg2 Connection): The connection the import runs on.
+            project_id (int): The id of the project being imported into.
+
+        Returns:
+            ProjectHashes: The hashes of the project, for one import.
+        """
+        hashes = ProjectHashes(self, project_id)
+        current = hashes.fingerprint(connection)
+        with self._lock:
+            row = self.sqlite.execute(
+                "SELECT value FROM fingerprint WHERE database=? AND project_id=?",
+                (self.database, project_id),
+            ).fetchone()
+            if row is not None and row[0] == current:
+                for path, digest in self.sqlite.execute(
+                    "SELECT path, hash FROM subtree WHERE database=? AND project_id=?",
+                    (self.database, project_id),
+                ):
+                    hashes.stored[tuple(json.loads(path))] = digest
+                logging.info(f"Read {len(hashes.stored)} subtree hashes.")
+            elif row is not None:
+                logging.info(
+                    "The project changed since it was imported, checking it all."
+                )
+                self.sqlite.execute(
+                    "DELETE FROM subtree WHERE database=? AND project_id=?",
+                    (self.database, project_id),
+                )
+                self.sqlite.commit()
+        hashes._current = current
+
+        on_commit = getattr(connection, "on_commit", None)
+        if on_commit is not None:
+            on_commit.append(hashes.flush)
+        else:
+            hashes._immediate = True
+        return hashes
+
+    def save(self, project_id, subtrees, fingerprint):
+        """Write the hashes of subtrees and the fingerprint of a project.
+
+        Args:
+            project_id (int): The id of the project.
+            subtrees (dict): The hash of each path imported.
+            fingerprint (string): The fingerprint of the project, None to keep the stored one.
+        """
+        with self._lock:
+            if subtrees:
+                self.sqlite.executemany(
+                    "INSERT OR REPLACE INTO subtree VALUES (?, ?, ?, ?)",
+                    [
+                        (self.database, project_id, json.dumps(path), digest)
+                        for path, digest in subtrees.items()
+                    ],
+                )
+            if fingerprint is not None:
+                self.sqlite.execute(
+                    "INSERT OR REPLACE INTO fingerprint VALUES (?, ?, ?)",
+                    (self.database, project_id, fingerprint),
+                )
+            self.sqlite.commit()
+
+    def close(self):
+        """Close the hash file."""
+        with self._lock:
+            self.sqlite.close()
+
+
+class ProjectHashes(object):
+    """The hashes of one project while it is imported."""
+
+    def __init__(self, store, project_id):
+        """Create the hashes of a project kept in a store.
+
+        Args:
+            store (HashStore): The file the hashes are read from and saved to.
+            project_id (int): The id of the project being imported into.
+        """
+        self.store = store
+        self.project_id = project_id
+        self.stored = dict()
+        self._seen = Counter()
+        self._pending = dict()
+        self._fingerprint = None
+        self._current = None
+        self._changed = False
+        self._immediate = False
+
+    def fingerprint(self, connection):
+        """Return the fingerprint of the project's tables as text."""
+        with stats.phase("hashes"):
+            rows = execute_read_query(
+                connection, statements.HASH_FINGERPRINT(self.project_id)
+            )
+        return json.dumps(list(rows[0]))
+
+    def _path(self, parent, name):
+        """Return the path of the next object named name under a parent."""
+        key = parent + (name,)
+        index = self._seen[key]
+        self._seen[key] += 1
+        return key + (index,)
+
+    def prune(self, boards, whole=True):
+        """Remove the subtrees that are unchanged since the last import.
+
+        Args:
+            boards (list[Board]): The boards about to be imported.
+            whole (bool, optional): Set to False when boards only hold some of their lists, such as with --stream list. Defaults to True.
+
+        Returns:
+            tuple(list[Board], dict): The boards that changed, holding only the
+                lists and cards that changed, and the hashes to be saved once
+                they are imported.
+        """
+        hashes = dict()
+        changed = []
+        for board in boards:
+            board_path = self._path((), board.name) if whole else (board.name, 0)
+            list_hashes = []
+            lists = []
+            for _list in board.lists:
+                list_path = self._path(board_path, _list.name)
+                card_hashes = []
+                cards = []
+                for card in _list.cards:
+                    card_path = self._path(list_path, card.name)
+                    digest = _digest(json.dumps([card.name, card.tasks]))
+                    card_hashes.append(digest)
+                    hashes[card_path] = digest
+                    if self.stored.get(card_path) != digest:
+                        cards.append(card)
+
+                digest = _digest(json.dumps(_list.name), card_hashes)
+                list_hashes.append(digest)
+                hashes[list_path] = digest
+                if self.stored.get(list_path) != digest:
+                    _list.cards = cards
+                    lists.append(_list)
+
+            if whole:
+                digest = _digest(json.dumps(board.name), list_hashes)
+                hashes[board_path] = digest
+                if self.stored.get(board_path) == digest:
+                    continue
+            elif board.lists and not lists:
+                continue
+            board.lists = lists
+            changed.append(board)
+            self._changed = True
+
+        skipped = len(hashes) - sum(
+            whole + sum(1 + len(_list.cards) for _list in board.lists)
+            for board in changed
+        )
+        if skipped:
+            logging.info(f"Skipping {skipped} unchanged boards, lists, and cards.")
+        return (changed, hashes)
+
+    def update(self, hashes):
+        """Save the hashes of imported subtrees once their statements commit."""
+        self._pending.update(hashes)
+        if self._immediate:
+            self.flush()
+
+    def finish(self, connection):
+        """Save the fingerprint the import leaves the project with.
+
+        An import that found nothing changed leaves the fingerprint it
+        started with, which is saved without reading it again.
+        """
+        if self._changed:
+            self._fingerprint = self.fingerprint(connection)
+        else:
+            self._fingerprint = self._current
+        if self._immediate:
+            self.flush()
+
+    def flush(self):
+        """Write the pending hashes, once the statements they follow commit."""
+        self.store.save(self.project_id, self._pending, self._fingerprint)
+        self._pending = dict()
+        self._fingerprint = None
@@ -0,0 +1,281 @@
+"""Check that the importer's lookups are served by indexes."""
+
+# Standard Python Libraries
+import logging
+import re
+
+# Project Libraries
+from models.models import Board, Card, List
+
+from . import statements
+from .db import execute_read_query
+
+# The columns of an index, from the definition pg_indexes holds.
+_COLUMNS = re.compile(r"USING \w+ \((.*?)\)(?: INCLUDE| WHERE|$)")
+
+# Rows of a table whose parent ids and names are used to explain a lookup.
+SAMPLE_SIZE = 100
+
+
+class Lookup(object):
+    """A query the importer runs on every import and the index it needs.
+
+    The index needs columns in that order: the parent id first, which every
+    lookup filters on, then the name or position it matches or aggregates.
+    """
+
+    def __init__(self, name, table, columns, build):
+        """Create a new lookup.
+
+        Args:
+            name (string): The name of the lookup in reports.
+            table (string): The table the lookup reads.
+            columns (tuple[string]): The columns of the index serving the lookup.
+            build (callable): Returns the statement for a list of parent ids and names.
+        """
+        self.name = name
+        self.table = table
+        self.columns = tuple(columns)
+        self.build = build
+
+    @property
+    def index_name(self):
+        """Return the name of the index created for the lookup."""
+        return f"planka_import_{self.table}_{'_'.join(self.columns)}_index"
+
+    def coverage(self, indexes):
+        """Return the index serving the lookup best and how well it does.
+
+        Args:
+            indexes (list(tuple(string, string, tuple))): The table, name, and columns of every index.
+
+        Returns:
+            tuple(string, string): The index name, or None, and "full", "parent", or "none".
+        """
+        best = (None, "none")
+        for table, name, columns in indexes:
+            if table != self.table:
+                continue
+            if columns[: len(self.columns)] == self.columns:
+                return (name, "full")
+            if columns[0] == self.columns[0]:
+                best = (name, "parent")
+        return best
+
+    def sample(self, connection):
+        """Return the statement of the lookup for recent rows of its table."""
+        rows = execute_read_query(
+            connection,
+            statements.SAMPLE_ROWS[(self.table, self.columns[0])](SAMPLE_SIZE),
+        )
+        if not rows:
+            rows = [(0, "")]
+        return self.build(
+            list(dict.fromkeys(row[0] for row in rows)),
+            list(dict.fromkeys(row[1] for row in rows)),
+        )
+
+
+LOOKUPS = [
+    Lookup(
+        "boards by name",
+        "board",
+        ("project_id", "name"),
+        lambda ids, names: statements.SELECT_MANY[Board](ids, names),
+    ),
+    Lookup(
+        "lists by name",
+        "list",
+        ("board_id", "name"),
+        lambda ids, names: statements.SELECT_MANY[List](ids, names),
+    ),
+    Lookup(
+        "cards by name",
+        "card",
+        ("list_id", "name"),
+        lambda ids, names: statements.SELECT_MANY[Card](ids, names),
+    ),
+    Lookup(
+        "tasks by name",
+        "task",
+        ("card_id", "name"),
+        lambda ids, names: statements.insert_tasks(zip(ids, names)),
+    ),
+    Lookup(
+        "board positions",
+        "board",
+        ("project_id", "position"),
+        lambda ids, names: statements.max_positions(Board, ids),
+    ),
+    Lookup(
+        "list positions",
+        "list",
+        ("board_id", "position"),
+        lambda ids, names: statements.max_positions(List, ids),
+    ),
+    Lookup(
+        "card positions",
+        "card",
+        ("list_id", "position"),
+        lambda ids, names: statements.max_positions(Card, ids),
+    ),
+]
+
+
+def read_indexes(connection, tables):
+    """Return the table, name, and columns of the indexes on tables.
+
+    Args:
+        connection (Psycopg2 Connection): The connection to the postgres database.
+        tables (list(string)): The tables whose indexes are read.
+
+    Returns:
+        list(tuple(string, string, tuple)): The table, name, and columns of every index.
+    """
+    indexes = []
+    for table, name, definition in execute_read_query(
+        connection, statements.READ_INDEXES(sorted(set(tables)))
+    ):
+        match = _COLUMNS.search(definition)
+        if match:
+            columns = tuple(column.strip('" ') for column in match[1].split(","))
+            indexes.append((table, name, columns))
+    return indexes
+
+
+def table_rows(connection, tables):
+    """Return the number of rows Postgres estimates each table holds.
+
+    Args:
+        connection (Psycopg2 Connection): The connection to the postgres database.
+        tables (list(string)): The tables whose rows are counted.
+
+    Returns:
+        dict: The estimated rows of each table, -1 for a table never analyzed.
+    """
+    return dict(
+        execute_read_query(connection, statements.TABLE_ROWS(sorted(set(tables))))
+    )
+
+
+def explain(connection, query):
+    """Return the plan of a statement as Postgres would run it, without running it.
+
+    Args:
+        connection (Psycopg2 Connection): The connection to the postgres database.
+        query (BoundStatement): The statement to be explained.
+
+    Returns:
+        dict: The top node of the plan.
+    """
+    cursor = connection.cursor()
+    if not query.is_prepared(connection):
+        cursor.execute(query.statement.prepare())
+        query.set_prepared(connection)
+    cursor.execute(
+        f"EXPLAIN (FORMAT JSON) {query.statement.execute()}", query.params or None
+    )
+    return cursor.fetchone()[0][0]["Plan"]
+
+
+def scans(plan, table):
+    """Return the scan of every node of a plan reading a table.
+
+    Args:
+        plan (dict): A node of a plan.
+        table (string): The table whose scans are returned.
+
+    Returns:
+        list(string): "seq scan", or the name of the index scanned, for each scan.
+    """
+    found = []
+    if plan.get("Relation Name") == table and plan["Node Type"] == "Seq Scan":
+        found.append("seq scan")
+    elif plan.get("Index Name") and plan.get("Relation Name", table) == table:
+        found.append(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        found.extend(scans(child, table))
+    return found
+
+
+def check(connection, lookups=LOOKUPS):
+    """Check every lookup against the indexes of its table and its plan.
+
+    Args:
+        connection (Psycopg2 Connection): The connection to the postgres database.
+        lookups (list[Lookup], optional): The lookups to be checked. Defaults to LOOKUPS.
+
+    Returns:
+        list(dict): The lookup, the rows of its table, its index and coverage, and the scans of its plan.
+    """
+    tables = [lookup.table for lookup in lookups]
+    indexes = read_indexes(connection, tables)
+    rows = table_rows(connection, tables)
+    results = []
+    for lookup in lookups:
+        (index, coverage) = lookup.coverage(indexes)
+        plan = explain(connection, lookup.sample(connection))
+        results.append(
+            {
+                "lookup": lookup,
+                "rows": rows.get(lookup.table, -1),
+                "index": index,
+                "coverage": coverage,
+                "scans": scans(plan, lookup.table),
+            }
+        )
+    return results
+
+
+def report(results, fp):
+    """Write a table of the results of a check to a file.
+
+    Sequential scans of small tables are expected, as reading the whole
+    table is cheaper than an index there.
+
+    Args:
+        results (list(dict)): The results of check.
+        fp (file): The file the table is written to.
+    """
+    fp.write(
+        f"{'lookup':<18}{'rows':>10}  {'columns':<22}{'index':<48}{'coverage':<10}plan\n"
+    )
+    for result in results:
+        lookup = result["lookup"]
+        rows = result["rows"] if result["rows"] >= 0 else "-"
+        fp.write(
+            f"{lookup.name:<18}{rows:>10}  {', '.join(lookup.columns):<22}"
+            f"{result['index'] or '-':<48}{result['coverage']:<10}"
+            f"{', '.join(result['scans']) or '-'}\n"
+        )
+    seq = [result["lookup"].name for result in results if "seq scan" in result["scans"]]
+    if seq:
+        fp.write(f"Sequential scans: {', '.join(seq)}.\n")
+
+
+def create_indexes(connection, results):
+    """Create an index for every lookup without one covering all its columns.
+
+    The indexes are created concurrently, so imports and Planka can keep
+    writing to the tables, which needs the connection in autocommit mode.
+
+    Args:
+        connection (Psycopg2 Connection): The connection to the postgres database, in autocommit mode.
+        results (list(dict)): The results of check.
+
+    Returns:
+        list(string): The names of the indexes created.
+    """
+    created = []
+    cursor = connection.cursor()
+    for result in results:
+        lookup = result["lookup"]
+        if result["coverage"] == "full":
+            continue
+        logging.info(f"Creating {lookup.index_name} for {lookup.name}.")
+        cursor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {lookup.index_name} "
+            f"ON {lookup.table} ({', '.join(lookup.columns)})"
+        )
+        created.append(lookup.index_name)
+    return created
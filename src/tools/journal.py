@@ -0,0 +1,167 @@
+"""Record the progress of an import so a failed import can be resumed."""
+
+# Standard Python Libraries
+import json
+import logging
+import os
+import threading
+
+# Project Libraries
+from models.models import Board, Card, List
+
+MODELS = {"board": Board, "list": List, "card": Card}
+
+
+class Journal(object):
+    """A file of the progress of an import, written as it is committed.
+
+    The journal is a JSON line per record: the project and file being
+    imported, the id and position of every board, list, and card resolved,
+    the lists whose cards and tasks are complete, and the parts of the file
+    that are complete. A part is a board or list with --stream, otherwise
+    the whole file.
+
+    Records are held until the transaction they were made in commits, so
+    the journal never holds ids that were rolled back. Connections that are
+    not a Transaction commit every statement, so their records are written
+    straight away.
+
+    A resumed import skips the parts that are complete without reading the
+    database, and resolves the boards, lists, and cards of the next part
+    from the journal instead of looking them up.
+    """
+
+    def __init__(self, path, resume=False):
+        """Create a new journal.
+
+        Args:
+            path (string): The path of the journal file.
+            resume (bool, optional): Set to True to resume the import recorded in the file. Defaults to False.
+        """
+        self.path = path
+        self.resume = resume
+        self.ids = {model: dict() for model in MODELS.values()}
+        self.done = set()
+        self.parts = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._immediate = False
+        self._fp = None
+
+    def open(self, connection, project_id, file_name):
+        """Open the journal of an import of a file into a project.
+
+        When resuming, the records of the same import are read back. A journal
+        of another project or file is started over.
+
+        Args:
+            connection (Transaction or Psycopg2 Connection): The connection the import runs on.
+            project_id (int): The id of the project being imported into.
+            file_name (string): The JSON file being imported.
+        """
+        header = {"project": project_id, "file": os.path.abspath(file_name)}
+        if self.resume and os.path.exists(self.path):
+            with open(self.path, "r") as fp:
+                records = [json.loads(line) for line in fp if line.endswith("\n")]
+            if records and records[0] == header:
+                for record in records[1:]:
+                    self._load(record)
+                self._fp = open(self.path, "a")
+                logging.info(
+                    f"Resuming after {self.parts} parts and "
+                    f"{sum(len(ids) for ids in self.ids.values())} journaled ids."
+                )
+            else:
+                logging.warning(f"{self.path} is not a journal of this import.")
+
+        if self._fp is None:
+            self._fp = open(self.path, "w")
+            self._write([header])
+
+        on_commit = getattr(connection, "on_commit", None)
+        if on_commit is not None:
+            on_commit.append(self.flush)
+        else:
+            self._immediate = True
+
+    def _load(self, record):
+        """Apply a record read back from the journal."""
+        if "part" in record:
+            self.parts = record["part"]
+            # List ids are only used to skip lists of the unfinished part.
+            self.done.clear()
+        elif "list" in record:
+            self.done.add(record["list"])
+        else:
+            self.ids[MODELS[record["model"]]][tuple(record["key"])] = (
+                record["id"],
+                record["position"],
+            )
+
+    def seed(self, importer):
+        """Give an importer the journaled ids and have it record its progress.
+
+        Args:
+            importer (BatchImporter): The importer to seed.
+        """
+        for model, ids in self.ids.items():
+            importer.ids.setdefault(model, dict()).update(ids)
+        importer.journal = self
+
+    def record(self, model, found):
+        """Record the ids and positions of resolved objects of a model.
+
+        Args:
+            model (type): The Model subclass of the objects.
+            found (dict): The (id, position) of the objects, keyed by their key.
+        """
+        ids = self.ids[model]
+        kind = model.__name__.lower()
+        with self._lock:
+            for key, (_id, position) in found.items():
+                if ids.get(key) != (_id, position):
+                    ids[key] = (_id, position)
+                    self._pending.append(
+                        {"model": kind, "key": key, "id": _id, "position": position}
+                    )
+        self._written()
+
+    def finish(self, lists):
+        """Record lists whose cards and tasks are complete."""
+        with self._lock:
+            for _list in lists:
+                if _list.id not in self.done:
+                    self.done.add(_list.id)
+                    self._pending.append({"list": _list.id})
+        self._written()
+
+    def finish_part(self):
+        """Record that the next part of the file is complete."""
+        with self._lock:
+            self.parts += 1
+            self.done.clear()
+            self._pending.append({"part": self.parts})
+        self._written()
+
+    def _written(self):
+        """Write the pending records if statements are committed as they run."""
+        if self._immediate:
+            self.flush()
+
+    def flush(self):
+        """Write the pending records, once the statements they follow commit."""
+        with self._lock:
+            if self._pending:
+                self._write(self._pending)
+                self._pending = []
+
+    def _write(self, records):
+        """Append records to the file and make sure they reach the disk."""
+        self._fp.write("".join(json.dumps(record) + "\n" for record in records))
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+
+    def close(self):
+        """Close the journal file."""
+        if self._fp is not None:
+            self._fp.close()
@@ -0,0 +1,68 @@
+"""Parse import files with the fastest JSON library installed."""
+
+# Standard Python Libraries
+import json
+import logging
+import mmap
+import os
+
+try:
+    # Third-Party Libraries
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Third-Party Libraries
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    # Third-Party Libraries
+    import ujson
+except ImportError:
+    ujson = None
+
+# The parsers installed, each with its loads function and whether that reads
+# a memoryview of the file as it is rather than a copy of it as bytes.
+PARSERS = dict()
+if orjson is not None:
+    PARSERS["orjson"] = (orjson.loads, True)
+if simdjson is not None:
+    PARSERS["simdjson"] = (simdjson.loads, False)
+if ujson is not None:
+    PARSERS["ujson"] = (ujson.loads, False)
+PARSERS["json"] = (json.loads, False)
+
+# The parsers from fastest to slowest, the first installed being used.
+PREFERENCE = ("orjson", "simdjson", "ujson", "json")
+DEFAULT = next(name for name in PREFERENCE if name in PARSERS)
+
+
+def load(file_name, parser=None):
+    """Parse a JSON file, mapped into memory as bytes.
+
+    The file is never decoded to text first. orjson parses the mapped file
+    in place, while the other parsers are given a copy of it as bytes.
+
+    Args:
+        file_name (string): The JSON file.
+        parser (string, optional): The name of an installed parser. Defaults to the fastest installed.
+
+    Returns:
+        The value of the JSON document.
+    """
+    parser = parser or DEFAULT
+    (loads, views) = PARSERS[parser]
+    logging.debug(f"Parsing {file_name} with {parser}.")
+
+    with open(file_name, "rb") as fp:
+        # An empty file cannot be mapped, and is left to the parser to reject.
+        if os.fstat(fp.fileno()).st_size == 0:
+            return loads(b"")
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if views:
+                with memoryview(mapped) as view:
+                    return loads(view)
+            return loads(mapped[:])
@@ -0,0 +1,114 @@
+"""Import the lists of boards concurrently over a pool of connections."""
+
+# Standard Python Libraries
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import logging
+
+# Project Libraries
+from models.models import CardBatch
+
+from . import stats
+from .bulk import copy_cards
+from .db import Transaction
+from .engine import BatchImporter
+
+
+def partition_lists(lists, workers):
+    """Split lists into at most workers groups of about the same size.
+
+    Lists that resolved to the same Planka list are kept in one group so no
+    two workers ever add cards to the same list.
+
+    Args:
+        lists (list[List]): Lists with their ids populated.
+        workers (int): The number of groups to split the lists into.
+
+    Returns:
+        list[list[List]]: The groups of lists, largest first.
+    """
+    by_id = dict()
+    for _list in lists:
+        by_id.setdefault(_list.id, []).append(_list)
+
+    def size(group):
+        return sum(
+            1 + sum(1 + len(card.tasks) for card in _list.cards) for _list in group
+        )
+
+    heap = [(0, index, []) for index in range(min(workers, len(by_id)))]
+    for group in sorted(by_id.values(), key=size, reverse=True):
+        (total, index, chunk) = heapq.heappop(heap)
+        chunk.extend(group)
+        heapq.heappush(heap, (total + size(group), index, chunk))
+
+    return [chunk for (_, _, chunk) in sorted(heap, reverse=True) if chunk]
+
+
+class ParallelImporter(BatchImporter):
+    """Import the cards and tasks of different lists at the same time.
+
+    Boards and lists are resolved on the importer's own connection and
+    committed, then the lists are split between workers that each add the
+    cards and tasks of their lists on a connection from the pool, in a
+    transaction of their own. Positions stay correct because cards are only
+    positioned within their list and every list belongs to one worker.
+
+    The import is therefore committed in parts, and a worker that fails only
+    rolls back its own lists.
+    """
+
+    def __init__(
+        self, connection, pool, workers, bulk=False, executor=None, commit_every=0
+    ):
+        """Create a new importer with workers sharing a connection pool.
+
+        Each worker commits every commit_every statements, or once when it is 0.
+        """
+        super().__init__(connection, bulk, executor)
+        self.pool = pool
+        self.workers = workers
+        self.commit_every = commit_every
+
+    def run(self, project, boards):
+        """Import boards and everything under them into a project.
+
+        Args:
+            project (Project): The project the boards belong to, with its id set.
+            boards (list[Board]): The boards to be imported.
+
+        Returns:
+            list[Board]: The boards with the ids of every object populated.
+        """
+        for board in boards:
+            board.project_id = project.id
+
+        self.add_boards(boards)
+        lists = self.pending(self.add_lists(boards))
+
+        # The workers can only see boards and lists once they are committed.
+        getattr(self.connection, "flush", self.connection.commit)()
+
+        chunks = partition_lists(lists, self.workers)
+        logging.info(f"Adding cards of {len(lists)} Lists with {len(chunks)} workers.")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for future in [executor.submit(self._add_cards, chunk) for chunk in chunks]:
+                future.result()
+
+        return boards
+
+    def _add_cards(self, lists):
+        """Add the cards and tasks of lists on a connection from the pool."""
+        connection = self.pool.getconn()
+        try:
+            with Transaction(connection, self.commit_every) as transaction:
+                if self.bulk:
+                    with stats.phase("copy"):
+                        copy_cards(transaction, CardBatch.from_lists(lists))
+                else:
+                    importer = self.fork(transaction)
+                    importer.add_tasks(importer.add_cards(lists))
+            if self.journal is not None:
+                self.journal.finish(lists)
+        finally:
+            self.pool.putconn(connection)
@@ -0,0 +1,262 @@
+"""Plan an import offline against a snapshot of a project."""
+
+# Standard Python Libraries
+import logging
+
+# Project Libraries
+from models.models import POSITION_GAP
+
+from . import statements
+from .db import execute_read_query
+
+KINDS = ("board", "list", "card", "task")
+
+
+def _literal(value):
+    """Return a value as a SQL literal."""
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+def _values(rows):
+    """Return rows as the body of a SQL VALUES list."""
+    return ",\n        ".join(
+        "(" + ", ".join(_literal(value) for value in row) + ")" for row in rows
+    )
+
+
+class Snapshot(object):
+    """The boards, lists, cards, and tasks of a project, keyed by name path.
+
+    A board is keyed by (board name,), a list by (board name, list name), and
+    a card by (board name, list name, card name). When names repeat under a
+    parent, the oldest object is used, like the importer's lookups.
+    """
+
+    def __init__(self):
+        """Create a new empty snapshot."""
+        self.ids = dict()
+        self.positions = dict()
+        self.tasks = dict()
+
+    @classmethod
+    def load(cls, connection, project_id):
+        """Read a snapshot of a project with one query per table.
+
+        Args:
+            connection (Psycopg2 Connection): The connection to the postgres database.
+            project_id (int): The project id, or None for a project that does not exist.
+
+        Returns:
+            Snapshot: The snapshot of the project.
+        """
+        snapshot = cls()
+        if project_id is None:
+            return snapshot
+
+        boards = execute_read_query(connection, statements.SNAPSHOT["board"](project_id))
+        parents = snapshot._add(
+            {None: ()}, [(_id, None, name, pos) for (_id, name, pos) in boards]
+        )
+        for kind in ("list", "card"):
+            parents = snapshot._add(
+                parents,
+                execute_read_query(connection, statements.SNAPSHOT[kind](project_id)),
+            )
+
+        for card_id, name in execute_read_query(
+            connection, statements.SNAPSHOT["task"](project_id)
+        ):
+            if card_id in parents:
+                snapshot.tasks.setdefault(parents[card_id], set()).add(name)
+
+        logging.info(
+            f"Read a snapshot of {len(snapshot.ids)} boards, lists, and cards."
+        )
+        return snapshot
+
+    def _add(self, parents, rows):
+        """Add (id, parent id, name, position) rows under known parents.
+
+        Returns:
+            dict: The name path of each added object by id.
+        """
+        paths = dict()
+        for _id, parent_id, name, position in rows:
+            if parent_id not in parents:
+                continue
+            parent = parents[parent_id]
+            path = parent + (name,)
+            if path not in self.ids:
+                self.ids[path] = _id
+                paths[_id] = path
+            prior_position = self.positions.get(parent)
+            if prior_position is None or position > prior_position:
+                self.positions[parent] = position
+
+        return paths
+
+
+class Plan(object):
+    """The objects an import would create and skip, computed offline.
+
+    Creates hold the name path of each new object followed by its position,
+    or the name path of its card followed by the task name for tasks.
+    """
+
+    def __init__(self, project):
+        """Create a new empty plan for a project."""
+        self.project = project
+        self.creates = {kind: [] for kind in KINDS}
+        self.skips = {kind: [] for kind in KINDS}
+
+    @classmethod
+    def build(cls, project, snapshot):
+        """Diff a parsed project against a snapshot of the database.
+
+        Args:
+            project (Project): The project with the boards to be imported.
+            snapshot (Snapshot): The snapshot of the project in the database.
+
+        Returns:
+            Plan: The plan of the import.
+        """
+        plan = cls(project)
+        positions = dict(snapshot.positions)
+        seen = set()
+
+        def visit(kind, path):
+            if path in seen:
+                return
+            seen.add(path)
+            if path in snapshot.ids:
+                plan.skips[kind].append(path)
+                return
+            prior_position = positions.get(path[:-1])
+            position = 0 if prior_position is None else prior_position + POSITION_GAP
+            positions[path[:-1]] = position
+            plan.creates[kind].append(path + (position,))
+
+        for board in project.boards:
+            board_path = (board.name,)
+            visit("board", board_path)
+            for _list in board.lists:
+                list_path = board_path + (_list.name,)
+                visit("list", list_path)
+                for card in _list.cards:
+                    card_path = list_path + (card.name,)
+                    visit("card", card_path)
+                    existing = snapshot.tasks.get(card_path, set())
+                    for task in card.tasks:
+                        task_path = card_path + (task,)
+                        if task_path in seen:
+                            continue
+                        seen.add(task_path)
+                        if task in existing:
+                            plan.skips["task"].append(task_path)
+                        else:
+                            plan.creates["task"].append(task_path)
+
+        return plan
+
+    def report(self, fp):
+        """Write every create and skip of the plan followed by a summary.
+
+        Args:
+            fp (file): The file the plan is written to.
+        """
+        for kind in KINDS:
+            for path in self.creates[kind]:
+                names = path if kind == "task" else path[:-1]
+                fp.write(f"create {kind}: {' / '.join(map(str, names))}\n")
+            for path in self.skips[kind]:
+                fp.write(f"skip {kind}: {' / '.join(map(str, path))}\n")
+
+        for kind in KINDS:
+            fp.write(
+                f"{kind}s: {len(self.creates[kind])} to create, {len(self.skips[kind])} to skip\n"
+            )
+        fp.write(f"Applying this plan takes {len(self.statements())} statements.\n")
+
+    def statements(self):
+        """Return the SQL statements that apply the plan.
+
+        Each level is created with a single INSERT ... SELECT that finds the
+        ids of its parents by name, so no ids are needed ahead of time. The
+        project is the one the snapshot was read from, or the newest project
+        of its name once the plan has created it.
+        """
+        if self.project.id is not None:
+            project_id = str(int(self.project.id))
+        else:
+            project_id = f"(SELECT MAX(id) FROM project WHERE name={_literal(self.project.name)})"
+        boards = f"""(SELECT name, MIN(id) AS id FROM board WHERE project_id={project_id} GROUP BY name)"""
+        lists = f"""(SELECT b.name AS board_name, l.name, MIN(l.id) AS id FROM list l JOIN {boards} b ON b.id = l.board_id GROUP BY b.name, l.name)"""
+        cards = f"""(SELECT ll.board_name, ll.name AS list_name, c.name, MIN(c.id) AS id FROM card c JOIN {lists} ll ON ll.id = c.list_id GROUP BY ll.board_name, ll.name, c.name)"""
+
+        statements = []
+        if self.project.id is None:
+            statements.append(
+                f"""INSERT INTO project (name) VALUES ({_literal(self.project.name)})"""
+            )
+            statements.append(
+                f"""
+    INSERT INTO
+        project_membership (project_id, user_id)
+    SELECT {project_id}, id FROM user_account WHERE username='demo'"""
+            )
+
+        if self.creates["board"]:
+            statements.append(
+                f"""
+    INSERT INTO
+        board (project_id, type, name, position)
+    SELECT {project_id}, 'kanban', v.name, v.position
+    FROM (VALUES
+        {_values(self.creates["board"])}
+    ) AS v (name, position)"""
+            )
+        if self.creates["list"]:
+            statements.append(
+                f"""
+    INSERT INTO
+        list (board_id, name, position)
+    SELECT b.id, v.name, v.position
+    FROM (VALUES
+        {_values(self.creates["list"])}
+    ) AS v (board_name, name, position)
+    JOIN {boards} b ON b.name = v.board_name"""
+            )
+        if self.creates["card"]:
+            statements.append(
+                f"""
+    INSERT INTO
+        card (board_id, list_id, name, position)
+    SELECT l.board_id, l.id, v.name, v.position
+    FROM (VALUES
+        {_values(self.creates["card"])}
+    ) AS v (board_name, list_name, name, position)
+    JOIN {lists} ll ON ll.board_name = v.board_name AND ll.name = v.list_name
+    JOIN list l ON l.id = ll.id"""
+            )
+        if self.creates["task"]:
+            statements.append(
+                f"""
+    INSERT INTO
+        task (card_id, name, is_completed)
+    SELECT c.id, v.name, false
+    FROM (VALUES
+        {_values(self.creates["task"])}
+    ) AS v (board_name, list_name, card_name, name)
+    JOIN {cards} c ON c.board_name = v.board_name AND c.list_name = v.list_name AND c.name = v.card_name"""
+            )
+
+        return statements
+
+    def write_sql(self, fp):
+        """Write the plan as a SQL script that applies it in one transaction."""
+        fp.write("BEGIN;\n")
+        for statement in self.statements():
+            fp.write(f"{statement.rstrip()};\n\n")
+        fp.write("COMMIT;\n")
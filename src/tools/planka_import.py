@@ -2,20 +2,38 @@
 
 # Standard Python Libraries
 import argparse
-import itertools
+import gc
 import json
 import logging
+import sys
 
 # Third-Party Libraries
-import psycopg2
 from psycopg2 import OperationalError
 
 # Project Libraries
 from ._version import __version__
+from . import indexes, statements, stats
+from .aio import AsyncExecutor
+from .cache import IdCache
+from .convert import CONVERTERS
+from .db import (
+    ERRORS,
+    Transaction,
+    create_connection,
+    create_pool,
+    execute_query,
+    execute_read_query,
+)
+from .engine import BatchImporter
+from .export import build_boards, iter_rows, write_project
+from .hashes import HashStore
+from .journal import Journal
+from .jsonio import load
+from .parallel import ParallelImporter
+from .plan import Plan, Snapshot
+from .stream import iter_boards
 from models.models import Project
 
-POSITION_GAP = 65535
-
 
 def generate_template():
     """Output template for a json file to be imported to Planka."""
@@ -45,341 +63,207 @@ def generate_template():
         logging.info("Template Saves to planka_template.json")
 
 
-def create_connection(db_name, db_user, db_password, db_host, db_port):
-    """Create connection to postgres database.
-
-    Args:
-        db_name (string): Database Name
-        db_user (string): Database Username
-        db_password (string): Database password
-        db_host (string): Database Hostname
-        db_port (string): Database Port Number
-
-    Raises:
-        e: Connection errors.
-
-    Returns:
-        Psycopg2 Connection: A connection to the postgres database.
-    """
-
-    logging.debug("Connecting to postgres")
-    connection = None
-    try:
-        connection = psycopg2.connect(
-            database=db_name,
-            user=db_user,
-            password=db_password,
-            host=db_host,
-            port=db_port,
-        )
-        logging.info("Connection to PostgreSQL DB successful")
-    except OperationalError as e:
-        raise e
-
-    return connection
-
+def pull_project(connection, project):
+    """Pull a project from Planka
 
-def execute_read_query(connection, query):
-    """Execute a read query on the postgres database.
+    The boards, lists, cards, and tasks are read with a single query.
 
     Args:
         connection (Psycopg2 Connection): The connection to the postgres database.
-        query (string): The SQL query to be run.
+        project (Project): A Project object representing a Planka database.
 
     Returns:
-        list(tuples): The results of the SQL query.
+        Project: The project with its boards populated.
     """
+    project.boards = list(build_boards(iter_rows(connection, project.id)))
+    return project
 
-    logging.debug(f"Executing Read Query: {query}")
-    cursor = connection.cursor()
-    result = None
-    try:
-        cursor.execute(query)
-        result = cursor.fetchall()
-        logging.debug("Query was successful.")
-        return result
-    except OperationalError as e:
-        logging.error(f"The error '{e}' occurred")
 
-
-def execute_query(connection, query):
-    """Execute a query to change the database.
+def _read_parts(project, file_name, stream=None, file_format="json"):
+    """Yield the boards of a file in the parts they are imported in.
 
     Args:
-        connection (Psycopg2 Connection): The connection to the postgres database.
-        query (string): The SQL query to be run.
-    """
-
-    logging.debug(f"Executing Action: {query}")
-    cursor = connection.cursor()
-    try:
-        cursor.execute(query)
-        connection.commit()
-        logging.debug("Query executed successfully")
-    except OperationalError as e:
-        logging.error(f"The error '{e}' occurred")
-
-
-def pull_project(connection, project):
-    """Pull a project from Planka
+        project (Project): The project the boards belong to.
+        file_name (string): The file to load content from.
+        stream (string, optional): "board" or "list" to read the file one board or list at a time. Defaults to None.
+        file_format (string, optional): "json", "trello", or "csv", the format of the file. Defaults to "json".
 
-    Args:
-        connection (Psycopg2 Connection): The connection to the postgres database.
-        project (Project): A Project object representing a Planka database.
+    Yields:
+        list[Board]: The boards of each part.
     """
-    # TODO Build this out.
-    pass
-
-
-def add_board(connection, board):
-    """Add board to Planka.
-
-    A method to add a board to planka if it does not exists.
-    If it does exist then the board object with appropriate
-    info is returned.
+    if file_format == "json" and not stream:
+        # The whole file is parsed from a map of it, so it is not opened here.
+        project.load_json(load(file_name))
+        yield project.boards
+        return
+
+    with open(file_name, "r", newline="" if file_format == "csv" else None) as fp:
+        if file_format != "json":
+            # Other formats are converted as they are read, a batch at a time.
+            yield from CONVERTERS[file_format](fp)
+        else:
+            # Each part is imported as soon as it is read and then released.
+            yield from ([board] for board in iter_boards(fp, project, stream))
+
+
+def _import_file(
+    connection,
+    project,
+    file_name,
+    *,
+    bulk=False,
+    stream=None,
+    pool=None,
+    commit_every=0,
+    executor=None,
+    cache=None,
+    journal=None,
+    hashes=None,
+    file_format="json",
+):
+    """Import the boards of a JSON file into a project.
 
     Args:
         connection (Psycopg2 Connection): The connection to the postgres database.
-        board (Board): A Board object representing a Planka board.
-
-    Returns:
-        Board: A fully populated Board object.
+        project (Project): The project object that the boards will be added under.
+        file_name (string): The file to load content from.
+        bulk (bool, optional): Set to True to load cards and tasks through COPY. Defaults to False.
+        stream (string, optional): "board" or "list" to read and import the file one board or list at a time. Defaults to None.
+        pool (ThreadedConnectionPool, optional): A pool whose connections import the cards of different lists at the same time. Defaults to None.
+        commit_every (int, optional): Statements per commit of each connection of the pool, 0 to commit each once. Defaults to 0.
+        executor (AsyncExecutor, optional): Runs lookups concurrently over asynchronous connections. Defaults to None.
+        cache (IdCache, optional): An on-disk cache of ids that replaces lookups of boards, lists, and cards. Defaults to None.
+        journal (Journal, optional): Records the progress of the import, committing each part of the file, and resumes it. Defaults to None.
+        hashes (HashStore, optional): Skips the boards, lists, and cards unchanged since the last import. Defaults to None.
+        file_format (string, optional): "json" for the import format, or "trello" or "csv" to convert the file as it is read. Defaults to "json".
+
+    Yields:
+        Board: Each board once it has been imported.
     """
-    # Get the board ID or crate new board if not found.
-    try:
-        (board.id, board.position, board.project_id) = execute_read_query(
-            connection, board.select_board()
-        )[0]
-    except IndexError:
-        logging.info(f"{board.name} not found. Adding board.")
-
-        # Find last board postion and adds postion gap to the value.
-        prior_position = execute_read_query(connection, board.max_position())[0][0]
-
-        if prior_position:
-            board.position = prior_position + POSITION_GAP
-        else:
-            board.position = 0
-
-        # Insert the new board.
-        execute_query(connection, board.insert())
-
-        # Get the new board's ID
-        board.id = execute_read_query(connection, board.select_id())[0][0]
-
-    return board
-
-
-def add_list(connection, _list):
-    """Add list to Planka.
+    logging.debug(f"Loading data structure from {file_name}")
 
-    A method to add a list to planka if it does not exists.
-    If it does exist then the list object with appropriate
-    info is returned.
+    if pool:
+        importer = ParallelImporter(
+            connection, pool, pool.maxconn, bulk, executor, commit_every
+        )
+    else:
+        importer = BatchImporter(connection, bulk, executor)
+    if cache:
+        with stats.phase("cache"):
+            cache.refresh(connection, project.id)
+            cache.seed(importer, project.id)
+
+    if journal:
+        journal.open(connection, project.id, file_name)
+        journal.seed(importer)
+    if hashes:
+        hashes = hashes.open(connection, project.id)
+
+    parts = _read_parts(project, file_name, stream, file_format)
+    for index, boards in enumerate(parts):
+        if journal and index < journal.parts:
+            continue
+        if hashes:
+            (boards, subtrees) = hashes.prune(
+                boards, file_format == "json" and stream != "list"
+            )
+        yield from importer.run(project, boards)
+        if hashes:
+            hashes.update(subtrees)
+        if journal:
+            # A resumed import starts after the last committed part.
+            journal.finish_part()
+            getattr(connection, "flush", connection.commit)()
+            journal.flush()
+
+    if journal and journal.parts:
+        logging.info(f"Journaled {journal.parts} parts of {file_name}.")
+    if hashes:
+        hashes.finish(connection)
+
+    # Only the rows added by the import are read into the cache.
+    if cache:
+        with stats.phase("cache"):
+            cache.refresh(connection, project.id)
+
+
+def load_cards(connection, project, file_name, **options):
+    """Load data into cards.
 
     Args:
         connection (Psycopg2 Connection): The connection to the postgres database.
-        list (List): A List object representing a Planka list.
-
-    Returns:
-        List: A fully populated List object.
+        project_id (string): The project that boards should be added to.
+        file_name (string): The file to load content from.
+        **options: The keyword-only options of _import_file.
     """
-    # Get the list ID or crate new list if not found.
-    try:
-        logging.debug(f"List Query: {_list.select_list()}")
-        (_list.id, _list.position, _list.board_id) = execute_read_query(
-            connection, _list.select_list()
-        )[0]
-    except IndexError:
-        logging.info(f"{_list.name} not found. Adding list.")
-
-        # Find last list postion and adds postion gap to the value.
-        prior_position = execute_read_query(connection, _list.max_position())[0][0]
-        if prior_position:
-            _list.position = prior_position + POSITION_GAP
-        else:
-            _list.position = 0
-
-        # Insert the new list.
-        execute_query(connection, _list.insert())
-
-        # Get the new list's ID
-        _list.id = execute_read_query(connection, _list.select_id())[0][0]
-
-    return _list
-
+    for board in _import_file(connection, project, file_name, **options):
+        logging.debug(f"{board.name} Board id: {board.id}")
 
-def add_card(connection, card):
-    """Add card to Planka.
 
-    A method to add a card to planka if it does not exists.
-    If it does exist then the card object with appropriate
-    info is returned.
+def find_project(connection, name):
+    """Return the project with a name, or None if there is no such project.
 
     Args:
         connection (Psycopg2 Connection): The connection to the postgres database.
-        card (Card): A Card object representing a Planka card.
+        name (string): The name of the project.
 
     Returns:
-        Card: A fully populated Card object.
+        Project: The project with its id set, or None.
     """
-    # Get the card ID or crate new card if not found.
-    try:
-        (card.id, card.position, card.board_id, card.list_id) = execute_read_query(
-            connection, card.select_card()
-        )[0]
-    except IndexError:
-        logging.info(f"{card.name} not found. Adding card.")
-
-        # Find last card postion and adds postion gap to the value.
-        prior_position = execute_read_query(connection, card.max_position())[0][0]
-        if prior_position:
-            card.position = prior_position + POSITION_GAP
-        else:
-            card.position = 0
-
-        # Insert the new board.
-        execute_query(connection, card.insert())
+    project = Project(name=name)
+    rows = execute_read_query(connection, statements.select_project_id(project))
+    if not rows:
+        return None
+    project.id = rows[0][0]
+    return project
 
-        # Get the new board's ID
-        card.id = execute_read_query(connection, card.select_id())[0][0]
 
-    return card
+def demo_user_id(connection):
+    """Return the id of the demo user, who is made a member of new projects."""
+    query = """SELECT id FROM user_account WHERE username='demo'"""
+    return execute_read_query(connection, query)[0][0]
 
 
-def add_task(connection, task, db_tasks, card_id):
-    """Add a task to Planka card
-
-    Checks if the task is in the system before adding it to the card.
-    If the task is found, a warning is printed and process continues.
+def create_project(connection, name, user_id=None):
+    """Create a project with the demo user as its member.
 
     Args:
         connection (Psycopg2 Connection): The connection to the postgres database.
-        task (string): The string indicating the task.
-        db_tasks (list[tuples]): A list of tuples that holds the tasks from the database is index 0.
-        card_id (int): The card id for which the task is associated with.
-    """
-
-    if task not in itertools.chain(*db_tasks):
-        logging.debug(f"Adding {task}.")
-        query = f"""
-            INSERT INTO
-                task (card_id, name, is_completed)
-            VALUES
-                ({card_id},'{task}', false)
-        """
-        execute_query(connection, query)
-    else:
-        logging.warning(f"{task} is already on card.")
-
+        name (string): The name of the new project.
+        user_id (int, optional): The id of the demo user, looked up when not given. Defaults to None.
 
-def load_cards(connection, project, file_name):
-    """Load data into cards.
-
-    Args:
-        connection (Psycopg2 Connection): The connection to the postgres database.
-        project_id (string): The project that boards should be added to.
+    Returns:
+        Project: The new project with its id set.
     """
-    logging.debug(f"Loading data structure from {file_name}")
-
-    # Load project from JSON.
-    with open(file_name, "r") as fp:
-        project.load_json(json.load(fp))
-
-    for board_index, board in enumerate(project.boards):
-        # Pull the board info from planka.
-        logging.info(f"Pulling {board.name} Board.")
-
-        board.project_id = project.id
-
-        board = add_board(connection, board)
+    project = Project(name=name)
+    logging.info(f"Createing {project.name}.")
+    execute_query(connection, statements.insert_project(project))
 
-        logging.debug(f"{board.name} Board id: {board.id}")
-
-        for list_index, _list in enumerate(board.lists):
-            # Pull the list info from planka.
-            logging.info(f"Pulling {_list.name} List.")
-
-            _list.board_id = board.id
-
-            _list = add_list(connection, _list)
-
-            logging.debug(f"{_list.name}List id: {_list.id}")
-
-            # TODO Check if cards exists.
-            for card_index, card in enumerate(_list.cards):
-                # Process the cards. ASSUMES NO CARDS IN LIST.
+    # Gets value from first item in list and tuple
+    project.id = execute_read_query(
+        connection, statements.select_project_id(project)
+    )[0][0]
 
-                card.board_id = board.id
-                card.list_id = _list.id
+    # Adds demo user to project
+    if user_id is None:
+        user_id = demo_user_id(connection)
 
-                card = add_card(connection, card)
-
-                logging.debug(f"Card id: {card.id}")
-
-                db_tasks = execute_read_query(connection, card.get_tasks())
-
-                for task in card.tasks:
-                    add_task(connection, task, db_tasks, card.id)
-
-                _list.cards[card_index] = card
-            board.lists[list_index] = _list
-        project.boards[board_index] = board
+    execute_query(
+        connection, statements.INSERT_PROJECT_MEMBERSHIP(project.id, user_id)
+    )
+    return project
 
 
-def build_new(connection, project, file_name):
+def build_new(connection, project, file_name, **options):
     """Build out the project boards
 
     Args:
         connection (Psycopg2 Connection): The connection to the postgres database.
         project (Project): The project object that the boards will be added under.
+        file_name (string): The file to load content from.
+        **options: The keyword-only options of _import_file.
     """
-
-    logging.debug(f"Loading data structure from {file_name}")
-
-    with open(file_name, "r") as fp:
-        project.load_json(json.load(fp))
-
-    for board_index, board in enumerate(project.boards):
-        # Pull the board info from planka.
-        logging.info(f"Checking for {board.name} Board.")
-
-        board.project_id = project.id
-
-        board = add_board(connection, board)
-
-        logging.debug(f"{board.name} Board id: {board.id}")
-
-        for list_index, _list in enumerate(board.lists):
-            # Pull the list info from planka.
-            logging.info(f"Checking for {_list.name} List.")
-
-            _list.board_id = board.id
-            logging.debug(f"Board id: {board.id}")
-
-            _list = add_list(connection, _list)
-
-            logging.debug(f"{_list.name} List id: {_list.id}")
-
-            # TODO Check if cards exists.
-            for card_index, card in enumerate(_list.cards):
-                # Process the cards. ASSUMES NO CARDS IN LIST.
-
-                card.board_id = board.id
-                card.list_id = _list.id
-
-                card = add_card(connection, card)
-
-                logging.debug(f"Card id: {card.id}")
-
-                db_tasks = execute_read_query(connection, card.get_tasks())
-
-                for task in card.tasks:
-                    add_task(connection, task, db_tasks, card.id)
-
-                _list.cards[card_index] = card
-            board.lists[list_index] = _list
-        project.boards[board_index] = board
+    for board in _import_file(connection, project, file_name, **options):
         logging.info(f"{board.name} Board Complete!")
 
 
@@ -392,12 +276,14 @@ def main():
     parser.add_argument(
         "PROJECT_NAME",
         action="store",
-        help="The project name.",
+        nargs="?",
+        help="The project name. Not needed with --check-indexes.",
     )
     parser.add_argument(
         "FILE_NAME",
         action="store",
-        help="The JSON file to load content from.",
+        nargs="?",
+        help="The JSON file to load content from, or to export to with --pull. Not needed with --check-indexes.",
     )
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument(
@@ -410,6 +296,19 @@ def main():
         dest="new",
         help="Set up a new Project from the the file planka_build.json",
     )
+    group.add_argument(
+        "-p",
+        "--plan",
+        action="store_true",
+        dest="plan",
+        help="Print the boards, lists, cards, and tasks an import of the file would create or skip without changing the database.",
+    )
+    group.add_argument(
+        "--pull",
+        action="store_true",
+        dest="pull",
+        help="Export an existing project to the JSON file, in the format used by --load and --new.",
+    )
     group.add_argument(
         "-t",
         "--template",
@@ -418,7 +317,25 @@ def main():
         help="Generate a JSON template for import into Planka. A project name is required still.",
         # TODO Make so a project name is not required.
     )
+    group.add_argument(
+        "--check-indexes",
+        action="store_true",
+        dest="check_indexes",
+        help="Report whether the lookups run by every import are served by indexes or will scan whole tables, exiting with 1 if an index is missing.",
+    )
 
+    parser.add_argument(
+        "--create-indexes",
+        action="store_true",
+        dest="create_indexes",
+        help="With --check-indexes, create the missing indexes concurrently, without blocking writes to the tables.",
+    )
+    parser.add_argument(
+        "--plan-sql",
+        action="store",
+        dest="plan_sql",
+        help="With --plan, also write a SQL script that applies the plan to this file.",
+    )
     parser.add_argument(
         "--DB-host",
         action="store",
@@ -454,6 +371,87 @@ def main():
         default="postgres",
         help="Username for the postgres server.",
     )
+    parser.add_argument(
+        "--format",
+        action="store",
+        dest="file_format",
+        default="json",
+        choices=["json", "trello", "csv"],
+        help="The format of the file: the import JSON, a Trello board export, or CSV rows with board, list, card, and task columns. Trello and CSV files are converted as they are read, a batch of cards at a time.",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        dest="bulk",
+        help="Load cards and tasks through COPY staging tables. Faster for very large imports.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store",
+        dest="stream",
+        choices=["board", "list"],
+        help="Read the JSON file incrementally and import it one board or one list at a time, so large files do not have to fit in memory.",
+    )
+    parser.add_argument(
+        "--workers",
+        action="store",
+        dest="workers",
+        default=1,
+        type=int,
+        help="Import the cards of different lists over this many connections at the same time. Boards and lists are committed before the workers start and each worker commits its own lists, so a failed import is not rolled back as a whole.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store",
+        dest="pipeline",
+        default=1,
+        type=int,
+        help="Keep up to N lookup queries in flight at the same time over extra asynchronous connections.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store",
+        dest="cache",
+        help="Keep the ids of the project's boards, lists, and cards in this SQLite file, so repeated imports skip their lookups.",
+    )
+    parser.add_argument(
+        "--commit-every",
+        action="store",
+        dest="commit_every",
+        default=0,
+        type=int,
+        help="Commit every N statements of a --load or --new import. By default the whole import is committed once and rolled back on failure. With --workers, each worker also commits every N statements.",
+    )
+    parser.add_argument(
+        "--hashes",
+        action="store",
+        dest="hashes",
+        help="Keep a content hash of the project's boards, lists, and cards in this SQLite file, so a --load skips the ones unchanged since the last import.",
+    )
+    parser.add_argument(
+        "--journal",
+        action="store",
+        dest="journal",
+        help="Record the progress of a --load or --new import in this file, committing each board or list with --stream, or the whole file otherwise, once it is imported.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        dest="resume",
+        help="Resume the import recorded in the --journal file, skipping the parts already imported and the lookups of the ids it holds.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        dest="stats",
+        help="Print the count, rows, and latency of the queries run in each phase of the import.",
+    )
+    parser.add_argument(
+        "--stats-json",
+        action="store",
+        dest="stats_json",
+        help="Write the query statistics, with latency histograms, to this JSON file.",
+    )
     parser.add_argument(
         "--log-level",
         action="store",
@@ -477,11 +475,38 @@ def main():
         )
         return 1
 
+    if not args.check_indexes and args.FILE_NAME is None:
+        parser.error("PROJECT_NAME and FILE_NAME are required.")
+
     if args.template:
         generate_template()
         return 0
 
+    if args.file_format != "json" and not (args.load or args.new):
+        logging.critical("--format is only used with --load and --new.")
+        return 1
+
+    if args.create_indexes and not args.check_indexes:
+        logging.critical("--create-indexes is only used with --check-indexes.")
+        return 1
+
+    if args.resume and not args.journal:
+        logging.critical("--resume needs the --journal file of the import.")
+        return 1
+
+    # Parsing creates millions of containers but no reference cycles, which
+    # would make the collector walk every live object over and over. It is
+    # turned off once for the whole run, as pausing it around each parse
+    # races with the other threads of --workers.
+    gc.disable()
+
+    query_stats = None
+    if args.stats or args.stats_json:
+        query_stats = stats.enable()
+
     # Set up database connection
+    pool = None
+    executor = None
     try:
         connection = create_connection(
             args.db_name,
@@ -490,53 +515,163 @@ def main():
             args.db_host,
             args.db_port,
         )
+        if args.workers > 1:
+            pool = create_pool(
+                args.workers,
+                args.db_name,
+                args.db_user,
+                args.db_pwd,
+                args.db_host,
+                args.db_port,
+            )
+        if args.pipeline > 1:
+            executor = AsyncExecutor(
+                args.pipeline,
+                args.db_name,
+                args.db_user,
+                args.db_pwd,
+                args.db_host,
+                args.db_port,
+            )
     except OperationalError as e:
         logging.error(f"The connection error '{e}' occurred")
         return 1
 
-    if args.new:
-        project = Project(name=args.PROJECT_NAME)
-
-        # Create the new Project.
-        try:
-            # Checks if a project id is found and exits if there is one.
-            execute_read_query(connection, project.select_id())[0][0]
-            logging.critical(f'Project "{project.name}" exists. Exiting.')
-            return 1
-        except IndexError:
-            # If IndexError is raised then the project does not exist in the DB.
-            logging.info(f"Createing {project.name}.")
-            execute_query(connection, project.insert())
-
-        # Gets value from first item in list and tuple
-        project.id = execute_read_query(connection, project.select_id())[0][0]
-
-        # Adds demo user to project
-        query = """SELECT id FROM user_account WHERE username='demo'"""
-        user_id = execute_read_query(connection, query)[0][0]
-
-        query = f"""
-            INSERT INTO
-                project_membership(project_id, user_id)
-            VALUES
-                ({project.id}, {user_id})
-        """
-
-        execute_query(connection, query)
-
-        build_new(connection, project, args.FILE_NAME)
-
-    elif args.load:
-        project = Project(name=args.PROJECT_NAME)
-
-        # Gets value from first item in list and tuple
+    try:
+        if args.check_indexes:
+            # Indexes cannot be created concurrently inside a transaction.
+            connection.autocommit = True
+            results = indexes.check(connection)
+            indexes.report(results, sys.stdout)
+            if args.create_indexes and indexes.create_indexes(connection, results):
+                results = indexes.check(connection)
+                indexes.report(results, sys.stdout)
+            if any(result["coverage"] != "full" for result in results):
+                return 1
+            return 0
+
+        cache = None
+        if args.cache:
+            cache = IdCache(args.cache, f"{args.db_host}:{args.db_port}/{args.db_name}")
+
+        journal = None
+        if args.journal:
+            journal = Journal(args.journal, args.resume)
+
+        hashes = None
+        if args.hashes:
+            hashes = HashStore(
+                args.hashes, f"{args.db_host}:{args.db_port}/{args.db_name}"
+            )
+
+        # Run the whole import in one transaction, or in batches of statements.
         try:
-            project.id = execute_read_query(connection, project.select_id())[0][0]
-        except IndexError:
-            logging.error(f"Project {project.name} does not exist.")
+            with Transaction(connection, args.commit_every) as transaction:
+                if args.new:
+                    # Checks if a project id is found and exits if there is one.
+                    project = find_project(transaction, args.PROJECT_NAME)
+                    if project is None:
+                        project = create_project(transaction, args.PROJECT_NAME)
+                    elif args.resume:
+                        logging.info(f"Resuming the build of {project.name}.")
+                    else:
+                        logging.critical(f'Project "{project.name}" exists. Exiting.')
+                        return 1
+
+                    build_new(
+                        transaction,
+                        project,
+                        args.FILE_NAME,
+                        bulk=args.bulk,
+                        stream=args.stream,
+                        pool=pool,
+                        commit_every=args.commit_every,
+                        executor=executor,
+                        cache=cache,
+                        journal=journal,
+                        hashes=hashes,
+                        file_format=args.file_format,
+                    )
+
+                elif args.plan:
+                    project = Project(name=args.PROJECT_NAME)
+
+                    # The project may not exist yet, in which case the plan creates it.
+                    try:
+                        project.id = execute_read_query(
+                            transaction, statements.select_project_id(project)
+                        )[0][0]
+                    except IndexError:
+                        logging.info(f"Project {project.name} does not exist.")
+
+                    snapshot = Snapshot.load(transaction, project.id)
+                    project.load_json(load(args.FILE_NAME))
+
+                    plan = Plan.build(project, snapshot)
+                    plan.report(sys.stdout)
+                    if args.plan_sql:
+                        with open(args.plan_sql, "w") as fp:
+                            plan.write_sql(fp)
+                        logging.info(f"Plan saved to {args.plan_sql}")
+
+                elif args.pull:
+                    project = Project(name=args.PROJECT_NAME)
+
+                    try:
+                        project.id = execute_read_query(
+                            transaction, statements.select_project_id(project)
+                        )[0][0]
+                    except IndexError:
+                        logging.error(f"Project {project.name} does not exist.")
+                        return 1
+
+                    # Rows are written as they arrive, so the project is never held in memory.
+                    with open(args.FILE_NAME, "w") as fp:
+                        write_project(iter_rows(transaction, project.id), fp, project)
+                    logging.info(f"Project saved to {args.FILE_NAME}")
+
+                elif args.load:
+                    project = find_project(transaction, args.PROJECT_NAME)
+                    if project is None:
+                        logging.error(f"Project {args.PROJECT_NAME} does not exist.")
+                        return 1
+
+                    load_cards(
+                        transaction,
+                        project,
+                        args.FILE_NAME,
+                        bulk=args.bulk,
+                        stream=args.stream,
+                        pool=pool,
+                        commit_every=args.commit_every,
+                        executor=executor,
+                        cache=cache,
+                        journal=journal,
+                        hashes=hashes,
+                        file_format=args.file_format,
+                    )
+        except ERRORS:
+            # The failed query was logged and the transaction rolled back.
             return 1
 
-        load_cards(connection, project, args.FILE_NAME)
+        if journal:
+            journal.close()
+        if hashes:
+            hashes.close()
+
+        if query_stats is not None:
+            if args.stats:
+                query_stats.report(sys.stdout)
+            if args.stats_json:
+                with open(args.stats_json, "w") as fp:
+                    query_stats.write_json(fp)
+                logging.info(f"Query statistics saved to {args.stats_json}")
+    finally:
+        if executor is not None:
+            executor.close()
+        if pool is not None:
+            pool.closeall()
+        connection.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""Allocate positions for new Planka objects."""
+
+# Standard Python Libraries
+import logging
+
+# Project Libraries
+from models.models import POSITION_GAP
+
+from . import statements
+from .db import execute_read_query
+
+
+class PositionAllocator(object):
+    """Hand out positions for new boards, lists, and cards from memory.
+
+    The highest position under every parent is fetched with one grouped query
+    per level, after which each new object is placed POSITION_GAP after the
+    last one in its own parent without another query.
+    """
+
+    def __init__(self, connection, positions=None):
+        """Create a new allocator using the given connection.
+
+        Allocators given the same positions dict share what they know, which
+        is safe across threads as long as each parent is only used by one.
+        """
+        self.connection = connection
+        self._positions = dict() if positions is None else positions
+
+    def load(self, model, parent_ids):
+        """Fetch the highest position under each parent that is not yet known.
+
+        Args:
+            model (type): The Model subclass that positions are allocated for.
+            parent_ids (list[int]): The ids of the parents of new objects.
+        """
+        missing = [
+            parent_id
+            for parent_id in dict.fromkeys(parent_ids)
+            if (model, parent_id) not in self._positions
+        ]
+        if not missing:
+            return
+
+        logging.debug(f"Loading {model.__name__} positions of {len(missing)} parents.")
+        self.set_empty(model, missing)
+        rows = execute_read_query(
+            self.connection, statements.max_positions(model, missing)
+        )
+        for parent_id, position in rows or []:
+            self._positions[(model, parent_id)] = position
+
+    def set_empty(self, model, parent_ids):
+        """Record parents that have no objects of model, such as new ones."""
+        for parent_id in parent_ids:
+            self._positions[(model, parent_id)] = None
+
+    def update(self, model, positions):
+        """Record the highest position under parents, keyed by parent id."""
+        for parent_id, position in positions.items():
+            self._positions[(model, parent_id)] = position
+
+    def next(self, model, parent_id):
+        """Return the next free position under a parent loaded beforehand."""
+        prior_position = self._positions[(model, parent_id)]
+        position = 0 if prior_position is None else prior_position + POSITION_GAP
+        self._positions[(model, parent_id)] = position
+        return position
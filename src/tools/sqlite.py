@@ -0,0 +1,323 @@
+"""An in-process Planka database in SQLite."""
+
+# Standard Python Libraries
+import json
+import re
+import sqlite3
+
+# Project Libraries
+from models.models import POSITION_GAP, Board, Card, List
+
+from . import bulk
+from .backend import Backend
+from .statements import BoundStatement
+
+# The tables and indexes of Planka used by the importer.
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS project (
+        id INTEGER PRIMARY KEY, name TEXT NOT NULL,
+        created_at TEXT, updated_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS user_account (id INTEGER PRIMARY KEY, username TEXT);
+    CREATE TABLE IF NOT EXISTS project_membership (
+        id INTEGER PRIMARY KEY, project_id INTEGER NOT NULL, user_id INTEGER NOT NULL,
+        created_at TEXT, updated_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS board (
+        id INTEGER PRIMARY KEY, project_id INTEGER NOT NULL, type TEXT NOT NULL,
+        position REAL NOT NULL, name TEXT NOT NULL, created_at TEXT, updated_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS list (
+        id INTEGER PRIMARY KEY, board_id INTEGER NOT NULL, position REAL NOT NULL,
+        name TEXT NOT NULL, created_at TEXT, updated_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS card (
+        id INTEGER PRIMARY KEY, board_id INTEGER NOT NULL, list_id INTEGER,
+        position REAL, name TEXT NOT NULL, created_at TEXT, updated_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS task (
+        id INTEGER PRIMARY KEY, card_id INTEGER NOT NULL, name TEXT NOT NULL,
+        is_completed BOOLEAN NOT NULL, created_at TEXT, updated_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS board_project_id_index ON board (project_id);
+    CREATE INDEX IF NOT EXISTS list_board_id_index ON list (board_id);
+    CREATE INDEX IF NOT EXISTS card_board_id_index ON card (board_id);
+    CREATE INDEX IF NOT EXISTS card_list_id_index ON card (list_id);
+    CREATE INDEX IF NOT EXISTS task_card_id_index ON task (card_id);
+    INSERT INTO user_account (username)
+        SELECT 'demo' WHERE NOT EXISTS (SELECT 1 FROM user_account);
+"""
+
+
+def _select_many(model):
+    """Return SQL selecting objects whose parent id and name are in JSON arrays."""
+    table = model.__name__.lower()
+    parent = model._parent_keys[-1]
+    return (
+        f"SELECT id, position, {', '.join(model._parent_keys)}, name FROM {table} "
+        f"WHERE {parent} IN (SELECT value FROM json_each(?1)) "
+        "AND name IN (SELECT value FROM json_each(?2)) ORDER BY id"
+    )
+
+
+def _max_positions(model):
+    """Return SQL selecting the highest position under parents in a JSON array."""
+    table = model.__name__.lower()
+    parent = model._parent_keys[-1]
+    return (
+        f"SELECT {parent}, MAX(position) FROM {table} "
+        f"WHERE {parent} IN (SELECT value FROM json_each(?1)) GROUP BY {parent}"
+    )
+
+
+# Statements that take Postgres arrays, which are bound as JSON arrays instead.
+# Other statements only need their $n parameters written as ?n.
+STATEMENTS = dict()
+
+# Statements inserting a row per array index. Joining arrays on their index
+# would be quadratic, so their columns are bound zipped into one JSON array
+# of rows.
+ROW_STATEMENTS = {
+    "planka_insert_boards": """
+        INSERT INTO board (project_id, type, name, position)
+        SELECT
+            json_extract(value, '$[0]'),
+            'kanban',
+            json_extract(value, '$[1]'),
+            json_extract(value, '$[2]')
+        FROM json_each(?1) v
+        WHERE NOT EXISTS (
+            SELECT 1 FROM board b
+            WHERE b.project_id = json_extract(v.value, '$[0]')
+                AND b.name = json_extract(v.value, '$[1]')
+        )
+        ORDER BY key
+        RETURNING id, project_id, name
+    """,
+    "planka_insert_lists": """
+        INSERT INTO list (board_id, name, position)
+        SELECT
+            json_extract(value, '$[0]'),
+            json_extract(value, '$[1]'),
+            json_extract(value, '$[2]')
+        FROM json_each(?1) v
+        WHERE NOT EXISTS (
+            SELECT 1 FROM list l
+            WHERE l.board_id = json_extract(v.value, '$[0]')
+                AND l.name = json_extract(v.value, '$[1]')
+        )
+        ORDER BY key
+        RETURNING id, board_id, name
+    """,
+    "planka_insert_cards": """
+        INSERT INTO card (board_id, list_id, name, position)
+        SELECT
+            json_extract(value, '$[0]'),
+            json_extract(value, '$[1]'),
+            json_extract(value, '$[2]'),
+            json_extract(value, '$[3]')
+        FROM json_each(?1) v
+        WHERE NOT EXISTS (
+            SELECT 1 FROM card c
+            WHERE c.list_id = json_extract(v.value, '$[1]')
+                AND c.name = json_extract(v.value, '$[2]')
+        )
+        ORDER BY key
+        RETURNING id, board_id, list_id, name
+    """,
+    "planka_insert_tasks": """
+        INSERT INTO task (card_id, name, is_completed)
+        SELECT
+            json_extract(value, '$[0]'),
+            json_extract(value, '$[1]'), false
+        FROM json_each(?1) v
+        WHERE NOT EXISTS (
+            SELECT 1 FROM task t
+            WHERE t.card_id = json_extract(v.value, '$[0]')
+                AND t.name = json_extract(v.value, '$[1]')
+        )
+        ORDER BY key
+        RETURNING id, card_id, name
+    """,
+}
+for _model in (Board, List, Card):
+    _name = _model.__name__.lower()
+    STATEMENTS[f"planka_select_{_name}s"] = _select_many(_model)
+    STATEMENTS[f"planka_max_{_name}_positions"] = _max_positions(_model)
+
+# SQL strings written for Postgres, as the SQLite statements doing the same.
+# The rows of the last statement are returned.
+QUERIES = {
+    bulk.CREATE_STAGES: [
+        "DROP TABLE IF EXISTS card_stage",
+        "DROP TABLE IF EXISTS task_stage",
+        "CREATE TEMP TABLE card_stage "
+        "(ord INTEGER, board_id INTEGER, list_id INTEGER, name TEXT)",
+        "CREATE TEMP TABLE task_stage "
+        "(ord INTEGER, list_id INTEGER, card_name TEXT, name TEXT)",
+    ],
+    # The first staged row of each name is kept through a bare column of MIN.
+    bulk.MERGE_CARDS: [
+        f"""
+            INSERT INTO
+                card (board_id, list_id, name, position)
+            SELECT
+                s.board_id,
+                s.list_id,
+                s.name,
+                COALESCE(p.position + {POSITION_GAP}, 0)
+                    + {bulk.POSITION_GAP} * (
+                        ROW_NUMBER() OVER (PARTITION BY s.list_id ORDER BY s.ord) - 1
+                    )
+            FROM (
+                SELECT MIN(ord) AS ord, board_id, list_id, name
+                FROM card_stage
+                GROUP BY list_id, name
+            ) s
+            LEFT JOIN (
+                SELECT list_id, MAX(position) AS position
+                FROM card
+                WHERE list_id IN (SELECT list_id FROM card_stage)
+                GROUP BY list_id
+            ) p ON p.list_id = s.list_id
+            WHERE NOT EXISTS (
+                SELECT 1 FROM card c
+                WHERE c.list_id = s.list_id AND c.name = s.name
+            )
+            ORDER BY s.ord
+        """,
+        "SELECT changes()",
+    ],
+    bulk.MERGE_TASKS: [
+        """
+            INSERT INTO
+                task (card_id, name, is_completed)
+            SELECT c.id, s.name, false
+            FROM (
+                SELECT MIN(ord) AS ord, list_id, card_name, name
+                FROM task_stage
+                GROUP BY list_id, card_name, name
+            ) s
+            JOIN (
+                SELECT list_id, name, MIN(id) AS id
+                FROM card
+                WHERE list_id IN (SELECT list_id FROM task_stage)
+                GROUP BY list_id, name
+            ) c ON c.list_id = s.list_id AND c.name = s.card_name
+            WHERE NOT EXISTS (
+                SELECT 1 FROM task t WHERE t.card_id = c.id AND t.name = s.name
+            )
+            ORDER BY s.ord
+        """,
+        "SELECT changes()",
+    ],
+    bulk.DROP_STAGES: ["DROP TABLE card_stage", "DROP TABLE task_stage"],
+}
+
+_PARAMETER = re.compile(r"\$(\d+)")
+_COPY = re.compile(r"\s*COPY\s+(\w+)\s*\(([^)]*)\)\s+FROM\s+STDIN\s*$", re.IGNORECASE)
+_ESCAPE = re.compile(r"\\(.)")
+_ESCAPES = {"t": "\t", "n": "\n", "r": "\r"}
+
+
+def _value(value):
+    """Return a parameter as SQLite can bind it, with lists as JSON arrays."""
+    if isinstance(value, list):
+        return json.dumps(value)
+    return value
+
+
+def _rows(columns):
+    """Return array parameters zipped into a JSON array of rows."""
+    return json.dumps(list(zip(*columns)))
+
+
+def _copy_value(text):
+    """Return the value of a field in the COPY text format."""
+    if text == "\\N":
+        return None
+    return _ESCAPE.sub(lambda match: _ESCAPES.get(match[1], match[1]), text)
+
+
+def _copy_rows(stream, size=65536):
+    """Yield the rows of COPY text read from a stream as tuples."""
+    buffer = ""
+    for chunk in iter(lambda: stream.read(size), ""):
+        lines = (buffer + chunk).split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            yield tuple(_copy_value(field) for field in line.split("\t"))
+    if buffer:
+        yield tuple(_copy_value(field) for field in buffer.split("\t"))
+
+
+class SQLiteBackend(Backend):
+    """A Planka database in SQLite, in memory unless given a file.
+
+    It holds the tables the importer uses and runs the statements and bulk
+    queries written for Postgres as SQLite statements doing the same, so an
+    import can run without a database server. The id cache, --pull, and the
+    concurrent --workers and --pipeline modes still need Postgres.
+    """
+
+    def __init__(self, path=":memory:"):
+        """Create a new backend, creating the Planka tables if they are missing.
+
+        Args:
+            path (string, optional): The SQLite database file. Defaults to ":memory:".
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def _run(self, query):
+        """Run a query and return its cursor."""
+        cursor = self.connection.cursor()
+        if isinstance(query, BoundStatement):
+            name = query.statement.name
+            if name in ROW_STATEMENTS:
+                cursor.execute(ROW_STATEMENTS[name], (_rows(query.values),))
+            else:
+                sql = STATEMENTS.get(name)
+                if sql is None:
+                    sql = _PARAMETER.sub(r"?\1", query.statement.sql)
+                cursor.execute(sql, tuple(_value(value) for value in query.values))
+        else:
+            for sql in QUERIES.get(query, [query]):
+                cursor.execute(sql)
+        return cursor
+
+    def read(self, query):
+        """Run a query and return the rows it selected."""
+        return self._run(query).fetchall()
+
+    def write(self, query):
+        """Run a query changing the database, returning its rows and row count."""
+        cursor = self._run(query)
+        if cursor.description is None:
+            return (None, max(cursor.rowcount, 0))
+        rows = cursor.fetchall()
+        return (rows, len(rows))
+
+    def copy(self, query, stream):
+        """Run a COPY ... FROM STDIN query as inserts of the rows it reads."""
+        match = _COPY.match(query)
+        if match is None:
+            raise sqlite3.OperationalError(f"Unsupported COPY query: {query}")
+        (table, columns) = (match[1], match[2])
+        marks = ", ".join("?" * len(columns.split(",")))
+        cursor = self.connection.executemany(
+            f"INSERT INTO {table} ({columns}) VALUES ({marks})", _copy_rows(stream)
+        )
+        return max(cursor.rowcount, 0)
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.connection.commit()
+
+    def rollback(self):
+        """Roll back the current transaction."""
+        self.connection.rollback()
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
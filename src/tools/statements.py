@@ -0,0 +1,418 @@
+"""Server side prepared statements for the queries of the models."""
+
+# Standard Python Libraries
+import weakref
+
+# Project Libraries
+from models.models import Board, Card, List, Project
+
+# The names of the statements already prepared on each connection.
+_prepared: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _array(values):
+    """Return a list as the text of a Postgres array.
+
+    A single string parameter is far cheaper for Postgres to read than the
+    ARRAY[...] expression psycopg2 would otherwise send for a list.
+    """
+    items = []
+    for value in values:
+        if value is None:
+            items.append("NULL")
+        else:
+            text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            items.append(f'"{text}"')
+    return "{" + ",".join(items) + "}"
+
+
+class Statement(object):
+    """A named SQL statement with typed $n parameters.
+
+    A statement is prepared the first time it is run on a connection and is
+    executed by name afterwards, so Postgres parses and plans it once per
+    connection instead of once per query. Many rows are passed as arrays, so
+    a single plan serves any number of objects.
+    """
+
+    def __init__(self, name, types, sql):
+        """Create a new statement.
+
+        Args:
+            name (string): The name the statement is prepared under.
+            types (tuple[string]): The SQL type of each parameter.
+            sql (string): The SQL of the statement, with $1, $2, ... parameters.
+        """
+        self.name = name
+        self.types = tuple(types)
+        self.sql = sql
+
+    def __call__(self, *params):
+        """Return the statement bound to parameters, ready to be executed."""
+        return BoundStatement(
+            self,
+            tuple(
+                _array(param) if isinstance(param, list) else param
+                for param in params
+            ),
+            params,
+        )
+
+    def prepare(self):
+        """Return the SQL that prepares the statement."""
+        types = f" ({', '.join(self.types)})" if self.types else ""
+        return f"PREPARE {self.name}{types} AS {self.sql}"
+
+    def execute(self):
+        """Return the SQL that executes the statement, with %s placeholders."""
+        if not self.types:
+            return f"EXECUTE {self.name}"
+        return f"EXECUTE {self.name} ({', '.join(['%s'] * len(self.types))})"
+
+
+class BoundStatement(object):
+    """A Statement along with the parameters to execute it with.
+
+    params holds the parameters as sent to Postgres, with lists as array
+    text, and values holds them as they were given, for other backends.
+    """
+
+    def __init__(self, statement, params, values=None):
+        """Bind parameters to a statement."""
+        self.statement = statement
+        self.params = params
+        self.values = params if values is None else values
+
+    def __str__(self):
+        """Return the statement and its parameters for logging."""
+        return f"EXECUTE {self.statement.name} {self.params!r}"
+
+    def is_prepared(self, connection):
+        """Return True if the statement is prepared on a psycopg2 connection."""
+        return self.statement.name in _prepared.get(connection, ())
+
+    def set_prepared(self, connection):
+        """Record the statement as prepared on a psycopg2 connection."""
+        _prepared.setdefault(connection, set()).add(self.statement.name)
+
+    def run(self, cursor):
+        """Execute the statement with a cursor, preparing it first if needed."""
+        if not self.is_prepared(cursor.connection):
+            cursor.execute(self.statement.prepare())
+            self.set_prepared(cursor.connection)
+        cursor.execute(self.statement.execute(), self.params or None)
+
+
+def run(cursor, query):
+    """Execute a SQL string or a BoundStatement with a cursor."""
+    if isinstance(query, BoundStatement):
+        query.run(cursor)
+    else:
+        cursor.execute(query)
+
+
+SELECT_PROJECT_ID = Statement(
+    "planka_select_project_id", ("text",), "SELECT id FROM project WHERE name=$1"
+)
+INSERT_PROJECT = Statement(
+    "planka_insert_project", ("text",), "INSERT INTO project (name) VALUES ($1)"
+)
+
+MAX_POSITIONS = {
+    model: Statement(
+        f"planka_max_{model.__name__.lower()}_positions",
+        ("bigint[]",),
+        f"SELECT {model._parent_keys[-1]}, MAX(position) FROM {model.__name__.lower()} WHERE {model._parent_keys[-1]} = ANY($1) GROUP BY {model._parent_keys[-1]}",
+    )
+    for model in (Board, List, Card)
+}
+
+SELECT_MANY = {
+    Board: Statement(
+        "planka_select_boards",
+        ("bigint[]", "text[]"),
+        "SELECT b.id, b.position, b.project_id, b.name FROM board b JOIN (SELECT DISTINCT unnest($2) AS name) v ON v.name = b.name WHERE b.project_id = ANY($1) ORDER BY b.id",
+    ),
+    List: Statement(
+        "planka_select_lists",
+        ("bigint[]", "text[]"),
+        "SELECT l.id, l.position, l.board_id, l.name FROM list l JOIN (SELECT DISTINCT unnest($2) AS name) v ON v.name = l.name WHERE l.board_id = ANY($1) ORDER BY l.id",
+    ),
+    Card: Statement(
+        "planka_select_cards",
+        ("bigint[]", "text[]"),
+        "SELECT c.id, c.position, c.board_id, c.list_id, c.name FROM card c JOIN (SELECT DISTINCT unnest($2) AS name) v ON v.name = c.name WHERE c.list_id = ANY($1) ORDER BY c.id",
+    ),
+}
+
+# Multi-row inserts that skip the objects already in Planka, as does
+# INSERT_TASKS. The objects under the batch's parents with the batch's names
+# are read once through the parent index and anti-joined by hash, rather than
+# probed for every row, which would scan every object of the parent once per
+# new object. Cards are matched on their list and name in every backend and
+# mode, as a list belongs to a single board.
+INSERT_MANY = {
+    Board: Statement(
+        "planka_insert_boards",
+        ("bigint[]", "text[]", "double precision[]"),
+        """
+            WITH existing AS MATERIALIZED (
+                SELECT b.project_id, b.name FROM board b
+                JOIN (SELECT DISTINCT unnest($2) AS name) n ON n.name = b.name
+                WHERE b.project_id = ANY($1)
+            )
+            INSERT INTO
+                board (project_id, type, name, position)
+            SELECT v.project_id, 'kanban', v.name, v.position
+            FROM unnest($1, $2, $3) AS v (project_id, name, position)
+            LEFT JOIN existing e
+                ON e.project_id = v.project_id AND e.name = v.name
+            WHERE e.name IS NULL
+            RETURNING id, project_id, name
+        """,
+    ),
+    List: Statement(
+        "planka_insert_lists",
+        ("bigint[]", "text[]", "double precision[]"),
+        """
+            WITH existing AS MATERIALIZED (
+                SELECT l.board_id, l.name FROM list l
+                JOIN (SELECT DISTINCT unnest($2) AS name) n ON n.name = l.name
+                WHERE l.board_id = ANY($1)
+            )
+            INSERT INTO
+                list (board_id, name, position)
+            SELECT v.board_id, v.name, v.position
+            FROM unnest($1, $2, $3) AS v (board_id, name, position)
+            LEFT JOIN existing e ON e.board_id = v.board_id AND e.name = v.name
+            WHERE e.name IS NULL
+            RETURNING id, board_id, name
+        """,
+    ),
+    Card: Statement(
+        "planka_insert_cards",
+        ("bigint[]", "bigint[]", "text[]", "double precision[]"),
+        """
+            WITH existing AS MATERIALIZED (
+                SELECT c.list_id, c.name FROM card c
+                JOIN (SELECT DISTINCT unnest($3) AS name) n ON n.name = c.name
+                WHERE c.list_id = ANY($2)
+            )
+            INSERT INTO
+                card (board_id, list_id, name, position)
+            SELECT v.board_id, v.list_id, v.name, v.position
+            FROM unnest($1, $2, $3, $4) AS v (board_id, list_id, name, position)
+            LEFT JOIN existing e ON e.list_id = v.list_id AND e.name = v.name
+            WHERE e.name IS NULL
+            RETURNING id, board_id, list_id, name
+        """,
+    ),
+}
+
+INSERT_TASKS = Statement(
+    "planka_insert_tasks",
+    ("bigint[]", "text[]"),
+    """
+        WITH existing AS MATERIALIZED (
+            SELECT t.card_id, t.name FROM task t
+            JOIN (SELECT DISTINCT unnest($2) AS name) n ON n.name = t.name
+            WHERE t.card_id = ANY($1)
+        )
+        INSERT INTO
+            task (card_id, name, is_completed)
+        SELECT v.card_id, v.name, false
+        FROM unnest($1, $2) AS v (card_id, name)
+        LEFT JOIN existing e ON e.card_id = v.card_id AND e.name = v.name
+        WHERE e.name IS NULL
+        RETURNING id, card_id, name
+    """,
+)
+
+
+INSERT_PROJECT_MEMBERSHIP = Statement(
+    "planka_insert_project_membership",
+    ("bigint", "bigint"),
+    "INSERT INTO project_membership (project_id, user_id) VALUES ($1, $2)",
+)
+
+# The joins from each table to the project it belongs to, for the statements
+# reading a whole project.
+_PROJECT_JOINS = {
+    "board": "board b",
+    "list": "list l JOIN board b ON b.id = l.board_id",
+    "card": "card c JOIN board b ON b.id = c.board_id",
+    "task": "task t JOIN card c ON c.id = t.card_id JOIN board b ON b.id = c.board_id",
+}
+
+# For each table, the highest id along with the number of rows and the last
+# update of the rows an IdCache already holds, given the highest id it holds.
+# Rows are never renumbered, so the cache is still correct as long as its
+# rows were neither removed nor changed, and only rows with a higher id have
+# to be fetched.
+CACHE_FINGERPRINT = Statement(
+    "planka_cache_fingerprint",
+    ("bigint", "bigint", "bigint", "bigint"),
+    f"""
+        SELECT 'board', MAX(b.id), COUNT(*) FILTER (WHERE b.id <= $2), CAST(MAX(b.updated_at) FILTER (WHERE b.id <= $2) AS text)
+        FROM {_PROJECT_JOINS["board"]} WHERE b.project_id = $1
+        UNION ALL
+        SELECT 'list', MAX(l.id), COUNT(*) FILTER (WHERE l.id <= $3), CAST(MAX(l.updated_at) FILTER (WHERE l.id <= $3) AS text)
+        FROM {_PROJECT_JOINS["list"]} WHERE b.project_id = $1
+        UNION ALL
+        SELECT 'card', MAX(c.id), COUNT(*) FILTER (WHERE c.id <= $4), CAST(MAX(c.updated_at) FILTER (WHERE c.id <= $4) AS text)
+        FROM {_PROJECT_JOINS["card"]} WHERE b.project_id = $1
+    """,
+)
+
+# The boards, lists, and cards of a project above an id, for an IdCache.
+CACHE_ROWS = {
+    "board": Statement(
+        "planka_cache_boards",
+        ("bigint", "bigint"),
+        f"SELECT b.id, b.project_id, b.name, b.position, CAST(b.updated_at AS text) FROM {_PROJECT_JOINS['board']} WHERE b.project_id = $1 AND b.id > $2",
+    ),
+    "list": Statement(
+        "planka_cache_lists",
+        ("bigint", "bigint"),
+        f"SELECT l.id, l.board_id, l.name, l.position, CAST(l.updated_at AS text) FROM {_PROJECT_JOINS['list']} WHERE b.project_id = $1 AND l.id > $2",
+    ),
+    "card": Statement(
+        "planka_cache_cards",
+        ("bigint", "bigint"),
+        f"SELECT c.id, c.list_id, c.name, c.position, CAST(c.updated_at AS text) FROM {_PROJECT_JOINS['card']} WHERE b.project_id = $1 AND c.id > $2",
+    ),
+}
+
+# The size and last change of every table under a project, for a HashStore.
+HASH_FINGERPRINT = Statement(
+    "planka_hash_fingerprint",
+    ("bigint",),
+    "SELECT "
+    + ", ".join(
+        f"(SELECT {column} FROM {_PROJECT_JOINS[table]} WHERE b.project_id = $1)"
+        for (table, alias) in (
+            ("board", "b"),
+            ("list", "l"),
+            ("card", "c"),
+            ("task", "t"),
+        )
+        for column in (
+            "COUNT(*)",
+            f"MAX({alias}.id)",
+            f"CAST(MAX({alias}.updated_at) AS TEXT)",
+        )
+    ),
+)
+
+# The boards, lists, cards, and tasks of a project, for a plan's Snapshot.
+SNAPSHOT = {
+    "board": Statement(
+        "planka_snapshot_boards",
+        ("bigint",),
+        f"SELECT b.id, b.name, b.position FROM {_PROJECT_JOINS['board']} WHERE b.project_id = $1 ORDER BY b.id",
+    ),
+    "list": Statement(
+        "planka_snapshot_lists",
+        ("bigint",),
+        f"SELECT l.id, l.board_id, l.name, l.position FROM {_PROJECT_JOINS['list']} WHERE b.project_id = $1 ORDER BY l.id",
+    ),
+    "card": Statement(
+        "planka_snapshot_cards",
+        ("bigint",),
+        f"SELECT c.id, c.list_id, c.name, c.position FROM {_PROJECT_JOINS['card']} WHERE b.project_id = $1 ORDER BY c.id",
+    ),
+    "task": Statement(
+        "planka_snapshot_tasks",
+        ("bigint",),
+        f"SELECT t.card_id, t.name FROM {_PROJECT_JOINS['task']} WHERE b.project_id = $1",
+    ),
+}
+
+# The parent ids and names of the latest rows of a table, by table and parent
+# column, for explaining the lookups of the indexes check.
+SAMPLE_ROWS = {
+    (table, column): Statement(
+        f"planka_sample_{table}s",
+        ("bigint",),
+        f"SELECT {column}, name FROM {table} ORDER BY id DESC LIMIT $1",
+    )
+    for (table, column) in (
+        ("board", "project_id"),
+        ("list", "board_id"),
+        ("card", "list_id"),
+        ("task", "card_id"),
+    )
+}
+
+READ_INDEXES = Statement(
+    "planka_read_indexes",
+    ("text[]",),
+    "SELECT tablename, indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND CAST(tablename AS text) = ANY($1) ORDER BY indexname",
+)
+
+TABLE_ROWS = Statement(
+    "planka_table_rows",
+    ("text[]",),
+    "SELECT relname, CAST(reltuples AS bigint) FROM pg_class WHERE oid IN (SELECT CAST(unnest($1) AS regclass))",
+)
+
+
+def _parent_ids(obj):
+    """Return the parent ids of an object in the order of its statements."""
+    return tuple(getattr(obj, attr) for attr in obj._parent_keys)
+
+
+def select_project_id(project: Project):
+    """Return a statement selecting the id of a Project by name."""
+    return SELECT_PROJECT_ID(project.name)
+
+
+def insert_project(project: Project):
+    """Return a statement inserting a Project by name."""
+    return INSERT_PROJECT(project.name)
+
+
+def max_positions(model, parent_ids):
+    """Return a statement selecting the highest position under each parent."""
+    return MAX_POSITIONS[model](list(dict.fromkeys(parent_ids)))
+
+
+def select_many(model, objects):
+    """Return a statement selecting many objects of a model by parent id and name.
+
+    Names are joined against a derived table rather than filtered with
+    name = ANY(...), which a generic plan would check one name at a time.
+    """
+    objects = list(objects)
+    return SELECT_MANY[model](
+        list(dict.fromkeys(getattr(obj, model._parent_keys[-1]) for obj in objects)),
+        list(dict.fromkeys(obj.name for obj in objects)),
+    )
+
+
+def insert_many(model, objects):
+    """Return a statement inserting many objects of a model, returning their keys.
+
+    Objects already in Planka are skipped by the statement itself and not
+    returned.
+    """
+    objects = list(objects)
+    columns = [[getattr(obj, attr) for obj in objects] for attr in model._parent_keys]
+    return INSERT_MANY[model](
+        *columns,
+        [obj.name for obj in objects],
+        [obj.position for obj in objects],
+    )
+
+
+def insert_tasks(tasks):
+    """Return a statement inserting many (card id, name) tasks, returning the new ones.
+
+    Tasks already on their card are skipped by the statement itself, so it
+    does not rely on the tasks having been read first. The (id, card id,
+    name) of each task inserted is returned.
+    """
+    tasks = list(dict.fromkeys(tasks))
+    return INSERT_TASKS(
+        [card_id for (card_id, _) in tasks], [name for (_, name) in tasks]
+    )
@@ -0,0 +1,180 @@
+"""Count, row, and latency statistics of the queries run on Postgres."""
+
+# Standard Python Libraries
+import bisect
+from contextlib import contextmanager
+import json
+import threading
+
+# Project Libraries
+from .statements import BoundStatement
+
+# Upper bounds in milliseconds of the latency histogram buckets.
+BUCKETS = (0.1, 0.3, 1, 3, 10, 30, 100, 300, 1000, 3000)
+
+# The phase of each thread, set by phase() while importing.
+_local = threading.local()
+
+# The active collector, or None when statistics are not being recorded.
+_collector = None
+
+
+def kind(query):
+    """Return the kind of a query, used to group its statistics.
+
+    Prepared statements are grouped by the name they are prepared under and
+    SQL strings by their first keyword.
+
+    Args:
+        query (string or BoundStatement): The SQL query or prepared statement.
+
+    Returns:
+        string: The kind of the query, such as "select_cards" or "insert".
+    """
+    if isinstance(query, BoundStatement):
+        return query.statement.name.replace("planka_", "", 1)
+    words = str(query).split(None, 1)
+    return words[0].lower() if words else ""
+
+
+class Entry(object):
+    """The statistics of one kind of query in one phase."""
+
+    def __init__(self):
+        """Create a new empty entry."""
+        self.count = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+
+    def add(self, rows, seconds):
+        """Add a query returning or changing rows that took seconds."""
+        self.count += 1
+        self.rows += rows
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.histogram[bisect.bisect_left(BUCKETS, seconds * 1000)] += 1
+
+    def as_dict(self):
+        """Return a dict representation of the entry."""
+        labels = [f"<={bound}ms" for bound in BUCKETS] + [f">{BUCKETS[-1]}ms"]
+        return {
+            "count": self.count,
+            "rows": self.rows,
+            "seconds": self.seconds,
+            "max_seconds": self.max_seconds,
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+class QueryStats(object):
+    """Statistics of the queries run, grouped by import phase and query kind.
+
+    Queries may be recorded from many threads, such as the workers of a
+    ParallelImporter, so entries are only changed while holding a lock.
+    """
+
+    def __init__(self):
+        """Create a new empty collection of statistics."""
+        self.entries = dict()
+        self._lock = threading.Lock()
+
+    def record(self, phase, kind, rows, seconds):
+        """Record a query of kind run during phase.
+
+        Args:
+            phase (string): The import phase the query was run in.
+            kind (string): The kind of the query.
+            rows (int): The rows the query returned or changed.
+            seconds (float): The time the query took.
+        """
+        with self._lock:
+            entry = self.entries.get((phase, kind))
+            if entry is None:
+                entry = self.entries[(phase, kind)] = Entry()
+            entry.add(rows, seconds)
+
+    def as_dict(self):
+        """Return a dict of the statistics of each kind of query by phase."""
+        result = dict()
+        for (phase, kind), entry in self.entries.items():
+            result.setdefault(phase, dict())[kind] = entry.as_dict()
+        return result
+
+    def report(self, fp):
+        """Write a table of the statistics to a file.
+
+        Args:
+            fp (file): The file the table is written to.
+        """
+        fp.write(
+            f"{'phase':<10}{'query':<28}{'count':>8}{'rows':>10}"
+            f"{'total ms':>11}{'mean ms':>9}{'max ms':>9}\n"
+        )
+        totals = Entry()
+        for (phase, kind), entry in self.entries.items():
+            fp.write(
+                f"{phase:<10}{kind:<28}{entry.count:>8}{entry.rows:>10}"
+                f"{entry.seconds * 1000:>11.1f}"
+                f"{entry.seconds * 1000 / entry.count:>9.2f}"
+                f"{entry.max_seconds * 1000:>9.2f}\n"
+            )
+            totals.count += entry.count
+            totals.rows += entry.rows
+            totals.seconds += entry.seconds
+        fp.write(
+            f"{'total':<38}{totals.count:>8}{totals.rows:>10}"
+            f"{totals.seconds * 1000:>11.1f}\n"
+        )
+
+    def write_json(self, fp):
+        """Write the statistics to a file as JSON.
+
+        Args:
+            fp (file): The file the JSON is written to.
+        """
+        json.dump(self.as_dict(), fp, indent=2)
+
+
+def enable():
+    """Start recording the statistics of every query and return them."""
+    global _collector
+    _collector = QueryStats()
+    return _collector
+
+
+def disable():
+    """Stop recording the statistics of queries."""
+    global _collector
+    _collector = None
+
+
+@contextmanager
+def phase(name):
+    """Record the queries run by the current thread as part of a phase.
+
+    Args:
+        name (string): The name of the phase, such as "cards".
+    """
+    previous = getattr(_local, "phase", None)
+    _local.phase = name
+    try:
+        yield
+    finally:
+        _local.phase = previous
+
+
+def record(query, rows, seconds):
+    """Record a query with the active collector, if there is one.
+
+    Args:
+        query (string or BoundStatement): The SQL query or prepared statement that was run.
+        rows (int): The rows the query returned or changed.
+        seconds (float): The time the query took.
+    """
+    collector = _collector
+    if collector is not None:
+        collector.record(
+            getattr(_local, "phase", None) or "setup", kind(query), rows, seconds
+        )
@@ -0,0 +1,175 @@
+"""Read import files incrementally, one board or one list at a time."""
+
+# Standard Python Libraries
+import json
+
+# Project Libraries
+from models.models import Board
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+
+
+class JSONStream(object):
+    """Read the values of a JSON document from a file as they are needed.
+
+    Only the value being read is held in memory. Containers can be walked
+    with members and items, while every other value is decoded with value.
+    """
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        """Create a new stream reading from an open text file."""
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.index = 0
+        self.eof = False
+
+    def _fill(self):
+        """Read more of the file into the buffer, returning False at the end."""
+        if self.eof:
+            return False
+
+        # Drop what has been consumed and at least double what is buffered, so
+        # large values are not decoded over and over again.
+        consumed = self.index
+        self.buffer = self.buffer[consumed:]
+        self.index = 0
+        chunk = self.fp.read(max(self.chunk_size, len(self.buffer)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self):
+        """Return the next character that is not whitespace, or "" at the end."""
+        while True:
+            while self.index < len(self.buffer):
+                if self.buffer[self.index] not in WHITESPACE:
+                    return self.buffer[self.index]
+                self.index += 1
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        """Consume the next character, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON stream.")
+        self.index += 1
+
+    def value(self):
+        """Decode and return the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.index)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self.buffer) and self._fill():
+                continue
+
+            self.index = end
+            return value
+
+    def skip(self):
+        """Consume the next JSON value, holding only one of its items at a time."""
+        char = self.peek()
+        if char == "[":
+            for _ in self.items():
+                self.value()
+        elif char == "{":
+            for _ in self.members():
+                self.value()
+        else:
+            self.value()
+
+    def _separator(self, close):
+        """Consume the comma after an item and return True if another follows."""
+        if self.peek() == ",":
+            self.index += 1
+            return True
+        self.expect(close)
+        return False
+
+    def items(self):
+        """Walk an array, stopping before each item so it can be read.
+
+        Every item must be consumed by the caller before the next iteration.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.index += 1
+            return
+        while True:
+            yield
+            if not self._separator("]"):
+                return
+
+    def members(self):
+        """Walk an object, yielding each key with the stream before its value.
+
+        Every value must be consumed by the caller before the next iteration.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.index += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if not self._separator("}"):
+                return
+
+
+def _iter_lists(stream):
+    """Yield a board holding one list at a time from a board object."""
+    header = dict()
+    streamed = False
+    for key in stream.members():
+        if key == "lists" and "name" in header:
+            # Every list is imported under its own copy of the board, and a
+            # board without lists is imported on its own below.
+            for _ in stream.items():
+                yield Board.parse(dict(header, lists=[stream.value()]))
+                streamed = True
+        else:
+            header[key] = stream.value()
+
+    # Boards named after their lists are only complete at the end.
+    if not streamed or "lists" in header:
+        yield Board.parse(header)
+
+
+def iter_boards(fp, project, level="board"):
+    """Yield the boards of an import file as soon as each one is read.
+
+    Keys of the file other than boards are loaded into the project.
+
+    Args:
+        fp (file): The open JSON file.
+        project (Project): The project the file is being imported into.
+        level (str, optional): "board" to yield whole boards or "list" to
+            yield a board holding one list at a time. Defaults to "board".
+
+    Yields:
+        Board: A board with the next part of the file.
+    """
+    stream = JSONStream(fp)
+    for key in stream.members():
+        if key != "boards":
+            project.load_json({key: stream.value()})
+            continue
+
+        for _ in stream.items():
+            if level == "list" and stream.peek() == "{":
+                yield from _iter_lists(stream)
+            else:
+                yield Board.parse(stream.value())
@@ -5,12 +5,16 @@ https://docs.pytest.org/en/latest/writing_plugins.html#conftest-py-plugins
 
 # Standard Python Libraries
 import json
+import threading
 
 # Third-Party Libraries
 import pytest
 
 # Custom Libraries
 from models.models import Board, Card, List, Project
+from tools import statements
+from tools.db import execute_query, execute_read_query
+from tools.sqlite import SQLiteBackend
 
 """ Proeject Fixtures """
 
@@ -123,3 +127,99 @@ def template_json():
             }
         ],
     }
+
+
+""" Database Fixtures """
+
+
+@pytest.fixture
+def database():
+    """Return an in-memory SQLite backend."""
+    database = SQLiteBackend()
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def project(database):
+    """Return a project created in the database."""
+    project = Project(name="Project")
+    execute_query(database, statements.insert_project(project))
+    project.id = execute_read_query(
+        database, statements.select_project_id(project)
+    )[0][0]
+    return project
+
+
+@pytest.fixture
+def contents():
+    """Return a function reading the names in a database in the order of Planka."""
+
+    def read(database):
+        """Return the board, list, card, and task names, None where missing."""
+        return execute_read_query(
+            database,
+            "SELECT b.name, l.name, c.name, t.name FROM board b "
+            "JOIN list l ON l.board_id = b.id LEFT JOIN card c ON c.list_id = l.id "
+            "LEFT JOIN task t ON t.card_id = c.id "
+            "ORDER BY b.id, l.position, c.position, t.id",
+        )
+
+    return read
+
+
+@pytest.fixture
+def cards():
+    """Return a function reading the project and name of every card."""
+
+    def read(database):
+        """Return the project and card names, ordered by both."""
+        return execute_read_query(
+            database,
+            "SELECT p.name, c.name FROM project p JOIN board b ON b.project_id = p.id "
+            "JOIN card c ON c.board_id = b.id ORDER BY 1, 2",
+        )
+
+    return read
+
+
+class FilePool:
+    """A pool opening connections to a SQLite file in the calling thread.
+
+    Each connection waits for parties of them to be open before it is
+    handed out, and the pool counts the connections opened and the most
+    open at once.
+    """
+
+    def __init__(self, path, parties=1, timeout=5):
+        """Create a new pool whose connections wait for parties of them to open."""
+        self.path = path
+        self.barrier = threading.Barrier(parties, timeout=timeout)
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.active = 0
+        self.peak = 0
+
+    def getconn(self):
+        """Open a connection in the calling thread once parties are open."""
+        with self.lock:
+            self.opened += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            self.barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        return SQLiteBackend(self.path)
+
+    def putconn(self, connection, close=False):
+        """Close a connection."""
+        with self.lock:
+            self.active -= 1
+        connection.close()
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Return a pool of connections to a SQLite database file."""
+    return FilePool(str(tmp_path / "planka.db"))
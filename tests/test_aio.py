@@ -0,0 +1,204 @@
+#!/usr/bin/env pytest -vs
+"""Tests for running lookups over asynchronous connections."""
+
+# Standard Python Libraries
+import os
+
+# Third-Party Libraries
+from psycopg2.extensions import POLL_OK, POLL_READ
+import pytest
+
+# Custom Libraries
+from models.models import Board, List, Project
+from tools import aio, statements
+from tools.db import execute_query, execute_read_query
+from tools.engine import BatchImporter
+from tools.sqlite import SQLiteBackend
+
+
+class PollingConnection:
+    """An asynchronous connection that waits to be readable after each query."""
+
+    def __init__(self, **kwargs):
+        """Create a new connection with a pipe standing in for its socket."""
+        self.kwargs = kwargs
+        (self.read_fd, self.write_fd) = os.pipe()
+        self.busy = True
+        self.queries = []
+        self.closed = False
+
+    def fileno(self):
+        """Return the end of the pipe the loop watches."""
+        return self.read_fd
+
+    def poll(self):
+        """Ask to wait for a read once per operation, making the pipe readable."""
+        if self.busy:
+            self.busy = False
+            os.write(self.write_fd, b"x")
+            return POLL_READ
+        os.read(self.read_fd, 1)
+        return POLL_OK
+
+    def cursor(self):
+        """Return a cursor recording its queries on the connection."""
+        return PollingCursor(self)
+
+    def close(self):
+        """Close the connection and its pipe."""
+        self.closed = True
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+class PollingCursor:
+    """A cursor that returns the query it ran and its parameters as its row."""
+
+    def __init__(self, connection):
+        """Create a new cursor on a connection."""
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self.row = None
+
+    def execute(self, query, params=None):
+        """Record a query, leaving the connection busy until it is polled."""
+        self.connection.queries.append(query)
+        self.connection.busy = True
+        self.row = (query, params)
+        self.description = None if query.startswith("PREPARE") else [("row",)]
+
+    def fetchall(self):
+        """Return the query and its parameters."""
+        return [self.row]
+
+
+class RecordingExecutor:
+    """An executor running its queries on a backend and recording them."""
+
+    def __init__(self, database, size=2):
+        """Create a new executor over a backend."""
+        self.database = database
+        self.size = size
+        self.queries = []
+
+    def run(self, queries):
+        """Run and record queries."""
+        self.queries.extend(queries)
+        return [execute_read_query(self.database, query) for query in queries]
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Replace psycopg2.connect in the async layer, returning the connections."""
+    opened = []
+
+    def connect(async_, **kwargs):
+        opened.append(PollingConnection(**kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(aio.psycopg2, "connect", connect)
+    return opened
+
+
+class TestAsyncConnection:
+    """Test the AsyncConnection class."""
+
+    def test_prepares_once(self, connections):
+        """Test a statement is prepared on its first run and then executed."""
+        connection = aio.AsyncConnection(host="db")
+        executor = aio.AsyncExecutor(1, "planka", "user", "", "db", 5432)
+        query = statements.select_many(
+            Board, [Board(name="Board", project_id=7)]
+        )
+
+        executor._connections.append(connection)
+        (first, second) = executor.run([query, query])
+        executor.close()
+
+        assert connections[0].queries == [
+            query.statement.prepare(),
+            query.statement.execute(),
+            query.statement.execute(),
+        ]
+        assert first == [(query.statement.execute(), query.params)]
+        assert second == first
+        assert connections[0].closed
+
+
+class TestAsyncExecutor:
+    """Test the AsyncExecutor class."""
+
+    def test_results_in_order(self, connections):
+        """Test queries share at most size connections and keep their order."""
+        executor = aio.AsyncExecutor(2, "planka", "user", "", "db", 5432)
+        results = executor.run([f"SELECT {index}" for index in range(5)])
+
+        assert [rows[0][0] for rows in results] == [
+            f"SELECT {index}" for index in range(5)
+        ]
+        assert len(connections) == 2
+        assert sorted(len(c.queries) for c in connections) == [2, 3]
+        assert connections[0].kwargs["database"] == "planka"
+
+        executor.close()
+        assert all(connection.closed for connection in connections)
+
+    def test_no_queries(self, connections):
+        """Test an empty batch opens no connections."""
+        executor = aio.AsyncExecutor(2, "planka", "user", "", "db", 5432)
+
+        assert executor.run([]) == []
+        assert connections == []
+        executor.close()
+
+
+class TestChangedLookups:
+    """Test which lookups the importer hands to an executor."""
+
+    def test_changed_parents_stay_on_connection(self):
+        """Test lookups under parents the import added to skip the executor."""
+        database = SQLiteBackend()
+        execute_query(database, statements.insert_project(Project(name="Project")))
+        project = Project(name="Project")
+        project.id = execute_read_query(
+            database, statements.select_project_id(project)
+        )[0][0]
+        BatchImporter(database).run(
+            project, [Board(name="Old", lists=[List(name="To Do", cards=[])])]
+        )
+
+        executor = RecordingExecutor(database)
+        importer = BatchImporter(database, executor=executor)
+        importer.run(
+            project,
+            [
+                Board(name="Old", lists=[List(name="To Do", cards=[])]),
+                Board(name="New", lists=[List(name="To Do", cards=[])]),
+            ],
+        )
+
+        # Both boards are read by the executor, as is the list of the board
+        # that already existed, while the new board's list is only inserted.
+        assert [query.statement.name for query in executor.queries] == [
+            "planka_select_boards",
+            "planka_select_lists",
+        ]
+        assert [query.values[1] for query in executor.queries] == [
+            ["Old", "New"],
+            ["To Do"],
+        ]
+
+        # A second lookup under a board the import has added to is run on
+        # the importer's own connection, which sees the uncommitted rows.
+        executor.queries.clear()
+        importer.add_lists(
+            [
+                Board(
+                    id=importer.ids[Board][(project.id, "New")][0],
+                    lists=[List(name="Done")],
+                )
+            ]
+        )
+        assert executor.queries == []
+        database.close()
@@ -0,0 +1,199 @@
+#!/usr/bin/env pytest -vs
+"""Tests for importing many files in one process."""
+
+# Standard Python Libraries
+import io
+import json
+import sqlite3
+
+# Custom Libraries
+from tools import batch
+from tools.batch import BatchRunner, read_manifest, report
+from tools.cache import IdCache
+from tools.hashes import HashStore
+from tools.db import execute_read_query
+from tools.sqlite import SQLiteBackend
+
+
+class BackendPool:
+    """A pool handing out one backend."""
+
+    def __init__(self, backend):
+        """Create a new pool of a backend."""
+        self.backend = backend
+
+    def getconn(self):
+        """Return the backend."""
+        return self.backend
+
+    def putconn(self, connection):
+        """Take a connection back."""
+
+
+def _write(path, cards):
+    """Write a project JSON file with a board and list holding cards."""
+    path.write_text(
+        json.dumps(
+            {
+                "boards": [
+                    {
+                        "name": "Board",
+                        "lists": [
+                            {"name": "List", "cards": [{"name": card} for card in cards]}
+                        ],
+                    }
+                ]
+            }
+        )
+    )
+    return str(path)
+
+
+class TestManifest:
+    """Test reading the files of a batch."""
+
+    def test_directory(self, tmp_path):
+        """Test each JSON file of a directory is imported into its own project."""
+        for name in ("b.json", "a.json", "notes.txt"):
+            (tmp_path / name).write_text("{}")
+
+        assert read_manifest(str(tmp_path)) == [
+            ("a", str(tmp_path / "a.json")),
+            ("b", str(tmp_path / "b.json")),
+        ]
+
+    def test_manifest(self, tmp_path):
+        """Test manifest rows are read relative to the manifest."""
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text("# project,file\nAlpha, a.json\n\nBeta,sub/b.json\n")
+
+        assert read_manifest(str(manifest)) == [
+            ("Alpha", str(tmp_path / "a.json")),
+            ("Beta", str(tmp_path / "sub" / "b.json")),
+        ]
+
+
+class TestBatchRunner:
+    """Test importing the files of a batch."""
+
+    def test_new_projects(self, database, tmp_path, cards):
+        """Test projects are created once and later files are loaded into them."""
+        entries = [
+            ("Alpha", _write(tmp_path / "a1.json", ["Card 1"])),
+            ("Beta", _write(tmp_path / "b.json", ["Card 3"])),
+            ("Alpha", _write(tmp_path / "a2.json", ["Card 1", "Card 2"])),
+        ]
+        results = BatchRunner(BackendPool(database), new=True).run(entries)
+
+        assert [result.status for result in results] == ["imported"] * 3
+        assert cards(database) == [
+            ("Alpha", "Card 1"),
+            ("Alpha", "Card 2"),
+            ("Beta", "Card 3"),
+        ]
+        assert execute_read_query(
+            database, "SELECT COUNT(*) FROM project_membership"
+        ) == [(2,)]
+
+    def test_failures_do_not_stop_batch(self, database, tmp_path, cards):
+        """Test a failing file is rolled back and the next file is imported."""
+        bad = tmp_path / "bad.json"
+        bad.write_text('{"boards": [')
+        entries = [
+            ("Alpha", str(bad)),
+            ("Beta", _write(tmp_path / "b.json", ["Card"])),
+            ("Gamma", _write(tmp_path / "c.json", ["Card"])),
+        ]
+        results = BatchRunner(BackendPool(database), new=False).run(entries)
+        output = io.StringIO()
+        report(results, output)
+
+        assert [result.status for result in results] == ["failed"] * 3
+        assert "does not exist" in results[1].error
+        assert output.getvalue().splitlines()[-1] == "0 of 3 files imported."
+
+        results = BatchRunner(BackendPool(database), new=True).run(entries)
+
+        assert [result.status for result in results] == [
+            "failed",
+            "imported",
+            "imported",
+        ]
+        assert cards(database) == [("Beta", "Card"), ("Gamma", "Card")]
+
+    def test_jobs_share_cache(self, tmp_path, monkeypatch, pool, cards):
+        """Test projects imported at the same time share one cache file."""
+        opened = []
+
+        class CountingCache(IdCache):
+            def __init__(self, *args):
+                super().__init__(*args)
+                opened.append(self)
+
+        monkeypatch.setattr(batch, "IdCache", CountingCache)
+        cache = str(tmp_path / "cache.db")
+        names = ["Alpha", "Beta", "Gamma", "Delta"]
+
+        entries = [
+            (name, _write(tmp_path / f"{name}1.json", ["Card 1"])) for name in names
+        ]
+        runner = BatchRunner(pool, new=True, cache=cache, database="test")
+        assert [result.status for result in runner.run(entries, jobs=4)] == [
+            "imported"
+        ] * 4
+
+        entries = [
+            (name, _write(tmp_path / f"{name}2.json", ["Card 1", "Card 2"]))
+            for name in names
+        ]
+        runner = BatchRunner(pool, cache=cache, database="test")
+        assert [result.status for result in runner.run(entries, jobs=4)] == [
+            "imported"
+        ] * 4
+
+        assert len(opened) == 2
+        database = SQLiteBackend(pool.path)
+        assert cards(database) == [
+            (name, card) for name in sorted(names) for card in ("Card 1", "Card 2")
+        ]
+        database.close()
+        with sqlite3.connect(cache) as connection:
+            assert connection.execute(
+                "SELECT COUNT(DISTINCT project_id), COUNT(*) FROM object "
+                "WHERE kind = 'card'"
+            ).fetchall() == [(4, 8)]
+
+    def test_jobs_share_hashes(self, tmp_path, monkeypatch, pool, cards):
+        """Test projects imported at the same time share one hash file."""
+        opened = []
+
+        class CountingStore(HashStore):
+            def __init__(self, *args):
+                """Record the store being opened."""
+                super().__init__(*args)
+                opened.append(self)
+
+        monkeypatch.setattr(batch, "HashStore", CountingStore)
+        hashes = str(tmp_path / "hashes.db")
+        names = ["Alpha", "Beta", "Gamma", "Delta"]
+        entries = [
+            (name, _write(tmp_path / f"{name}.json", ["Card 1", "Card 2"]))
+            for name in names
+        ]
+
+        for new in (True, False):
+            runner = BatchRunner(pool, new=new, hashes=hashes, database="test")
+            assert [result.status for result in runner.run(entries, jobs=2)] == [
+                "imported"
+            ] * 4
+
+        assert len(opened) == 2
+        database = SQLiteBackend(pool.path)
+        assert cards(database) == [
+            (name, card) for name in sorted(names) for card in ("Card 1", "Card 2")
+        ]
+        database.close()
+        with sqlite3.connect(hashes) as connection:
+            assert connection.execute(
+                "SELECT COUNT(DISTINCT project_id), COUNT(*) FROM subtree"
+            ).fetchall() == [(4, 16)]
@@ -0,0 +1,57 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the COPY bulk loader."""
+
+# Custom Libraries
+from models.models import Card, CardBatch, List
+from tools.bulk import CopyStream, _card_rows, _task_rows
+
+
+class TestCopyStream:
+    """Test the COPY text stream."""
+
+    def test_read_all(self):
+        """Test rows are written as tab separated lines."""
+        stream = CopyStream([(1, 2, "Card"), (3, None, "Task")])
+        assert stream.read() == "1\t2\tCard\n3\t\\N\tTask\n"
+
+    def test_read_size(self):
+        """Test reads return at most size characters and keep the rest."""
+        stream = CopyStream([(1, "Card 1"), (2, "Card 2")])
+        assert stream.read(4) == "1\tCa"
+        assert stream.read(100) == "rd 1\n2\tCard 2\n"
+        assert stream.read(100) == ""
+
+    def test_escaping(self):
+        """Test special characters are escaped."""
+        stream = CopyStream([("a\tb\nc\\d",)])
+        assert stream.read() == "a\\tb\\nc\\\\d\n"
+
+
+class TestRows:
+    """Test the staging rows built from a CardBatch."""
+
+    def test_rows(self):
+        """Test a CardBatch stages its cards under their lists, in order."""
+        lists = [
+            List(
+                id=2,
+                board_id=1,
+                cards=[
+                    Card(name="Card 1", tasks=["Task 1", "Task 2"]),
+                    Card(name="Card 2", tasks=["Task 3"]),
+                ],
+            ),
+            List(id=3, board_id=1, cards=[Card(name="Card 3")]),
+        ]
+        batch = CardBatch.from_lists(lists)
+
+        assert list(_card_rows(batch)) == [
+            (0, 1, 2, "Card 1"),
+            (1, 1, 2, "Card 2"),
+            (2, 1, 3, "Card 3"),
+        ]
+        assert list(_task_rows(batch)) == [
+            (0, 2, "Card 1", "Task 1"),
+            (1, 2, "Card 1", "Task 2"),
+            (2, 2, "Card 2", "Task 3"),
+        ]
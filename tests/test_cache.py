@@ -0,0 +1,141 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the on-disk id cache."""
+
+# Custom Libraries
+from models.models import Board, Card, List
+from tools.cache import IdCache
+from tools.engine import BatchImporter
+from tools.positions import POSITION_GAP
+
+
+class ScriptedConnection:
+    """A connection whose queries return the next of a list of results."""
+
+    def __init__(self, results):
+        """Create a new connection returning results in order."""
+        self.results = list(results)
+        self.queries = []
+        self.executed = []
+        self.description = True
+        self.rowcount = 0
+
+    @property
+    def connection(self):
+        """Return the connection the cursor belongs to."""
+        return self
+
+    def cursor(self):
+        """Return the connection as its own cursor."""
+        return self
+
+    def execute(self, query, params=None):
+        """Record a query, and the prepared statements executed with their parameters."""
+        self.queries.append(query)
+        if query.startswith("EXECUTE"):
+            self.executed.append((query.split()[1], params))
+
+    def fetchall(self):
+        """Return the next result."""
+        return self.results.pop(0)
+
+    def commit(self):
+        """Do nothing."""
+
+
+FINGERPRINT = [("board", 1, 0, None), ("list", 2, 0, None), ("card", 3, 0, None)]
+BOARDS = [(1, 7, "Board", 0, None)]
+LISTS = [(2, 1, "List", 0, None)]
+CARDS = [(3, 2, "Card", 65535, "2022-01-01 00:00:00")]
+
+
+class TestIdCache:
+    """Test refreshing and seeding from the IdCache class."""
+
+    def refreshed(self, tmp_path):
+        """Return a cache filled with one board, list, and card."""
+        cache = IdCache(str(tmp_path / "cache.db"), "test")
+        cache.refresh(ScriptedConnection([FINGERPRINT, BOARDS, LISTS, CARDS]), 7)
+        return cache
+
+    def test_unchanged_cache_is_one_query(self, tmp_path):
+        """Test an up to date cache is validated with a single query."""
+        cache = self.refreshed(tmp_path)
+        connection = ScriptedConnection(
+            [
+                [
+                    ("board", 1, 1, None),
+                    ("list", 2, 1, None),
+                    ("card", 3, 1, "2022-01-01 00:00:00"),
+                ]
+            ]
+        )
+        cache.refresh(connection, 7)
+
+        assert connection.executed == [("planka_cache_fingerprint", (7, 1, 2, 3))]
+
+    def test_new_rows_fetched_incrementally(self, tmp_path):
+        """Test only rows with a higher id are read for a grown table."""
+        cache = self.refreshed(tmp_path)
+        connection = ScriptedConnection(
+            [
+                [
+                    ("board", 1, 1, None),
+                    ("list", 2, 1, None),
+                    ("card", 4, 1, "2022-01-01 00:00:00"),
+                ],
+                [(4, 2, "Card 2", 131070, None)],
+            ]
+        )
+        cache.refresh(connection, 7)
+
+        assert connection.executed[1:] == [("planka_cache_cards", (7, 3))]
+
+    def test_changed_rows_reloaded(self, tmp_path):
+        """Test a table whose cached rows were updated is read again in full."""
+        cache = self.refreshed(tmp_path)
+        connection = ScriptedConnection(
+            [
+                [
+                    ("board", 1, 1, None),
+                    ("list", 2, 1, None),
+                    ("card", 3, 1, "2022-02-01 00:00:00"),
+                ],
+                [(3, 2, "Renamed", 65535, "2022-02-01 00:00:00")],
+            ]
+        )
+        cache.refresh(connection, 7)
+        importer = BatchImporter(None)
+        cache.seed(importer, 7)
+
+        assert connection.executed[1] == ("planka_cache_cards", (7, 0))
+        assert importer.ids[Card] == {(1, 2, "Renamed"): (3, 65535)}
+
+    def test_seed(self, tmp_path):
+        """Test an importer is seeded with ids and positions."""
+        importer = BatchImporter(None)
+        self.refreshed(tmp_path).seed(importer, 7)
+
+        assert importer.ids[Board] == {(7, "Board"): (1, 0)}
+        assert importer.ids[List] == {(1, "List"): (2, 0)}
+        assert importer.ids[Card] == {(1, 2, "Card"): (3, 65535)}
+        assert importer.complete == {Board, List, Card}
+        assert importer.positions.next(Card, 2) == 2 * POSITION_GAP
+        assert importer.positions.next(List, 1) == POSITION_GAP
+
+    def test_seeded_importer_skips_lookups(self, tmp_path):
+        """Test a seeded importer creates missing objects without lookups."""
+        importer = BatchImporter(ScriptedConnection([[(4, 7, "New Board")]]))
+        self.refreshed(tmp_path).seed(importer, 7)
+        boards = [
+            Board(name="Board", project_id=7),
+            Board(name="New Board", project_id=7),
+        ]
+        importer._resolve(Board, boards)
+
+        assert [board.id for board in boards] == [1, 4]
+        assert boards[1].position == POSITION_GAP
+        assert [
+            query
+            for query in importer.connection.queries
+            if query.startswith("EXECUTE")
+        ] == ["EXECUTE planka_insert_boards (%s, %s, %s)"]
@@ -0,0 +1,164 @@
+#!/usr/bin/env pytest -vs
+"""Tests for converting Trello exports and CSV files into boards."""
+
+# Standard Python Libraries
+import io
+import json
+
+# Third-Party Libraries
+import pytest
+
+# Custom Libraries
+from tools.convert import iter_csv, iter_trello
+from tools.planka_import import build_new, load_cards
+
+TRELLO = {
+    "id": "b1",
+    "name": "Roadmap",
+    "actions": [
+        {"type": "createCard", "data": {"card": {"name": f"Card {n}", "pos": n}}}
+        for n in range(50)
+    ],
+    "cards": [
+        {"id": "c1", "name": "Card 1", "idList": "l2", "closed": False},
+        {"id": "c2", "name": "Card 2", "idList": "l1", "closed": False},
+        {"id": "c3", "name": "Archived", "idList": "l1", "closed": True},
+        {"id": "c4", "name": "Card 4", "idList": "l3", "closed": False},
+        {"id": "c5", "name": "Card 5", "idList": "l2", "closed": False},
+    ],
+    "labels": [],
+    "lists": [
+        {"id": "l1", "name": "Doing", "closed": False, "pos": 2},
+        {"id": "l2", "name": "To Do", "closed": False, "pos": 1},
+        {"id": "l3", "name": "Old", "closed": True, "pos": 3},
+        {"id": "l4", "name": "Done", "closed": False, "pos": 4},
+    ],
+    "checklists": [
+        {
+            "id": "k1",
+            "idCard": "c1",
+            "checkItems": [
+                {"name": "Second", "pos": 2, "state": "incomplete"},
+                {"name": "First", "pos": 1, "state": "complete"},
+            ],
+        },
+        {"id": "k2", "idCard": "c1", "checkItems": [{"name": "Third", "pos": 1}]},
+    ],
+}
+
+CSV = """Board,List,Card,Task
+Roadmap,To Do,Card 1,First
+Roadmap,To Do,Card 1,Second
+Roadmap,Doing,Card 2,
+Roadmap,Done,,
+Backlog,Ideas,Card 3,Sketch
+"""
+
+
+def _names(parts):
+    """Return each part as boards of lists of (card, tasks) pairs, by name."""
+    return [
+        [
+            (
+                board.name,
+                [
+                    (_list.name, [(card.name, card.tasks) for card in _list.cards])
+                    for _list in board.lists
+                ],
+            )
+            for board in boards
+        ]
+        for boards in parts
+    ]
+
+
+class TestTrello:
+    """Test reading Trello board exports."""
+
+    def test_batches(self):
+        """Test open lists and cards are read in batches with their checklists."""
+        parts = list(iter_trello(io.StringIO(json.dumps(TRELLO)), batch_size=2))
+
+        assert _names(parts) == [
+            [
+                (
+                    "Roadmap",
+                    [
+                        ("To Do", [("Card 1", ["First", "Second", "Third"])]),
+                        ("Doing", [("Card 2", [])]),
+                        ("Done", []),
+                    ],
+                )
+            ],
+            [("Roadmap", [("To Do", [("Card 5", [])])])],
+        ]
+
+    def test_missing_name(self):
+        """Test an export without a board name is rejected."""
+        trello = {key: value for key, value in TRELLO.items() if key != "name"}
+
+        with pytest.raises(ValueError, match="no board name"):
+            list(iter_trello(io.StringIO(json.dumps(trello))))
+
+    def test_import(self, database, project, tmp_path, contents):
+        """Test an export is imported once however often it is loaded."""
+        path = tmp_path / "trello.json"
+        path.write_text(json.dumps(TRELLO))
+
+        build_new(database, project, str(path), file_format="trello")
+        first = contents(database)
+        load_cards(database, project, str(path), file_format="trello")
+
+        assert contents(database) == first
+        assert first == [
+            ("Roadmap", "To Do", "Card 1", "First"),
+            ("Roadmap", "To Do", "Card 1", "Second"),
+            ("Roadmap", "To Do", "Card 1", "Third"),
+            ("Roadmap", "To Do", "Card 5", None),
+            ("Roadmap", "Doing", "Card 2", None),
+            ("Roadmap", "Done", None, None),
+        ]
+
+
+class TestCSV:
+    """Test reading CSV rows."""
+
+    def test_batches(self):
+        """Test rows are grouped into cards, lists, and boards in batches."""
+        parts = list(iter_csv(io.StringIO(CSV), batch_size=2))
+
+        assert _names(parts) == [
+            [
+                (
+                    "Roadmap",
+                    [
+                        ("To Do", [("Card 1", ["First", "Second"])]),
+                        ("Doing", [("Card 2", [])]),
+                    ],
+                )
+            ],
+            [
+                ("Roadmap", [("Done", [])]),
+                ("Backlog", [("Ideas", [("Card 3", ["Sketch"])])]),
+            ],
+        ]
+
+    def test_missing_column(self):
+        """Test a header without a list column is rejected."""
+        with pytest.raises(ValueError, match="no list column"):
+            list(iter_csv(io.StringIO("board,card\nRoadmap,Card\n")))
+
+    def test_import(self, database, project, tmp_path, contents):
+        """Test CSV rows are imported into boards, lists, cards, and tasks."""
+        path = tmp_path / "backlog.csv"
+        path.write_text(CSV)
+
+        build_new(database, project, str(path), file_format="csv")
+
+        assert contents(database) == [
+            ("Roadmap", "To Do", "Card 1", "First"),
+            ("Roadmap", "To Do", "Card 1", "Second"),
+            ("Roadmap", "Doing", "Card 2", None),
+            ("Roadmap", "Done", None, None),
+            ("Backlog", "Ideas", "Card 3", "Sketch"),
+        ]
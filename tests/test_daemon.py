@@ -0,0 +1,179 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the import daemon and its client."""
+
+# Standard Python Libraries
+import json
+import os
+import stat
+import threading
+
+# Third-Party Libraries
+import pytest
+
+# Custom Libraries
+from tools.client import submit
+from tools.daemon import ImportServer
+from tools.sqlite import SQLiteBackend
+
+
+def _project(cards):
+    """Return the JSON of a project with a board and list holding cards."""
+    return json.dumps(
+        {
+            "boards": [
+                {
+                    "name": "Board",
+                    "lists": [
+                        {"name": "List", "cards": [{"name": card} for card in cards]}
+                    ],
+                }
+            ]
+        }
+    )
+
+
+@pytest.fixture
+def server(tmp_path, pool):
+    """Serve imports into a SQLite database file from a thread."""
+    server = ImportServer(str(tmp_path / "daemon.sock"), pool, jobs=2, cache=None)
+
+    def serve():
+        """Serve until shut down, closing the connection in the same thread."""
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def _cards(pool, cards):
+    """Return the project and name of every card imported into the database."""
+    database = SQLiteBackend(pool.path)
+    try:
+        return cards(database)
+    finally:
+        database.close()
+
+
+class TestImportServer:
+    """Test importing through the daemon."""
+
+    def test_jobs(self, server, pool, tmp_path, cards):
+        """Test a file and sent data are imported over one connection."""
+        file_name = tmp_path / "a.json"
+        file_name.write_text(_project(["Card 1"]))
+
+        results = submit(
+            [
+                {"project": "Alpha", "file": str(file_name), "new": True},
+                {"project": "Alpha", "data": _project(["Card 1", "Card 2"])},
+            ],
+            server.server_address,
+        )
+
+        assert [result["status"] for result in results] == ["imported"] * 2
+        assert server.projects == {"Alpha": 1}
+        assert _cards(pool, cards) == [("Alpha", "Card 1"), ("Alpha", "Card 2")]
+
+    def test_failures(self, server, pool, cards):
+        """Test failed jobs are answered and the daemon keeps serving."""
+        results = submit(
+            [
+                {"project": "Alpha", "data": _project(["Card"])},
+                {"project": "Beta", "data": '{"boards": [', "new": True},
+                {"project": "Gamma", "data": _project(["Card"]), "new": True},
+            ],
+            server.server_address,
+        )
+
+        assert [result["status"] for result in results] == [
+            "failed",
+            "failed",
+            "imported",
+        ]
+        assert "does not exist" in results[0]["error"]
+        assert "Beta" not in server.projects
+        assert _cards(pool, cards) == [("Gamma", "Card")]
+
+    def test_socket_private(self, server):
+        """Test the socket is created readable and writable by its owner only."""
+        mode = stat.S_IMODE(os.stat(server.server_address).st_mode)
+
+        assert mode == 0o600
+
+    def test_stale_project_id(self, server, pool, cards):
+        """Test a project created again in Planka is found after an insert fails."""
+        submit(
+            [{"project": "Alpha", "data": _project(["Card 1"]), "new": True}],
+            server.server_address,
+        )
+        database = SQLiteBackend(pool.path)
+        try:
+            # Stand in for a foreign key, which Planka's schema may carry.
+            database.connection.executescript(
+                """
+                CREATE TRIGGER board_project BEFORE INSERT ON board
+                WHEN NOT EXISTS (SELECT 1 FROM project WHERE id = NEW.project_id)
+                BEGIN SELECT RAISE(ABORT, 'no such project'); END;
+                DELETE FROM card; DELETE FROM list; DELETE FROM board;
+                DELETE FROM project;
+                INSERT INTO project (id, name) VALUES (2, 'Alpha');
+                """
+            )
+        finally:
+            database.close()
+
+        (result,) = submit(
+            [{"project": "Alpha", "data": _project(["Card 2"])}],
+            server.server_address,
+        )
+
+        assert result["status"] == "imported"
+        assert server.projects == {"Alpha": 2}
+        assert _cards(pool, cards) == [("Alpha", "Card 2")]
+
+    @pytest.mark.parametrize(
+        "projects,peak", [(["Alpha", "Beta"], 2), (["Alpha", "Alpha"], 1)]
+    )
+    def test_parallel_projects(
+        self, server, pool, cards, projects, peak
+    ):
+        """Test jobs into different projects run at once, and into one do not."""
+        submit(
+            [
+                {"project": name, "data": _project([]), "new": True}
+                for name in ("Alpha", "Beta")
+            ],
+            server.server_address,
+        )
+        pool.barrier = threading.Barrier(2, timeout=0.5 if peak == 1 else 5)
+        pool.peak = 0
+
+        results = [None] * len(projects)
+
+        def send(index, name):
+            """Submit a job adding a card to a project."""
+            results[index] = submit(
+                [{"project": name, "data": _project([f"Card {index}"])}],
+                server.server_address,
+            )[0]
+
+        threads = [
+            threading.Thread(target=send, args=(index, name))
+            for index, name in enumerate(projects)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [result["status"] for result in results] == ["imported"] * 2
+        assert pool.peak == peak
+        assert sorted(_cards(pool, cards)) == sorted(
+            (name, f"Card {index}") for index, name in enumerate(projects)
+        )
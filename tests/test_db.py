@@ -0,0 +1,180 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the database helpers."""
+
+# Standard Python Libraries
+import json
+import sqlite3
+import sys
+
+# Third-Party Libraries
+import psycopg2
+from psycopg2.errors import UndefinedTable
+import pytest
+
+# Custom Libraries
+from models.models import Board, Project
+from tools import planka_import, statements
+from tools.db import Transaction, execute_query, execute_read_query
+from tools.engine import BatchImporter
+from tools.planka_import import build_new
+from tools.sqlite import SQLiteBackend
+
+
+class RecordingConnection:
+    """A connection that records commits and rollbacks."""
+
+    def __init__(self):
+        """Create a new recording connection."""
+        self.calls = []
+
+    def commit(self):
+        """Record a commit."""
+        self.calls.append("commit")
+
+    def rollback(self):
+        """Record a rollback."""
+        self.calls.append("rollback")
+
+
+class FailingConnection(RecordingConnection):
+    """A psycopg2 connection on which every query fails for a missing table."""
+
+    def cursor(self):
+        """Return a cursor whose queries fail."""
+        return FailingCursor(self)
+
+    def close(self):
+        """Record the connection was closed."""
+        self.calls.append("close")
+
+
+class FailingCursor:
+    """A cursor raising UndefinedTable, a ProgrammingError, for every query."""
+
+    def __init__(self, connection):
+        """Create a new cursor on a connection."""
+        self.connection = connection
+
+    def execute(self, query, params=None):
+        """Fail as though the table queried was missing."""
+        raise UndefinedTable('relation "board" does not exist')
+
+
+def _write_project(path):
+    """Write a project JSON file with a board holding a card with a task."""
+    path.write_text(
+        json.dumps(
+            {
+                "boards": [
+                    {
+                        "name": "Board",
+                        "lists": [
+                            {
+                                "name": "List",
+                                "cards": [{"name": "Card", "tasks": ["Task"]}],
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+    )
+    return str(path)
+
+
+class TestTransaction:
+    """Test the Transaction wrapper."""
+
+    def test_single_commit(self):
+        """Test every statement is committed once at the end."""
+        connection = RecordingConnection()
+        with Transaction(connection) as transaction:
+            for _ in range(5):
+                transaction.commit()
+            assert connection.calls == []
+
+        assert connection.calls == ["commit"]
+        assert transaction.statements == 5
+
+    def test_commit_every(self):
+        """Test statements are committed in batches."""
+        connection = RecordingConnection()
+        with Transaction(connection, commit_every=2) as transaction:
+            for _ in range(5):
+                transaction.commit()
+
+        assert connection.calls == ["commit", "commit", "commit"]
+        assert transaction.commits == 3
+
+    def test_rollback_on_error(self):
+        """Test an error rolls back the uncommitted statements."""
+        connection = RecordingConnection()
+        with pytest.raises(ValueError):
+            with Transaction(connection) as transaction:
+                transaction.commit()
+                raise ValueError("failed")
+
+        assert connection.calls == ["rollback"]
+
+    def test_delegates_to_connection(self):
+        """Test unknown attributes are read from the connection."""
+        connection = RecordingConnection()
+        assert Transaction(connection).calls is connection.calls
+
+    def test_failed_statement_rolls_back(self, tmp_path):
+        """Test a statement failing midway rolls back the whole import."""
+        database = SQLiteBackend()
+        project = Project(name="Project")
+        execute_query(database, statements.insert_project(project))
+        project.id = execute_read_query(
+            database, statements.select_project_id(project)
+        )[0][0]
+        database.connection.execute("DROP TABLE task")
+        database.commit()
+
+        path = _write_project(tmp_path / "project.json")
+        with pytest.raises(sqlite3.OperationalError, match="no such table: task"):
+            with Transaction(database) as transaction:
+                build_new(transaction, project, path)
+
+        for table in ("board", "list", "card"):
+            assert execute_read_query(database, f"SELECT * FROM {table}") == []
+        database.close()
+
+    def test_failure_logged_outside_transaction(self):
+        """Test a failed statement is only logged outside a transaction."""
+        database = SQLiteBackend()
+
+        assert execute_query(database, "DELETE FROM missing") is None
+        database.close()
+
+    def test_programming_error_rolls_back(self, tmp_path):
+        """Test a Postgres error other than OperationalError rolls back too."""
+        connection = FailingConnection()
+        path = _write_project(tmp_path / "project.json")
+        with pytest.raises(psycopg2.ProgrammingError, match="does not exist"):
+            with Transaction(connection) as transaction:
+                build_new(transaction, Project(id=1, name="Project"), path)
+
+        assert connection.calls == ["rollback"]
+
+    def test_failed_insert_outside_transaction(self):
+        """Test a failed insert outside a transaction stops the importer."""
+        importer = BatchImporter(FailingConnection())
+
+        with pytest.raises(ValueError, match="Adding 1 Boards failed."):
+            importer.add_boards([Board(name="Board", project_id=1)])
+
+    def test_main_exits_on_error(self, tmp_path, monkeypatch):
+        """Test the import exits with 1 when a query fails."""
+        connection = FailingConnection()
+        path = _write_project(tmp_path / "project.json")
+        monkeypatch.setattr(
+            planka_import, "create_connection", lambda *args: connection
+        )
+        monkeypatch.setattr(sys, "argv", ["planka-import", "Project", path, "--load"])
+        # The rest of the tests run with the garbage collector main turns off.
+        monkeypatch.setattr(planka_import.gc, "disable", lambda: None)
+
+        assert planka_import.main() == 1
+        assert connection.calls == ["rollback", "close"]
@@ -0,0 +1,87 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the streamed project export."""
+
+# Standard Python Libraries
+import io
+import json
+
+# Custom Libraries
+from models.models import Project
+from tools.export import build_boards, write_project
+
+ROWS = [
+    (1, "Board 1", 0, 1, "List 1", 0, 1, "Card 1", 0, "Task 1"),
+    (1, "Board 1", 0, 1, "List 1", 0, 1, "Card 1", 0, "Task 2"),
+    (1, "Board 1", 0, 1, "List 1", 0, 2, "Card 2", 65535, None),
+    (1, "Board 1", 0, 2, "List 2", 65535, None, None, None, None),
+    (2, "Board 2", 65535, None, None, None, None, None, None, None),
+]
+
+
+class TestExport:
+    """Test turning the joined project rows into boards and JSON."""
+
+    def test_build_boards(self):
+        """Test the rows are grouped into boards, lists, cards, and tasks."""
+        boards = list(build_boards(iter(ROWS)))
+
+        assert [board.name for board in boards] == ["Board 1", "Board 2"]
+        assert [_list.name for _list in boards[0].lists] == ["List 1", "List 2"]
+        assert boards[1].lists == []
+        cards = boards[0].lists[0].cards
+        assert [(card.name, card.tasks) for card in cards] == [
+            ("Card 1", ["Task 1", "Task 2"]),
+            ("Card 2", []),
+        ]
+        assert boards[0].lists[1].cards == []
+        assert cards[1].list_id == 1 and cards[1].position == 65535
+
+    def test_write_project(self):
+        """Test the JSON written matches the import file format."""
+        fp = io.StringIO()
+        write_project(iter(ROWS), fp, Project(name="Test Project"))
+        data = json.loads(fp.getvalue())
+
+        assert data["name"] == "Test Project"
+        assert [board["name"] for board in data["boards"]] == ["Board 1", "Board 2"]
+        assert data["boards"][0]["lists"][0]["cards"][0] == {
+            "id": 1,
+            "name": "Card 1",
+            "position": 0,
+            "tasks": ["Task 1", "Task 2"],
+        }
+        assert data["boards"][0]["lists"][1]["cards"] == []
+        assert data["boards"][1]["lists"] == []
+
+    def test_write_empty_project(self):
+        """Test a project without boards is written as valid JSON."""
+        fp = io.StringIO()
+        write_project(iter([]), fp, Project(name="Empty"))
+
+        assert json.loads(fp.getvalue()) == {"name": "Empty", "boards": []}
+
+    def test_write_matches_build(self):
+        """Test the written JSON parses back into the same boards."""
+        fp = io.StringIO()
+        write_project(iter(ROWS), fp, Project(name="Test Project"))
+        project = Project(name="Test Project")
+        project.load_json(json.loads(fp.getvalue()))
+
+        def shape(boards):
+            return [
+                (
+                    board.id,
+                    board.name,
+                    [
+                        (
+                            _list.id,
+                            _list.name,
+                            [(card.id, card.name, card.tasks) for card in _list.cards],
+                        )
+                        for _list in board.lists
+                    ],
+                )
+                for board in boards
+            ]
+
+        assert shape(project.boards) == shape(build_boards(iter(ROWS)))
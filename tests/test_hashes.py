@@ -0,0 +1,126 @@
+#!/usr/bin/env pytest -vs
+"""Tests for skipping unchanged subtrees."""
+
+# Standard Python Libraries
+import json
+
+# Custom Libraries
+from models.models import Board, Card, List
+from tools import stats
+from tools.db import execute_read_query
+from tools.hashes import HashStore, ProjectHashes
+from tools.planka_import import build_new, load_cards
+
+PROJECT = {
+    "boards": [
+        {
+            "name": "Board",
+            "lists": [
+                {
+                    "name": f"List {_list}",
+                    "cards": [
+                        {"name": f"Card {card}", "tasks": ["Task 1", "Task 2"]}
+                        for card in range(3)
+                    ],
+                }
+                for _list in range(2)
+            ],
+        }
+    ]
+}
+
+
+def _write(tmp_path, content):
+    """Write a project JSON file and return its name."""
+    path = tmp_path / "project.json"
+    path.write_text(json.dumps(content))
+    return str(path)
+
+
+def _tasks(database):
+    """Return every task in the database with its list and card."""
+    return execute_read_query(
+        database,
+        "SELECT l.name, c.name, t.name FROM list l "
+        "JOIN card c ON c.list_id = l.id JOIN task t ON t.card_id = c.id "
+        "ORDER BY 1, 2, 3",
+    )
+
+
+def _load(database, project, file_name, path, function=load_cards):
+    """Import a file with a hash store and return the queries it ran."""
+    hashes = HashStore(path, "test")
+    query_stats = stats.enable()
+    try:
+        function(database, project, file_name, hashes=hashes)
+    finally:
+        stats.disable()
+        hashes.close()
+    return query_stats.as_dict()
+
+
+class TestPrune:
+    """Test finding the subtrees that changed."""
+
+    def test_repeated_names(self, tmp_path):
+        """Test objects sharing a name are compared with their own hash."""
+        store = HashStore(str(tmp_path / "hashes.db"), "test")
+        hashes = ProjectHashes(store, 1)
+        board = Board(
+            name="Board",
+            lists=[
+                List(
+                    name="List",
+                    cards=[Card(name="Card", tasks=["A"]), Card(name="Card")],
+                )
+            ],
+        )
+        (_, subtrees) = hashes.prune([board])
+        hashes.stored = subtrees
+        hashes._seen.clear()
+
+        board.lists[0].cards[1].tasks = ["B"]
+        (changed, _) = hashes.prune([board])
+
+        assert [card.tasks for card in changed[0].lists[0].cards] == [["B"]]
+        store.close()
+
+
+class TestHashStore:
+    """Test loading with the subtree hashes of the last import."""
+
+    def test_unchanged_load(self, database, project, tmp_path):
+        """Test loading an unchanged file only reads the fingerprint."""
+        file_name = _write(tmp_path, PROJECT)
+        path = str(tmp_path / "hashes.db")
+        _load(database, project, file_name, path, build_new)
+
+        queries = _load(database, project, file_name, path)
+
+        assert list(queries) == ["hashes"]
+        assert queries["hashes"]["hash_fingerprint"]["count"] == 1
+
+    def test_changed_card(self, database, project, tmp_path):
+        """Test only the list and card that changed are imported."""
+        path = str(tmp_path / "hashes.db")
+        _load(database, project, _write(tmp_path, PROJECT), path, build_new)
+
+        content = json.loads(json.dumps(PROJECT))
+        content["boards"][0]["lists"][1]["cards"][2]["tasks"].append("Task 3")
+        queries = _load(database, project, _write(tmp_path, content), path)
+
+        assert ("List 1", "Card 2", "Task 3") in _tasks(database)
+        assert queries["cards"]["select_cards"]["rows"] == 1
+        assert queries["tasks"]["insert_tasks"]["rows"] == 1
+
+    def test_changed_database(self, database, project, tmp_path):
+        """Test a task removed in Planka is added again."""
+        file_name = _write(tmp_path, PROJECT)
+        path = str(tmp_path / "hashes.db")
+        _load(database, project, file_name, path, build_new)
+        expected = _tasks(database)
+
+        database.connection.execute("DELETE FROM task WHERE id = 3")
+        _load(database, project, file_name, path)
+
+        assert _tasks(database) == expected
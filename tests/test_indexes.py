@@ -0,0 +1,136 @@
+#!/usr/bin/env pytest -vs
+"""Tests for checking the indexes of the importer's lookups."""
+
+# Standard Python Libraries
+import io
+
+# Custom Libraries
+from tools.indexes import LOOKUPS, check, read_indexes, report, scans
+
+
+class PlanConnection:
+    """A connection answering catalog queries and EXPLAIN with fixed results."""
+
+    def __init__(self, indexes, plan):
+        """Create a new connection with index rows and a plan."""
+        self.indexes = indexes
+        self.plan = plan
+        self.executed = []
+        self.prepared = dict()
+        self.last = None
+
+    def cursor(self):
+        """Return the connection as its own cursor."""
+        return self
+
+    @property
+    def connection(self):
+        """Return the connection of the cursor."""
+        return self
+
+    def execute(self, query, params=None):
+        """Record a query, as its prepared SQL when executing a prepared statement."""
+        self.executed.append(query)
+        words = query.split()
+        if words[0] == "PREPARE":
+            self.prepared[words[1]] = query
+        self.last = self.prepared.get(words[1], query) if words[0] == "EXECUTE" else query
+
+    def fetchall(self):
+        """Return the rows of the last query."""
+        if "pg_indexes" in self.last:
+            return self.indexes
+        if "pg_class" in self.last:
+            return [("card", 18000), ("task", -1)]
+        return [(1, "Name")]
+
+    def fetchone(self):
+        """Return the plan of the last EXPLAIN."""
+        return ([{"Plan": self.plan}],)
+
+    def commit(self):
+        """Ignore a commit."""
+
+
+class TestCheck:
+    """Test finding the lookups that are not served by an index."""
+
+    def test_read_indexes(self):
+        """Test the columns of each index are read from its definition."""
+        connection = PlanConnection(
+            [
+                (
+                    "card",
+                    "card_pkey",
+                    "CREATE UNIQUE INDEX card_pkey ON public.card USING btree (id)",
+                ),
+                (
+                    "card",
+                    "card_list",
+                    'CREATE INDEX card_list ON public.card USING btree (list_id, "name") '
+                    "WHERE (list_id IS NOT NULL)",
+                ),
+            ],
+            None,
+        )
+
+        assert read_indexes(connection, ["card"]) == [
+            ("card", "card_pkey", ("id",)),
+            ("card", "card_list", ("list_id", "name")),
+        ]
+
+    def test_coverage(self):
+        """Test an index is full only if it leads with every lookup column."""
+        (cards,) = [lookup for lookup in LOOKUPS if lookup.name == "cards by name"]
+
+        assert cards.coverage([("card", "a", ("name", "list_id"))]) == (None, "none")
+        assert cards.coverage([("card", "b", ("list_id",))]) == ("b", "parent")
+        assert cards.coverage(
+            [("card", "b", ("list_id",)), ("card", "c", ("list_id", "name", "id"))]
+        ) == ("c", "full")
+
+    def test_scans(self):
+        """Test sequential and index scans of a table are found in a plan."""
+        plan = {
+            "Node Type": "Hash Join",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "card"},
+                {
+                    "Node Type": "Bitmap Heap Scan",
+                    "Relation Name": "card",
+                    "Plans": [
+                        {"Node Type": "Bitmap Index Scan", "Index Name": "card_list"}
+                    ],
+                },
+                {"Node Type": "Seq Scan", "Relation Name": "task"},
+            ],
+        }
+
+        assert scans(plan, "card") == ["seq scan", "card_list"]
+
+    def test_report(self):
+        """Test lookups are reported with their coverage and sequential scans."""
+        lookups = [lookup for lookup in LOOKUPS if lookup.table in ("card", "task")]
+        connection = PlanConnection(
+            [
+                (
+                    "card",
+                    "card_list",
+                    "CREATE INDEX card_list ON public.card USING btree (list_id)",
+                )
+            ],
+            {"Node Type": "Seq Scan", "Relation Name": "card"},
+        )
+        results = check(connection, lookups)
+        output = io.StringIO()
+        report(results, output)
+
+        assert [(r["rows"], r["index"], r["coverage"]) for r in results] == [
+            (18000, "card_list", "parent"),
+            (-1, None, "none"),
+            (18000, "card_list", "parent"),
+        ]
+        assert output.getvalue().splitlines()[-1] == (
+            "Sequential scans: cards by name, card positions."
+        )
+        assert any(query.startswith("EXPLAIN") for query in connection.executed)
@@ -0,0 +1,119 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the import journal."""
+
+# Standard Python Libraries
+import json
+
+# Third-Party Libraries
+import pytest
+
+# Custom Libraries
+from models.models import Board
+from tools import stats
+from tools.db import Transaction
+from tools.journal import Journal
+from tools.planka_import import build_new
+
+
+@pytest.fixture
+def import_file(tmp_path):
+    """Return a JSON file with two boards of two lists each."""
+    path = tmp_path / "project.json"
+    path.write_text(
+        json.dumps(
+            {
+                "boards": [
+                    {
+                        "name": f"Board {board}",
+                        "lists": [
+                            {
+                                "name": f"List {_list}",
+                                "cards": [{"name": "Card", "tasks": ["Task"]}],
+                            }
+                            for _list in range(2)
+                        ],
+                    }
+                    for board in range(2)
+                ]
+            }
+        )
+    )
+    return str(path)
+
+
+def _records(path):
+    """Return the records of a journal file."""
+    with open(path) as fp:
+        return [json.loads(line) for line in fp]
+
+
+class TestJournal:
+    """Test recording and resuming imports."""
+
+    def test_records_wait_for_commit(self, database, project, tmp_path):
+        """Test records made in a transaction are written when it commits."""
+        path = str(tmp_path / "journal")
+        transaction = Transaction(database)
+        journal = Journal(path)
+        journal.open(transaction, project.id, "project.json")
+        journal.record(Board, {(project.id, "Board"): (1, 65535.0)})
+
+        assert len(_records(path)) == 1
+        transaction.commit()
+        transaction.flush()
+        assert _records(path)[1] == {
+            "model": "board",
+            "key": [project.id, "Board"],
+            "id": 1,
+            "position": 65535.0,
+        }
+
+    def test_resume_after_last_part(
+        self, database, project, import_file, tmp_path, contents
+    ):
+        """Test a resumed import skips complete parts and journaled lookups."""
+        path = str(tmp_path / "journal")
+        journal = Journal(path)
+        build_new(database, project, import_file, stream="list", journal=journal)
+        journal.close()
+        expected = contents(database)
+
+        # Keep the records of the first two lists, as if the import had died.
+        records = _records(path)
+        parts = [index for index, record in enumerate(records) if "part" in record]
+        with open(path, "w") as fp:
+            fp.writelines(
+                json.dumps(record) + "\n" for record in records[: parts[1] + 1]
+            )
+        database.connection.execute("DELETE FROM task WHERE card_id > 2")
+        database.connection.execute("DELETE FROM card WHERE id > 2")
+        database.connection.execute("DELETE FROM list WHERE id > 2")
+        database.connection.execute("DELETE FROM board WHERE id > 1")
+
+        query_stats = stats.enable()
+        try:
+            journal = Journal(path, resume=True)
+            build_new(database, project, import_file, stream="list", journal=journal)
+            journal.close()
+        finally:
+            stats.disable()
+
+        assert contents(database) == expected
+        assert journal.parts == 4
+        # Only the second board and its lists were looked up.
+        lookups = query_stats.as_dict()
+        assert lookups["boards"]["select_boards"]["count"] == 1
+        assert lookups["lists"]["select_lists"]["count"] == 2
+
+    def test_other_import_started_over(self, database, project, import_file, tmp_path):
+        """Test the journal of another project is not resumed."""
+        path = str(tmp_path / "journal")
+        journal = Journal(path)
+        build_new(database, project, import_file, journal=journal)
+        journal.close()
+
+        journal = Journal(path, resume=True)
+        journal.open(database, project.id + 1, import_file)
+        journal.close()
+
+        assert (journal.parts, len(_records(path))) == (0, 1)
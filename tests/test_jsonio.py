@@ -0,0 +1,68 @@
+#!/usr/bin/env pytest -vs
+"""Tests for parsing import files with the installed JSON libraries."""
+
+# Standard Python Libraries
+import gc
+import json
+
+# Third-Party Libraries
+import pytest
+
+# Custom Libraries
+from models.models import Project
+from tools.jsonio import DEFAULT, PARSERS, PREFERENCE, load
+
+CONTENT = {
+    "boards": [
+        {
+            "name": "Rödmap",
+            "lists": [{"name": "To Do", "cards": [{"name": "Card", "tasks": ["a"]}]}],
+        }
+    ]
+}
+
+
+class TestLoad:
+    """Test reading a JSON file through a memory map."""
+
+    @pytest.mark.parametrize("parser", sorted(PARSERS))
+    def test_parsers(self, parser, tmp_path):
+        """Test every installed parser reads the same value from the file."""
+        path = tmp_path / "project.json"
+        path.write_text(json.dumps(CONTENT, ensure_ascii=False), encoding="utf-8")
+
+        assert load(str(path), parser) == CONTENT
+
+    def test_default(self):
+        """Test the fastest installed parser is used by default."""
+        assert DEFAULT == [name for name in PREFERENCE if name in PARSERS][0]
+
+    def test_empty(self, tmp_path):
+        """Test an empty file is rejected as invalid JSON."""
+        path = tmp_path / "empty.json"
+        path.write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            load(str(path))
+
+    def test_unknown_parser(self, tmp_path):
+        """Test a parser that is not installed is rejected."""
+        path = tmp_path / "project.json"
+        path.write_text("{}")
+
+        with pytest.raises(KeyError):
+            load(str(path), "missing")
+
+    def test_gc_untouched(self, tmp_path, monkeypatch):
+        """Test parsing a file into models leaves the garbage collector alone."""
+        path = tmp_path / "project.json"
+        path.write_text(json.dumps(CONTENT))
+        calls = []
+        monkeypatch.setattr(gc, "disable", lambda: calls.append("disable"))
+        monkeypatch.setattr(gc, "enable", lambda: calls.append("enable"))
+
+        project = Project()
+        project.load_json(load(str(path)))
+
+        assert project.boards[0].lists[0].cards[0].tasks == ["a"]
+        assert calls == []
@@ -1,8 +1,15 @@
 #!/usr/bin/env pytest -vs
 """Tests for Models."""
 
+# Standard Python Libraries
+import copy
+import math
+
+# Third-Party Libraries
+import pytest
+
 # Custom Libraries
-from models.models import Board, Card, List, Project
+from models.models import Board, Card, CardBatch, List, Project
 
 
 class TestBaseModel:
@@ -75,113 +82,116 @@ class TestParse:
         assert card_object.as_dict() != Card.parse(card_json).as_dict
 
 
-class TestSQLQuery:
-    """Test the insert scring returns for each Class."""
+class TestSerialization:
+    """Test the compiled parse and as_dict methods."""
 
-    def test_project_insert(self, project_object):
-        """Test project inster method."""
-        assert (
-            project_object.insert()
-            == """INSERT INTO project (name) VALUES ('Test Project')"""
-        )
+    def test_parse_keeps_json(self, project_json):
+        """Test parsing leaves the JSON unchanged."""
+        original = copy.deepcopy(project_json)
+        project = Project.parse(project_json)
 
-    def test_project_select_id(self, project_object):
-        """Test project select_id method."""
-        assert (
-            project_object.select_id()
-            == """SELECT id FROM project WHERE name='Test Project'"""
-        )
+        assert project_json == original
+        assert project.as_dict() == original
 
-    def test_board_instert(self, board_object):
-        """Test board inster method."""
-        assert (
-            board_object.insert()
-            == """
-            INSERT INTO
-                board (project_id, type, name, position)
-            VALUES
-                (1, 'kanban', 'Test Board 1', 0)
-        """
-        )
+    def test_load_keeps_json(self, project_json):
+        """Test loading leaves the JSON unchanged."""
+        original = copy.deepcopy(project_json)
+        Project().load_json(project_json)
 
-    def test_board_max_position(self, board_object):
-        """Test board class method to return required SQL string"""
-        assert board_object.max_position() == """SELECT MAX(position) FROM board"""
+        assert project_json == original
 
-    def test_board_select_board(self, board_object):
-        """Test board select_board method."""
-        assert (
-            board_object.select_board()
-            == """SELECT id, position, project_id FROM board WHERE name='Test Board 1' AND project_id=1"""
-        )
+    def test_as_dict_repeatable(self, project_object):
+        """Test as_dict leaves the models unchanged."""
+        first = project_object.as_dict()
 
-    def test_board_select_id(self, board_object):
-        """Test board select_id method."""
-        assert (
-            board_object.select_id()
-            == """SELECT id FROM board WHERE name='Test Board 1' AND project_id=1"""
-        )
+        assert project_object.as_dict() == first
+        assert isinstance(project_object.boards[0], Board)
 
-    def test_list_instert(self, list_object):
-        """Test list inster method."""
-        assert (
-            list_object.insert()
-            == """
-            INSERT INTO
-                list (board_id, name, position)
-            VALUES
-                (1, 'Test List 1', 0)
-        """
-        )
+    def test_tasks_copied(self, card_json):
+        """Test a parsed card does not share its tasks with the JSON."""
+        card = Card.parse(card_json)
+        card.tasks.append("New Task")
 
-    def test_list_max_position(self, list_object):
-        """Test list class method to return required SQL string"""
-        assert list_object.max_position() == """SELECT MAX(position) FROM list"""
+        assert "New Task" not in card_json["tasks"]
 
-    def test_list_select_list(self, list_object):
-        """Test list select_list method."""
-        assert (
-            list_object.select_list()
-            == """SELECT id, position, board_id FROM list WHERE name='Test List 1' AND board_id=1"""
-        )
+    def test_defaults_and_zeros(self):
+        """Test missing properties take defaults and zeros are kept."""
+        card = Card.parse({"name": "Card"})
 
-    def test_list_select_id(self, list_object):
-        """Test list select_id method."""
-        assert (
-            list_object.select_id()
-            == """SELECT id FROM list WHERE name='Test List 1' AND board_id=1"""
-        )
+        assert (card.id, card.position, card.tasks) == (None, 0, [])
+        assert card.as_dict() == {
+            "name": "Card",
+            "position": 0,
+            "board_id": 0,
+            "list_id": 0,
+        }
 
-    def test_get_tasks(self, card_object):
-        """Test card get_tasks method."""
-        assert card_object.get_tasks() == """SELECT name FROM task WHERE card_id=1"""
 
-    def test_card_instert(self, card_object):
-        """Test card inster method."""
-        assert (
-            card_object.insert()
-            == """
-                    INSERT INTO
-                        card (board_id, list_id, name, position)
-                    VALUES
-                        (1, 1, 'Test Card 1', 0)
-                """
-        )
+class TestKeys:
+    """Test the keys identifying each object in Planka."""
 
-    def test_card_max_position(self, card_object):
-        """Test card class method to return required SQL string"""
-        assert card_object.max_position() == """SELECT MAX(position) FROM card"""
+    def test_board_key(self, board_object):
+        """Test board key method."""
+        assert board_object.key() == (1, "Test Board 1")
 
-    def test_card_select_card(self, card_object):
-        """Test card select_card method."""
-        assert (
-            card_object.select_card()
-            == """SELECT id, position, board_id, list_id FROM card WHERE name='Test Card 1' AND board_id=1 AND list_id=1"""
+    def test_card_key(self, card_object):
+        """Test card key method."""
+        assert card_object.key() == (1, 1, "Test Card 1")
+
+
+class TestSlots:
+    """Test the slot based storage of the models."""
+
+    def test_no_instance_dict(self, card_object):
+        """Test models have no __dict__ and reject unknown attributes."""
+        assert not hasattr(card_object, "__dict__")
+        with pytest.raises(AttributeError):
+            card_object.color = "red"
+
+    def test_defaults_not_shared(self):
+        """Test each instance gets its own copy of list defaults."""
+        (first, second) = (List(), List())
+        first.cards.append(Card(name="Card"))
+
+        assert second.cards == []
+
+
+class TestCardBatch:
+    """Test the CardBatch class."""
+
+    def test_round_trip(self, card_object):
+        """Test a card comes out of a batch as it went in."""
+        batch = CardBatch([card_object])
+        card = batch[0]
+
+        assert len(batch) == 1
+        assert (card.id, card.name, card.position, card.tasks) == (
+            card_object.id,
+            card_object.name,
+            card_object.position,
+            card_object.tasks,
+        )
+        assert (card.board_id, card.list_id) == (
+            card_object.board_id,
+            card_object.list_id,
         )
 
-    def test_card_select_id(self, card_object):
-        """Test card select_id method."""
-        assert (
-            card_object.select_id()
-            == """SELECT id FROM card WHERE name='Test Card 1' AND board_id=1 AND list_id=1"""
+    def test_from_lists(self):
+        """Test parent ids are taken from the lists and tasks kept per card."""
+        _list = List(
+            id=2,
+            board_id=1,
+            cards=[Card(name="Card 1", tasks=["Task 1"]), Card(name="Card 2")],
         )
+        batch = CardBatch.from_lists([_list])
+
+        assert list(batch.keys()) == [(1, 2, "Card 1"), (1, 2, "Card 2")]
+        assert [batch.tasks(0), batch.tasks(1)] == [["Task 1"], []]
+        assert [card.id for card in batch] == [None, None]
+
+    def test_missing_position(self):
+        """Test a missing position is stored as NaN and returned as None."""
+        batch = CardBatch([Card(name="Card", position=None)])
+
+        assert math.isnan(batch.positions[0])
+        assert batch[0].position is None
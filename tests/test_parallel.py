@@ -0,0 +1,178 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the parallel importer."""
+
+# Standard Python Libraries
+import logging
+
+# Third-Party Libraries
+import pytest
+
+# Custom Libraries
+from models.models import Board, Card, List, Project
+from tools import statements
+from tools.db import Transaction, execute_query, execute_read_query
+from tools.engine import BatchImporter
+from tools.parallel import ParallelImporter, partition_lists
+from tools.sqlite import SQLiteBackend
+
+
+@pytest.fixture
+def path(pool):
+    """Return the pool's file, with a project holding a list with a card."""
+    database = SQLiteBackend(pool.path)
+    execute_query(database, statements.insert_project(Project(name="Project")))
+    BatchImporter(database).run(
+        _project(database),
+        [
+            Board(
+                name="Board",
+                lists=[List(name="To Do", cards=[Card(name="Card 1", tasks=[])])],
+            )
+        ],
+    )
+    database.commit()
+    database.close()
+    return pool.path
+
+
+def _project(database):
+    """Return the project of the database with its id."""
+    project = Project(name="Project")
+    project.id = execute_read_query(database, statements.select_project_id(project))[
+        0
+    ][0]
+    return project
+
+
+def _boards():
+    """Return boards adding to the existing list and creating new ones."""
+    return [
+        Board(
+            name="Board",
+            lists=[
+                List(
+                    name="To Do",
+                    cards=[
+                        Card(name="Card 1", tasks=["Task"]),
+                        Card(name="Card 2", tasks=[]),
+                        Card(name="Card 3", tasks=[]),
+                    ],
+                ),
+                List(
+                    name="Doing",
+                    cards=[Card(name="Card 4", tasks=[]), Card(name="Card 5", tasks=[])],
+                ),
+            ],
+        ),
+        Board(
+            name="Other",
+            lists=[List(name="Backlog", cards=[Card(name="Card 6", tasks=["Task"])])],
+        ),
+    ]
+
+
+class TestPartitionLists:
+    """Test the partition_lists function."""
+
+    def test_balanced_groups(self):
+        """Test lists are spread evenly between workers."""
+        lists = [
+            List(id=index, cards=[Card(tasks=["Task"]) for _ in range(size)])
+            for index, size in enumerate([6, 1, 3, 2, 1, 3])
+        ]
+        chunks = partition_lists(lists, 2)
+
+        assert len(chunks) == 2
+        assert [sum(len(_list.cards) for _list in chunk) for chunk in chunks] == [
+            8,
+            8,
+        ]
+
+    def test_same_list_one_worker(self):
+        """Test lists resolved to the same id stay in one group."""
+        lists = [List(id=1, cards=[]), List(id=2, cards=[]), List(id=1, cards=[])]
+        chunks = partition_lists(lists, 3)
+
+        assert len(chunks) == 2
+        assert any([_list.id for _list in chunk] == [1, 1] for chunk in chunks)
+
+
+class TestParallelImporter:
+    """Test importing the cards of lists over many connections."""
+
+    def test_ids(self, path, pool):
+        """Test workers resolve existing cards and give new ones their ids."""
+        database = SQLiteBackend(path)
+        project = _project(database)
+        (existing,) = execute_read_query(database, "SELECT id FROM card")
+        with Transaction(database) as transaction:
+            boards = ParallelImporter(transaction, pool, 2).run(project, _boards())
+
+        rows = {
+            (list_name, name): _id
+            for (_id, list_name, name) in execute_read_query(
+                database,
+                "SELECT c.id, l.name, c.name FROM card c "
+                "JOIN list l ON l.id = c.list_id",
+            )
+        }
+        cards = {
+            (_list.name, card.name): card.id
+            for board in boards
+            for _list in board.lists
+            for card in _list.cards
+        }
+        assert pool.opened == 2
+        assert cards == rows
+        assert cards[("To Do", "Card 1")] == existing[0]
+        assert sorted(
+            execute_read_query(
+                database,
+                "SELECT t.name, c.name FROM task t JOIN card c ON c.id = t.card_id",
+            )
+        ) == [("Task", "Card 1"), ("Task", "Card 6")]
+        database.close()
+
+    def test_positions(self, path, pool):
+        """Test new cards are placed after the last card of their own list."""
+        database = SQLiteBackend(path)
+        project = _project(database)
+        with Transaction(database) as transaction:
+            ParallelImporter(transaction, pool, 2).run(project, _boards())
+
+        positions = dict()
+        for (list_name, name, position) in execute_read_query(
+            database,
+            "SELECT l.name, c.name, c.position FROM card c "
+            "JOIN list l ON l.id = c.list_id ORDER BY c.position",
+        ):
+            positions.setdefault(list_name, []).append((name, position))
+        database.close()
+
+        assert [name for (name, _) in positions["To Do"]] == [
+            "Card 1",
+            "Card 2",
+            "Card 3",
+        ]
+        assert [name for (name, _) in positions["Doing"]] == ["Card 4", "Card 5"]
+        for cards in positions.values():
+            assert len({position for (_, position) in cards}) == len(cards)
+
+    def test_commit_every(self, path, pool, caplog):
+        """Test each worker commits every commit_every statements."""
+        caplog.set_level(logging.INFO)
+        database = SQLiteBackend(path)
+        project = _project(database)
+        with Transaction(database) as transaction:
+            ParallelImporter(transaction, pool, 2, commit_every=1).run(
+                project, _boards()
+            )
+        database.close()
+
+        # The workers report their transactions before the importer's own.
+        reports = [
+            record.getMessage().split(" (")[0]
+            for record in caplog.records
+            if record.getMessage().startswith("Committed")
+        ]
+        assert reports[:-1] == ["Committed 2 statements in 2 commits"] * 2
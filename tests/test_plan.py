@@ -0,0 +1,78 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the offline import planner."""
+
+# Standard Python Libraries
+import io
+
+# Custom Libraries
+from tools.plan import POSITION_GAP, Plan, Snapshot
+
+
+class TestPlan:
+    """Test building and writing plans."""
+
+    def test_new_project(self, project_object):
+        """Test everything is created for a project that does not exist."""
+        project_object.id = None
+        plan = Plan.build(project_object, Snapshot())
+
+        assert plan.creates["board"] == [("Test Board 1", 0)]
+        assert plan.creates["list"] == [("Test Board 1", "Test List 1", 0)]
+        assert plan.creates["card"] == [("Test Board 1", "Test List 1", "Test Card 1", 0)]
+        assert len(plan.creates["task"]) == 2
+        assert len(plan.statements()) == 6
+
+    def test_existing_objects_skipped(self, project_object):
+        """Test objects in the snapshot are skipped and new ones positioned after."""
+        snapshot = Snapshot()
+        snapshot.ids = {
+            ("Test Board 1",): 1,
+            ("Test Board 1", "Test List 1"): 2,
+            ("Test Board 1", "Test List 1", "Test Card 1"): 3,
+        }
+        snapshot.positions = {("Test Board 1", "Test List 1"): 10}
+        snapshot.tasks = {("Test Board 1", "Test List 1", "Test Card 1"): {"Task 1"}}
+        project_object.boards[0].lists[0].cards[0].name = "Test Card 2"
+        plan = Plan.build(project_object, snapshot)
+
+        assert plan.skips["board"] == [("Test Board 1",)]
+        assert plan.skips["list"] == [("Test Board 1", "Test List 1")]
+        assert plan.creates["card"] == [
+            ("Test Board 1", "Test List 1", "Test Card 2", 10 + POSITION_GAP)
+        ]
+        assert len(plan.statements()) == 2
+
+    def test_project_by_id(self, project_object):
+        """Test an existing project is targeted by its id rather than its name."""
+        project_object.id = 7
+        plan = Plan.build(project_object, Snapshot())
+
+        sql = plan.statements()
+
+        assert "SELECT 7, 'kanban'" in sql[0]
+        assert "project_id=7" in sql[1]
+        assert not any("FROM project" in statement for statement in sql)
+
+    def test_write_sql_escapes_names(self, project_object):
+        """Test the SQL script is one transaction with quoted names."""
+        project_object.boards[0].name = "Bryce's Board"
+        plan = Plan.build(project_object, Snapshot())
+        fp = io.StringIO()
+        plan.write_sql(fp)
+        script = fp.getvalue()
+
+        assert script.startswith("BEGIN;\n")
+        assert script.endswith("COMMIT;\n")
+        assert "('Bryce''s Board', 0)" in script
+
+    def test_report(self, project_object):
+        """Test the plan is written to a file, each change and then a summary."""
+        project_object.id = None
+        plan = Plan.build(project_object, Snapshot())
+        fp = io.StringIO()
+        plan.report(fp)
+        lines = fp.getvalue().splitlines()
+
+        assert lines[0] == "create board: Test Board 1"
+        assert "boards: 1 to create, 0 to skip" in lines
+        assert lines[-1] == "Applying this plan takes 6 statements."
@@ -0,0 +1,60 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the position allocator."""
+
+# Custom Libraries
+from models.models import Card, List
+from tools.positions import POSITION_GAP, PositionAllocator
+
+
+class RowsConnection:
+    """A connection whose queries return fixed rows."""
+
+    def __init__(self, rows):
+        """Create a new connection returning rows."""
+        self.rows = rows
+        self.queries = []
+
+    @property
+    def connection(self):
+        """Return the connection the cursor belongs to."""
+        return self
+
+    def cursor(self):
+        """Return the connection as its own cursor."""
+        return self
+
+    def execute(self, query, params=None):
+        """Record a query."""
+        self.queries.append(query)
+
+    def fetchall(self):
+        """Return the fixed rows."""
+        return self.rows
+
+
+class TestPositionAllocator:
+    """Test the PositionAllocator class."""
+
+    def test_positions_per_parent(self):
+        """Test positions follow the highest position of each parent."""
+        connection = RowsConnection([(1, 10), (2, 0)])
+        positions = PositionAllocator(connection)
+        positions.load(Card, [1, 2, 3, 1])
+
+        assert positions.next(Card, 1) == 10 + POSITION_GAP
+        assert positions.next(Card, 1) == 10 + 2 * POSITION_GAP
+        assert positions.next(Card, 2) == POSITION_GAP
+        assert positions.next(Card, 3) == 0
+        # The statement is prepared and then executed once.
+        assert len(connection.queries) == 2
+        assert connection.queries[1].startswith("EXECUTE planka_max_card_positions")
+
+    def test_load_skips_known_parents(self):
+        """Test parents already known are not queried again."""
+        connection = RowsConnection([])
+        positions = PositionAllocator(connection)
+        positions.set_empty(List, [1])
+        positions.load(List, [1])
+
+        assert connection.queries == []
+        assert positions.next(List, 1) == 0
@@ -0,0 +1,229 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the SQLite backend."""
+
+# Standard Python Libraries
+import builtins
+import io
+import json
+
+# Third-Party Libraries
+import pytest
+
+# Custom Libraries
+from models.models import Board, Card, CardBatch, List
+from tools import statements, stats
+from tools.backend import PostgresBackend, backend
+from tools.bulk import copy_cards
+from tools.db import Transaction, copy_query, execute_query, execute_read_query
+from tools.engine import BatchImporter
+from tools.planka_import import build_new, load_cards
+
+
+@pytest.fixture
+def import_file(tmp_path):
+    """Return a JSON file with a board, two lists, and a repeated card."""
+    path = tmp_path / "project.json"
+    path.write_text(
+        json.dumps(
+            {
+                "boards": [
+                    {
+                        "name": "Board",
+                        "lists": [
+                            {
+                                "name": "List 1",
+                                "cards": [
+                                    {"name": "Card 1", "tasks": ["Task 1", "Task 2"]},
+                                    {"name": "Card 2"},
+                                    {"name": "Card 1", "tasks": ["Task 3"]},
+                                ],
+                            },
+                            {"name": "List 2", "cards": [{"name": "Card 3"}]},
+                        ],
+                    }
+                ]
+            }
+        )
+    )
+    return str(path)
+
+
+class TestBackend:
+    """Test choosing the backend of a connection."""
+
+    def test_backend_passed_through(self, database):
+        """Test a backend, or a transaction on one, is used as it is."""
+        assert backend(database) is database
+        transaction = Transaction(database)
+        assert backend(transaction) is transaction
+
+    def test_connection_wrapped(self):
+        """Test other connections are run on as psycopg2 connections."""
+        connection = object()
+        result = backend(connection)
+        assert isinstance(result, PostgresBackend)
+        assert result.connection is connection
+
+
+class TestSQLiteBackend:
+    """Test running the importer's queries on SQLite."""
+
+    def test_insert_returning(self, database, project):
+        """Test array inserts return the rows they created in order."""
+        rows = execute_query(
+            database,
+            statements.insert_many(
+                Board,
+                [
+                    Board(project_id=project.id, name="Board 1", position=65535),
+                    Board(project_id=project.id, name="Board 2", position=131070),
+                ],
+            ),
+        )
+
+        assert [row[1:] for row in rows] == [
+            (project.id, "Board 1"),
+            (project.id, "Board 2"),
+        ]
+
+    def test_copy(self, database, project):
+        """Test COPY text is inserted with escapes and nulls decoded."""
+        count = database.copy(
+            "COPY card (board_id, list_id, name) FROM STDIN",
+            io.StringIO("1\t\\N\ta\\tb\n1\t2\tCard\n"),
+        )
+
+        assert count == 2
+        assert execute_read_query(
+            database, "SELECT board_id, list_id, name FROM card ORDER BY id"
+        ) == [(1, None, "a\tb"), (1, 2, "Card")]
+
+    def test_unsupported_copy(self, database, caplog):
+        """Test a COPY that is not from STDIN is logged as an error."""
+        copy_query(database, "COPY card TO STDOUT", io.StringIO())
+
+        assert "Unsupported COPY query" in caplog.text
+
+    @pytest.mark.parametrize(
+        "bulk,stream", [(False, None), (True, None), (False, "list"), (True, "list")]
+    )
+    def test_import(
+        self, database, project, import_file, bulk, stream, contents
+    ):
+        """Test importing a file twice only creates each object once."""
+        build_new(database, project, import_file, bulk=bulk, stream=stream)
+        first = contents(database)
+        load_cards(database, project, import_file, bulk=bulk, stream=stream)
+
+        assert contents(database) == first
+        assert [row[1:] for row in first] == [
+            ("List 1", "Card 1", "Task 1"),
+            ("List 1", "Card 1", "Task 2"),
+            ("List 1", "Card 1", "Task 3"),
+            ("List 1", "Card 2", None),
+            ("List 2", "Card 3", None),
+        ]
+
+    @pytest.mark.parametrize("stream", [None, "board", "list"])
+    def test_file_opened_once(
+        self, database, project, import_file, stream, monkeypatch, contents
+    ):
+        """Test the file is opened once, whether it is streamed or mapped."""
+        opened = []
+        real_open = builtins.open
+
+        def _open(file, *args, **kwargs):
+            """Record the files opened."""
+            opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", _open)
+        build_new(database, project, import_file, stream=stream)
+        monkeypatch.undo()
+
+        assert opened == [import_file]
+        assert len(contents(database)) == 5
+
+
+class TestIdempotentInserts:
+    """Test inserts skip the objects already in the database."""
+
+    def test_insert_many_skips_existing(self, database, project):
+        """Test only boards missing from the project are inserted and returned."""
+        board = Board(project_id=project.id, name="Board 1", position=65535)
+        execute_query(database, statements.insert_many(Board, [board]))
+
+        rows = execute_query(
+            database,
+            statements.insert_many(
+                Board,
+                [board, Board(project_id=project.id, name="Board 2", position=0)],
+            ),
+        )
+
+        assert [row[1:] for row in rows] == [(project.id, "Board 2")]
+        assert execute_read_query(database, "SELECT COUNT(*) FROM board") == [(2,)]
+
+    @pytest.mark.parametrize("bulk", [False, True])
+    def test_cards_keyed_on_list(self, database, bulk):
+        """Test a card is skipped by its list and name, whatever its board id."""
+        execute_query(
+            database,
+            statements.insert_many(
+                Card, [Card(board_id=1, list_id=1, name="Card", position=0)]
+            ),
+        )
+
+        cards = [Card(board_id=2, list_id=1, name="Card", tasks=[])]
+        if bulk:
+            batch = CardBatch.from_lists([List(id=1, board_id=2, cards=cards)])
+            copy_cards(database, batch)
+        else:
+            execute_query(database, statements.insert_many(Card, cards))
+
+        assert execute_read_query(database, "SELECT COUNT(*) FROM card") == [(1,)]
+
+    def test_add_tasks(self, database, caplog):
+        """Test a checklist is added in one statement skipping existing tasks."""
+        importer = BatchImporter(database)
+        first = importer.add_tasks([Card(id=1, tasks=["Task 1", "Task 2"])])
+        query_stats = stats.enable()
+        try:
+            second = importer.add_tasks(
+                [Card(id=1, tasks=["Task 2", "Task 3", "Task 3"])]
+            )
+        finally:
+            stats.disable()
+
+        assert second == {max(first) + 1}
+        assert query_stats.as_dict()["tasks"]["insert_tasks"]["count"] == 1
+        assert "Task 2 is already on card." in caplog.text
+        assert execute_read_query(
+            database, "SELECT name FROM task WHERE card_id = 1 ORDER BY id"
+        ) == [("Task 1",), ("Task 2",), ("Task 3",)]
+
+    def test_stale_ids(self, database, project):
+        """Test an object missing from a complete cache is read, not duplicated."""
+        board = Board(project_id=project.id, name="Board", position=0)
+        (row,) = execute_query(database, statements.insert_many(Board, [board]))
+
+        importer = BatchImporter(database)
+        importer.complete.add(Board)
+        importer.add_boards([Board(project_id=project.id, name="Board")])
+
+        assert importer.ids[Board] == {(project.id, "Board"): (row[0], 0)}
+        assert execute_read_query(database, "SELECT COUNT(*) FROM board") == [(1,)]
+
+    def test_oldest_duplicate(self, database, project):
+        """Test a name repeated under a parent resolves to its oldest object."""
+        for position in (0, 65535):
+            execute_query(
+                database,
+                "INSERT INTO board (project_id, name, position) "
+                f"VALUES ({project.id}, 'Board', {position})",
+            )
+
+        importer = BatchImporter(database)
+        importer.add_boards([Board(project_id=project.id, name="Board")])
+
+        assert importer.ids[Board][(project.id, "Board")][1] == 0
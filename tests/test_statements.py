@@ -0,0 +1,106 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the prepared statements."""
+
+# Custom Libraries
+from models.models import Board, Card
+from tools import statements
+
+
+class RecordingCursor:
+    """A cursor that records the queries and parameters it executes."""
+
+    def __init__(self):
+        """Create a new cursor that is its own connection."""
+        self.queries = []
+
+    @property
+    def connection(self):
+        """Return the connection the cursor belongs to."""
+        return self
+
+    def execute(self, query, params=None):
+        """Record a query and its parameters."""
+        self.queries.append((query, params))
+
+
+class TestStatements:
+    """Test preparing and binding statements."""
+
+    def test_prepared_once_per_connection(self):
+        """Test a statement is prepared on first use and then only executed."""
+        cursor = RecordingCursor()
+        statements.run(cursor, statements.max_positions(Card, [1]))
+        statements.run(cursor, statements.max_positions(Card, [2]))
+
+        assert cursor.queries == [
+            (
+                "PREPARE planka_max_card_positions (bigint[]) AS "
+                "SELECT list_id, MAX(position) FROM card "
+                "WHERE list_id = ANY($1) GROUP BY list_id",
+                None,
+            ),
+            ("EXECUTE planka_max_card_positions (%s)", ('{"1"}',)),
+            ("EXECUTE planka_max_card_positions (%s)", ('{"2"}',)),
+        ]
+
+    def test_prepared_on_each_connection(self):
+        """Test every connection prepares the statement for itself."""
+        (first, second) = (RecordingCursor(), RecordingCursor())
+        statements.run(first, statements.max_positions(Board, [1]))
+        statements.run(second, statements.max_positions(Board, [1]))
+
+        assert first.queries[0][0].startswith("PREPARE")
+        assert second.queries[0][0].startswith("PREPARE")
+        assert second.queries[1] == (
+            "EXECUTE planka_max_board_positions (%s)",
+            ('{"1"}',),
+        )
+
+    def test_strings_run_as_is(self):
+        """Test SQL strings are executed without being prepared."""
+        cursor = RecordingCursor()
+        statements.run(cursor, "SELECT 1")
+
+        assert cursor.queries == [("SELECT 1", None)]
+
+    def test_quotes_are_bound(self):
+        """Test names with quotes are passed as parameters, not SQL."""
+        board = Board(project_id=1, name="Bob's Board")
+
+        assert statements.select_many(Board, [board]).values == (
+            [1],
+            ["Bob's Board"],
+        )
+
+    def test_lists_bound_as_arrays(self):
+        """Test lists are bound as Postgres array text."""
+        tasks = statements.insert_tasks([(1, 'say "hi"'), (2, "back\\slash")])
+
+        assert tasks.params == ('{"1","2"}', '{"say \\"hi\\"","back\\\\slash"}')
+
+    def test_select_many_unique(self):
+        """Test lookups bind each parent id and name once."""
+        cards = [
+            Card(board_id=1, list_id=2, name="Card 1"),
+            Card(board_id=1, list_id=2, name="Card 2"),
+            Card(board_id=1, list_id=3, name="Card 1"),
+        ]
+
+        assert statements.select_many(Card, cards).params == (
+            '{"2","3"}',
+            '{"Card 1","Card 2"}',
+        )
+
+    def test_insert_many_columns(self):
+        """Test inserts bind one array per column."""
+        cards = [
+            Card(board_id=1, list_id=2, name="Card 1", position=0),
+            Card(board_id=1, list_id=3, name="Card 2", position=65535),
+        ]
+
+        assert statements.insert_many(Card, cards).params == (
+            '{"1","1"}',
+            '{"2","3"}',
+            '{"Card 1","Card 2"}',
+            '{"0","65535"}',
+        )
@@ -0,0 +1,138 @@
+#!/usr/bin/env pytest -vs
+"""Tests for the query statistics."""
+
+# Standard Python Libraries
+import io
+import json
+
+# Third-Party Libraries
+import pytest
+
+# Custom Libraries
+from models.models import Board, Card
+from tools import statements, stats
+from tools.db import execute_query, execute_read_query
+
+
+class RowsCursor:
+    """A cursor and connection whose queries return fixed rows."""
+
+    def __init__(self, rows):
+        """Create a new cursor returning rows."""
+        self.rows = rows
+        self.description = None
+        self.rowcount = len(rows)
+
+    @property
+    def connection(self):
+        """Return the cursor as its own connection."""
+        return self
+
+    def cursor(self):
+        """Return the cursor itself."""
+        return self
+
+    def execute(self, query, params=None):
+        """Ignore a query."""
+
+    def fetchall(self):
+        """Return the fixed rows."""
+        return self.rows
+
+    def commit(self):
+        """Ignore a commit."""
+
+
+@pytest.fixture
+def query_stats():
+    """Return statistics recorded while the test runs."""
+    yield stats.enable()
+    stats.disable()
+
+
+class TestKind:
+    """Test the kinds queries are grouped by."""
+
+    def test_statement_kind(self):
+        """Test statements are grouped by the name they are prepared under."""
+        assert stats.kind(statements.select_many(Card, [])) == "select_cards"
+        assert (
+            stats.kind(statements.max_positions(Board, [1]))
+            == "max_board_positions"
+        )
+
+    def test_string_kind(self):
+        """Test SQL strings are grouped by their first keyword."""
+        assert stats.kind("  SELECT id FROM board") == "select"
+        assert stats.kind("COMMIT") == "commit"
+
+
+class TestQueryStats:
+    """Test recording and reporting statistics."""
+
+    def test_grouped_by_phase_and_kind(self, query_stats):
+        """Test queries are recorded under the phase of the thread."""
+        stats.record("SELECT 1", 1, 0.002)
+        with stats.phase("cards"):
+            stats.record("SELECT 1", 3, 0.0005)
+            stats.record("SELECT 1", 2, 0.02)
+
+        result = query_stats.as_dict()
+        assert result["setup"]["select"]["count"] == 1
+        cards = result["cards"]["select"]
+        assert (cards["count"], cards["rows"], cards["max_seconds"]) == (2, 5, 0.02)
+        assert cards["histogram"]["<=1ms"] == 1
+        assert cards["histogram"]["<=30ms"] == 1
+
+    def test_phase_restored(self, query_stats):
+        """Test a phase ends when its block does, even within another phase."""
+        with stats.phase("lists"):
+            with stats.phase("cards"):
+                pass
+            stats.record("SELECT 1", 0, 0.001)
+
+        assert list(query_stats.as_dict()) == ["lists"]
+
+    def test_disabled(self):
+        """Test nothing is recorded when statistics are disabled."""
+        query_stats = stats.enable()
+        stats.disable()
+        stats.record("SELECT 1", 0, 0.001)
+
+        assert query_stats.entries == {}
+
+    def test_report(self, query_stats):
+        """Test the table and JSON written for the statistics."""
+        with stats.phase("tasks"):
+            stats.record(statements.insert_tasks([(1, "Task")]), 1, 0.004)
+        (table, data) = (io.StringIO(), io.StringIO())
+        query_stats.report(table)
+        query_stats.write_json(data)
+
+        lines = table.getvalue().splitlines()
+        assert lines[1].split() == [
+            "tasks",
+            "insert_tasks",
+            "1",
+            "1",
+            "4.0",
+            "4.00",
+            "4.00",
+        ]
+        assert json.loads(data.getvalue())["tasks"]["insert_tasks"]["rows"] == 1
+
+
+class TestInstrumentedQueries:
+    """Test the database helpers record their queries."""
+
+    def test_read_query(self, query_stats):
+        """Test a read query records the rows it returned."""
+        execute_read_query(RowsCursor([(1,), (2,)]), "SELECT id FROM card")
+
+        assert query_stats.as_dict()["setup"]["select"]["rows"] == 2
+
+    def test_query(self, query_stats):
+        """Test a query records the rows it changed."""
+        execute_query(RowsCursor([(1,)]), statements.insert_tasks([(1, "Task")]))
+
+        assert query_stats.as_dict()["setup"]["insert_tasks"]["rows"] == 1
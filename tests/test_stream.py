@@ -0,0 +1,91 @@
+#!/usr/bin/env pytest -vs
+"""Tests for streaming import files."""
+
+# Standard Python Libraries
+import io
+import json
+
+# Third-Party Libraries
+import pytest
+
+# Custom Libraries
+from models.models import Project
+from tools.stream import JSONStream, iter_boards
+
+
+class TestJSONStream:
+    """Test the JSONStream class."""
+
+    def test_members_and_items(self):
+        """Test walking objects and arrays across small chunks."""
+        stream = JSONStream(io.StringIO('{"a": [1, 22, {"b": 3}], "c": 456}'), 2)
+        result = dict()
+        for key in stream.members():
+            if key == "a":
+                result[key] = [stream.value() for _ in stream.items()]
+            else:
+                result[key] = stream.value()
+
+        assert result == {"a": [1, 22, {"b": 3}], "c": 456}
+
+    def test_empty_containers(self):
+        """Test walking empty objects and arrays."""
+        assert list(JSONStream(io.StringIO(" { } ")).members()) == []
+        assert list(JSONStream(io.StringIO("[]")).items()) == []
+
+    def test_invalid_json(self):
+        """Test invalid JSON raises an error."""
+        stream = JSONStream(io.StringIO('{"a": [1,'))
+        with pytest.raises(ValueError):
+            for key in stream.members():
+                for _ in stream.items():
+                    stream.value()
+
+
+class TestIterBoards:
+    """Test the iter_boards function."""
+
+    def test_board_level(self, project_json):
+        """Test boards are read one at a time."""
+        project = Project()
+        boards = list(iter_boards(io.StringIO(json.dumps(project_json)), project))
+
+        assert project.name == "Test Project"
+        assert [board.as_dict() for board in boards] == [
+            board.as_dict() for board in Project.parse(project_json).boards
+        ]
+
+    def test_list_level(self, board_json, list_json):
+        """Test lists are read one at a time under a copy of their board."""
+        second_list = dict(list_json, name="Test List 2")
+        board_json["lists"] = [list_json, second_list]
+        boards = list(
+            iter_boards(
+                io.StringIO(json.dumps({"boards": [board_json]})), Project(), "list"
+            )
+        )
+
+        assert [board.name for board in boards] == ["Test Board 1", "Test Board 1"]
+        assert [board.lists[0].name for board in boards] == [
+            "Test List 1",
+            "Test List 2",
+        ]
+
+    def test_list_level_name_after_lists(self, list_json):
+        """Test a board named after its lists is read whole."""
+        text = json.dumps({"boards": [{"lists": [list_json], "name": "Late"}]})
+        boards = list(iter_boards(io.StringIO(text), Project(), "list"))
+
+        assert len(boards) == 1
+        assert boards[0].name == "Late"
+        assert boards[0].lists[0].name == "Test List 1"
+
+    def test_list_level_empty_lists(self, board_json):
+        """Test a board with an empty lists array is still read."""
+        board_json["lists"] = []
+        text = json.dumps({"boards": [board_json]})
+        boards = list(iter_boards(io.StringIO(text), Project(), "list"))
+
+        assert [(board.name, board.lists) for board in boards] == [
+            ("Test Board 1", [])
+        ]